@@ -0,0 +1,93 @@
+"""Shared bootstrap for the benchmark scripts.
+
+Every benchmark runs against a throwaway SQLite file (or, with the
+``postgres`` profile, a throwaway ``test_`` database) so it never touches
+the development database.
+"""
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.config.settings')
+
+
+def setup_django(db_path=None, profile='sqlite'):
+    """Configures Django against a fresh database and returns a handle for ``teardown_django``.
+
+    ``profile`` is ``'sqlite'`` or ``'postgres'`` from src/config/databases.py,
+    or ``'sqlite-legacy'`` for a plain SQLite file with Django's defaults
+    (rollback journal, deferred transactions), to compare against.
+    """
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from src.config.caches import locmem_cache
+    from src.config.databases import database_profile
+
+    settings.DEBUG = False
+    # One process and a throwaway database: a shared cache would serve pages
+    # left over from an earlier run.
+    settings.CACHES = {'default': locmem_cache()}
+    # Every simulated client shares 127.0.0.1, so the booking rate limits
+    # would throttle the load generator itself; booking_burst.py sets its own.
+    settings.BOOKING_CLIENT_BUCKET = None
+    settings.BOOKING_CLASS_BUCKET = None
+    logging.disable(logging.WARNING)
+    if profile == 'postgres':
+        settings.DATABASES['default'] = database_profile(profile, None)
+        django.setup()
+        from django.db import connection
+
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        return None
+
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix='booking-bench-', suffix='.sqlite3')
+        os.close(fd)
+    if profile == 'sqlite-legacy':
+        settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path}
+    else:
+        settings.DATABASES['default'] = database_profile(profile, db_path)
+        # Benchmarks pile far more writers on one file than a real deployment.
+        settings.DATABASES['default']['OPTIONS']['timeout'] = 30
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def teardown_django(db_path):
+    """Drops the database created by ``setup_django``."""
+    from django.db import connection
+
+    if db_path is None:
+        connection.creation.destroy_test_db(connection.settings_dict['NAME'], verbosity=0)
+        return
+    connection.close()
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+def create_class(total_slots, **extra):
+    """Creates one bookable class owned by a benchmark instructor."""
+    from django.utils import timezone
+    from src.booking.models import InstructorModel, FitnessModel
+
+    instructor, _ = InstructorModel.objects.get_or_create(
+        email='bench@example.com', defaults={'name': 'Bench Instructor'}
+    )
+    return FitnessModel.objects.create(
+        name='HIIT',
+        instructor=instructor,
+        datetime_ist=timezone.now() + timezone.timedelta(days=1),
+        total_slots=total_slots,
+        available_slots=total_slots,
+        days_of_week=['MON'],
+        **extra,
+    )
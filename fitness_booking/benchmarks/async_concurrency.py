@@ -0,0 +1,113 @@
+"""Compares the sync (WSGI) and async (ASGI) read endpoints under concurrency.
+
+The sync side fires requests through the WSGI test client from a thread
+pool; the async side keeps ``--concurrency`` requests in flight on one event
+loop through the ASGI test client. Both run in-process, so the numbers show
+handler overhead rather than network cost.
+
+    python benchmarks/async_concurrency.py --requests 2000 --concurrency 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _setup import setup_django, teardown_django, create_class
+
+ENDPOINTS = {
+    'classes': ('/api/classes/', '/api/async/classes/', {}),
+    'bookings': ('/api/bookings/', '/api/async/bookings/', {'client_email': 'member0@example.com'}),
+    'instructor': ('/api/instructor/', '/api/async/instructor/', {}),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, elapsed, latencies):
+    print(
+        f"{label:<22} {len(latencies) / elapsed:>8.0f} req/s"
+        f"  p50={percentile(latencies, 50) * 1000:>7.1f}ms"
+        f"  p99={percentile(latencies, 99) * 1000:>7.1f}ms"
+        f"  mean={statistics.fmean(latencies) * 1000:>7.1f}ms"
+    )
+
+
+def run_sync(path, params, requests, concurrency):
+    from django.db import connection
+    from django.test import Client
+
+    def one(_):
+        client = Client()
+        started = time.perf_counter()
+        response = client.get(path, params)
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.content
+        connection.close()
+        return elapsed
+
+    # Threads beyond a few dozen only add contention on the GIL and SQLite,
+    # so the pool is capped; the remaining requests queue behind it.
+    with ThreadPoolExecutor(max_workers=min(concurrency, 64)) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(one, range(requests)))
+        return time.perf_counter() - started, latencies
+
+
+async def run_async(path, params, requests, concurrency):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(path, params)
+            elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.content
+        return elapsed
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--classes', type=int, default=200)
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        from django.conf import settings
+        from src.booking.models import BookingModel
+
+        # Measure the handlers, not the class-list cache.
+        settings.BOOKING_CLASS_LIST_CACHE_TIMEOUT = 0
+
+        classes = [create_class(20) for _ in range(args.classes)]
+        BookingModel.objects.bulk_create([
+            BookingModel(fitness=fitness, client_name=f'Member {n % 50}', client_email=f'member{n % 50}@example.com',
+                         client_email_normalized=f'member{n % 50}@example.com')
+            for n, fitness in enumerate(classes)
+        ])
+
+        print(f"requests={args.requests} concurrency={args.concurrency} classes={args.classes}")
+        for name in args.endpoints:
+            sync_path, async_path, params = ENDPOINTS[name]
+            report(f"{name} sync/WSGI", *run_sync(sync_path, params, args.requests, args.concurrency))
+            report(f"{name} async/ASGI", *asyncio.run(run_async(async_path, params, args.requests, args.concurrency)))
+        print("note: Django's async ORM still runs each query in a worker thread via sync_to_async.")
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
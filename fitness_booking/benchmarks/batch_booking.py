@@ -0,0 +1,54 @@
+"""Compares N single POST /api/book/ calls with one POST /api/book/batch/.
+
+    python benchmarks/batch_booking.py --entries 500 --classes 5
+"""
+import argparse
+import time
+
+from _setup import setup_django, teardown_django, create_class
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=500)
+    parser.add_argument('--classes', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        from django.test import Client
+        from src.booking.models import BookingModel
+
+        client = Client()
+
+        def entries(prefix):
+            classes = [create_class(args.entries) for _ in range(args.classes)]
+            return [
+                {'fitness_id': classes[n % len(classes)].id,
+                 'client_name': f'Member {n}',
+                 'client_email': f'{prefix}{n}@example.com'}
+                for n in range(args.entries)
+            ]
+
+        singles = entries('single')
+        started = time.perf_counter()
+        for entry in singles:
+            assert client.post('/api/book/', entry, content_type='application/json').status_code == 201
+        single_elapsed = time.perf_counter() - started
+
+        batch = entries('batch')
+        started = time.perf_counter()
+        response = client.post('/api/book/batch/', {'bookings': batch}, content_type='application/json')
+        batch_elapsed = time.perf_counter() - started
+        assert response.status_code == 201, response.content
+
+        print(f"entries={args.entries} classes={args.classes} bookings={BookingModel.objects.count()}")
+        print(f"single calls: {single_elapsed:.3f}s ({args.entries / single_elapsed:.0f} bookings/s)")
+        print(f"one batch:    {batch_elapsed:.3f}s ({args.entries / batch_elapsed:.0f} bookings/s)")
+        print(f"speedup:      {single_elapsed / batch_elapsed:.1f}x")
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
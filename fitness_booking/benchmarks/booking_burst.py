@@ -0,0 +1,97 @@
+"""Burst of booking retries against a class that sells out, with and without admission control.
+
+``--clients`` clients (one IP address each) hammer ``POST /api/book/`` for a
+class with ``--slots`` seats, each retrying ``--retries`` times without
+backing off, as happens when a popular class opens. The run reports the
+status mix, how many SQL statements reached the database and how many of
+them were writes. With admission control on, retries against the full
+class are answered from the sold-out hint and clients over their token
+bucket get 429, so database work stays close to one attempt per seat.
+
+    python benchmarks/booking_burst.py --clients 200 --retries 20 --slots 50 --threads 16
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from _setup import setup_django, teardown_django, create_class
+
+
+def run(clients, retries, slots, threads, admission):
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client
+
+    if admission:
+        settings.BOOKING_CLIENT_BUCKET = {'rate': 1, 'burst': 3}
+        settings.BOOKING_CLASS_BUCKET = {'rate': 200, 'burst': 100}
+        settings.BOOKING_SOLD_OUT_HINT_SECONDS = 2
+    else:
+        settings.BOOKING_CLIENT_BUCKET = None
+        settings.BOOKING_CLASS_BUCKET = None
+        settings.BOOKING_SOLD_OUT_HINT_SECONDS = 0
+
+    fitness = create_class(slots)
+    statuses = Counter()
+    statements = Counter()
+    lock = threading.Lock()
+
+    def count(execute, sql, params, many, context):
+        kind = 'write' if sql.lstrip()[:6].upper() in ('UPDATE', 'INSERT', 'DELETE') else 'read'
+        with lock:
+            statements[kind] += 1
+        return execute(sql, params, many, context)
+
+    def client(n):
+        http = Client(REMOTE_ADDR=f'10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}')
+        # Connect first: opening the connection inside the block would append
+        # the timing recorder after ``count``, and leaving it would pop the wrong one.
+        connection.ensure_connection()
+        with connection.execute_wrapper(count):
+            for _ in range(retries):
+                response = http.post('/api/book/', {
+                    'fitness_id': fitness.id, 'client_name': f'Member {n}',
+                    'client_email': f'member{n}-{fitness.id}@example.com',
+                }, content_type='application/json')
+                with lock:
+                    statuses[response.status_code] += 1
+                if response.status_code == 201:
+                    break
+        connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(client, range(clients)))
+    elapsed = time.perf_counter() - started
+    fitness.refresh_from_db()
+    return statuses, statements, elapsed, slots - fitness.available_slots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--retries', type=int, default=20)
+    parser.add_argument('--slots', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        for admission in (False, True):
+            statuses, statements, elapsed, booked = run(args.clients, args.retries, args.slots, args.threads, admission)
+            requests = sum(statuses.values())
+            print(
+                f"admission={'on ' if admission else 'off'} requests={requests:>6} booked={booked:>4}"
+                f"  201={statuses[201]} 400={statuses[400]} 429={statuses[429]}"
+                f"  sql={statements['read'] + statements['write']:>6} writes={statements['write']:>6}"
+                f"  sql/request={(statements['read'] + statements['write']) / requests:.2f}"
+                f"  {requests / elapsed:>7.0f} req/s"
+            )
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Multi-threaded contention benchmark for POST /api/book/.
+
+Many threads race to book the same class through the full request stack.
+The run reports bookings per second and verifies that the class was never
+oversold: confirmed bookings must equal the seats taken and never exceed
+the class capacity.
+
+    python benchmarks/booking_contention.py --threads 32 --slots 200 --attempts 600
+    python benchmarks/booking_contention.py --profile postgres
+"""
+import argparse
+import json
+import threading
+import time
+
+from _setup import setup_django, teardown_django, create_class
+
+
+def run(threads, slots, attempts, shards=0):
+    """Races ``attempts`` bookings over ``threads`` threads and returns the stats."""
+    from django.db import connection
+    from django.test import Client
+    from src.booking.models import BookingModel
+    from src.booking.reservation import stripe_capacity
+
+    fitness = create_class(slots)
+    if shards:
+        stripe_capacity(fitness.pk, shards)
+    counter = iter(range(attempts))
+    lock = threading.Lock()
+    outcomes = {'created': 0, 'rejected': 0, 'errors': 0}
+
+    def worker():
+        client = Client()
+        try:
+            while True:
+                with lock:
+                    n = next(counter, None)
+                if n is None:
+                    return
+                response = client.post('/api/book/', {
+                    'fitness_id': fitness.id,
+                    'client_name': f'Client {n}',
+                    'client_email': f'client{fitness.id}-{n}@example.com',
+                }, content_type='application/json')
+                key = {201: 'created', 400: 'rejected'}.get(response.status_code, 'errors')
+                with lock:
+                    outcomes[key] += 1
+        finally:
+            connection.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    fitness.refresh_from_db()
+    available = fitness.get_available_slots()
+    confirmed = BookingModel.objects.filter(fitness=fitness, status='CONFIRMED').count()
+    return dict(
+        outcomes,
+        threads=threads,
+        shards=shards,
+        elapsed=elapsed,
+        confirmed=confirmed,
+        available_slots=available,
+        oversold=max(confirmed - slots, 0),
+        # Seats taken from the counter that no confirmed booking accounts for.
+        lost_updates=abs((slots - available) - confirmed),
+        bookings_per_second=outcomes['created'] / elapsed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--slots', type=int, default=200)
+    parser.add_argument('--attempts', type=int, default=600)
+    parser.add_argument('--profile', choices=['sqlite', 'sqlite-legacy', 'postgres'], default='sqlite')
+    parser.add_argument('--json', action='store_true', help='print the stats as one JSON object')
+    args = parser.parse_args()
+
+    db_path = setup_django(profile=args.profile)
+    try:
+        stats = run(args.threads, args.slots, args.attempts)
+    finally:
+        teardown_django(db_path)
+
+    if args.json:
+        print(json.dumps(stats))
+        raise SystemExit(0)
+    print(f"profile={args.profile}")
+    print(f"threads={args.threads} slots={args.slots} attempts={args.attempts}")
+    print(f"created={stats['created']} rejected={stats['rejected']} errors={stats['errors']}")
+    print(f"confirmed={stats['confirmed']} available_slots={stats['available_slots']} "
+          f"oversold={stats['oversold']} lost_updates={stats['lost_updates']}")
+    print(f"elapsed={stats['elapsed']:.3f}s bookings/s={stats['bookings_per_second']:.1f}")
+    raise SystemExit(1 if stats['oversold'] or stats['lost_updates'] else 0)
+
+
+if __name__ == '__main__':
+    main()
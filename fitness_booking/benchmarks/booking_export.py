@@ -0,0 +1,45 @@
+"""Peak memory of the streaming booking export at growing row counts.
+
+    python benchmarks/booking_export.py --rows 1000 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from _setup import setup_django, teardown_django, create_class
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        from src.booking.exporter import stream_export
+        from src.booking.models import BookingModel
+
+        fitness = create_class(10)
+        total = 0
+        for rows in sorted(args.rows):
+            BookingModel.objects.bulk_create([
+                BookingModel(fitness=fitness, client_name=f'Member {n}', client_email=f'member{n}@example.com',
+                             client_email_normalized=f'member{n}@example.com')
+                for n in range(total, rows)
+            ], batch_size=5000)
+            total = rows
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            written = sum(len(chunk) for chunk in stream_export(BookingModel.objects.all(), args.format).streaming_content)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"rows={rows:>8}  {written / 1e6:>7.1f} MB written  {elapsed:>6.2f}s  peak={peak / 1e6:>6.2f} MB")
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
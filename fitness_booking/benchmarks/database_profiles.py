@@ -0,0 +1,47 @@
+"""Booking write throughput on each database profile.
+
+Runs benchmarks/booking_contention.py once per profile in its own process
+(Django reads DATABASES once) and prints bookings per second side by side.
+``sqlite-legacy`` is a plain SQLite file with Django's defaults, as the
+project shipped before the profiles existed. The ``postgres`` profile needs
+a reachable server configured through the POSTGRES_* variables and a role
+allowed to create the throwaway ``test_`` database.
+
+    python benchmarks/database_profiles.py --profiles sqlite-legacy sqlite postgres --threads 32
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+CONTENTION = Path(__file__).resolve().parent / 'booking_contention.py'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', default=['sqlite-legacy', 'sqlite'],
+                        choices=['sqlite-legacy', 'sqlite', 'postgres'])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--slots', type=int, default=2000)
+    parser.add_argument('--attempts', type=int, default=2000)
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        proc = subprocess.run([
+            sys.executable, str(CONTENTION), '--json', '--profile', profile,
+            '--threads', str(args.threads), '--slots', str(args.slots), '--attempts', str(args.attempts),
+        ], capture_output=True, text=True)
+        if proc.returncode:
+            print(f"{profile:<14} failed: {proc.stderr.strip().splitlines()[-1:]}")
+            continue
+        stats = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{profile:<14} {stats['bookings_per_second']:>8.1f} bookings/s"
+            f"  created={stats['created']} rejected={stats['rejected']} errors={stats['errors']}"
+            f"  oversold={stats['oversold']} lost_updates={stats['lost_updates']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+"""Benchmarks every route in src/booking/urls.py at growing data sizes.
+
+For each size the database is topped up with ``generate_data`` to that
+many bookings, then every route is requested ``--repeat`` times through the
+full Django stack. Latency percentiles come from those requests; queries
+and peak traced memory per request come from a few extra, instrumented
+requests so tracemalloc does not skew the timings.
+
+    python benchmarks/endpoints.py run --sizes 1000 100000 1000000 -o results.json
+    python benchmarks/endpoints.py compare baseline.json results.json --threshold 0.2
+
+``compare`` exits with status 1 when any route got slower, used more
+queries or more memory than the threshold allows.
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+from itertools import count
+
+from _setup import ROOT, setup_django, teardown_django, create_class
+
+METRICS = ('p50_ms', 'p99_ms', 'queries', 'peak_kib')
+
+
+class Fixture:
+    """Per-size state the scenarios draw on: a bookable class, cancellable bookings, waitlist entries, unique emails."""
+
+    def __init__(self, size):
+        from django.contrib.auth.models import User
+        from django.test import Client
+        from django.db.models import Max
+        from src.booking.models import ClassChangeModel, InstructorModel
+
+        self.size = size
+        self.serial = count()
+        self.client = Client()
+        # Only staff routes pay for the session and user lookups.
+        self.staff_client = Client()
+        admin, _ = User.objects.get_or_create(username='bench', defaults={'is_staff': True, 'is_superuser': True})
+        self.staff_client.force_login(admin)
+        self.instructor = InstructorModel.objects.order_by('pk').first()
+        self.fitness = create_class(1_000_000)
+        # A poller that is 50 changes behind.
+        self.recent_seq = max(ClassChangeModel.objects.aggregate(top=Max('pk'))['top'] - 50, 0)
+        self.cancellable = []
+        self.waiting = []
+
+    def email(self, prefix):
+        return f"{prefix}{self.size}-{next(self.serial)}@example.com"
+
+    def prepare_cancellations(self, total):
+        from src.booking.models import BookingModel
+        from src.booking.reservation import reserve_seats
+
+        bookings = [
+            BookingModel(fitness=self.fitness, client_name='Bench', client_email=email, client_email_normalized=email)
+            for email in (self.email('cancel') for _ in range(total))
+        ]
+        reserve_seats(self.fitness, total)
+        self.cancellable = [(booking.pk, booking.client_email) for booking in BookingModel.objects.bulk_create(bookings)]
+
+    def prepare_waitlist(self, total):
+        from src.booking.models import WaitlistEntryModel
+
+        entries = [
+            WaitlistEntryModel(fitness=self.fitness, client_name='Bench', client_email=email, client_email_normalized=email)
+            for email in (self.email('wait') for _ in range(total))
+        ]
+        self.waiting = [(entry.pk, entry.client_email) for entry in WaitlistEntryModel.objects.bulk_create(entries)]
+
+
+def _window(**delta):
+    from django.utils import timezone
+    start = timezone.now()
+    return start, start + timezone.timedelta(**delta)
+
+
+def _class_payload(fixture):
+    start, _ = _window(days=3)
+    return {
+        'name': 'YOGA', 'instructor': fixture.instructor.pk, 'datetime_ist': start.isoformat(),
+        'total_slots': 20, 'available_slots': 20, 'days_of_week': ['MON'],
+    }
+
+
+def _timetable(fixture):
+    start, _ = _window(days=5)
+    lines = ["name,datetime_ist,total_slots,days_of_week,instructor_email"]
+    lines += [f"HIIT,{start.isoformat()},12,\"TUE,THU\",{fixture.instructor.email}" for _ in range(5)]
+    upload = io.BytesIO('\n'.join(lines).encode())
+    upload.name = 'timetable.csv'
+    return {'file': upload}
+
+
+def _occurrence_window(fixture):
+    start, end = _window(days=1)
+    return {'start': start.isoformat(), 'end': end.isoformat()}
+
+
+def _cancel(fixture):
+    booking_id, email = fixture.cancellable.pop()
+    return {'booking_id': booking_id, 'client_email': email}
+
+
+def _leave(fixture):
+    entry_id, email = fixture.waiting.pop()
+    return {'entry_id': entry_id, 'client_email': email}
+
+
+def _export_window(fixture):
+    start, _ = _window(days=-1)
+    return {'booked_after': start.isoformat()}
+
+
+HEAVY_CLIENT = {'client_email': 'member0@example.com'}
+STAFF_ROUTES = {'booking-export'}
+# Server-Sent Events streams never end; they are timed up to their first event.
+STREAM_ROUTES = {'seat-stream'}
+
+# url name -> [(label, method, request kwargs builder, repeat divisor)]
+# Every route must be listed; ``run`` refuses to start if one is missing.
+SCENARIOS = {
+    'class-list': [
+        ('GET', 'get', lambda f: {'data': {'user_timezone': 'America/New_York'}}, 1),
+        ('POST', 'post', lambda f: {'data': _class_payload(f), 'content_type': 'application/json'}, 1),
+    ],
+    'class-changes': [('GET', 'get', lambda f: {'data': {'since': f.recent_seq}}, 1)],
+    'class-import': [('POST', 'post', lambda f: {'data': _timetable(f)}, 1)],
+    'occurrence-list': [('GET', 'get', lambda f: {'data': _occurrence_window(f)}, 1)],
+    'booking-create': [('POST', 'post', lambda f: {'data': {
+        'fitness_id': f.fitness.pk, 'client_name': 'Bench', 'client_email': f.email('single'),
+    }, 'content_type': 'application/json'}, 1)],
+    'booking-batch-create': [('POST', 'post', lambda f: {'data': {'bookings': [
+        {'fitness_id': f.fitness.pk, 'client_name': 'Bench', 'client_email': f.email('batch')} for _ in range(10)
+    ]}, 'content_type': 'application/json'}, 1)],
+    'booking-list': [('GET', 'get', lambda f: {'data': HEAVY_CLIENT}, 1)],
+    'booking-export': [('GET', 'get', lambda f: {'data': _export_window(f)}, 10)],
+    'instructors': [
+        ('GET', 'get', lambda f: {}, 1),
+        ('POST', 'post', lambda f: {'data': {'name': 'Bench', 'email': f.email('coach')}, 'content_type': 'application/json'}, 1),
+    ],
+    'booking-cancel': [('POST', 'post', lambda f: {'data': _cancel(f), 'content_type': 'application/json'}, 1)],
+    'waitlist': [('GET', 'get', lambda f: {'data': HEAVY_CLIENT}, 1)],
+    'waitlist-leave': [('POST', 'post', lambda f: {'data': _leave(f), 'content_type': 'application/json'}, 1)],
+    'async-class-list': [('GET', 'get', lambda f: {'data': {'user_timezone': 'America/New_York'}}, 1)],
+    'async-booking-list': [('GET', 'get', lambda f: {'data': HEAVY_CLIENT}, 1)],
+    'async-instructors': [('GET', 'get', lambda f: {}, 1)],
+    'seat-stream': [('GET', 'get', lambda f: {'data': {'classes': str(f.fitness.pk)}}, 1)],
+}
+
+
+def routes():
+    from django.urls import reverse
+    from src.booking.urls import urlpatterns
+
+    names = [pattern.name for pattern in urlpatterns]
+    missing = sorted(set(names) - set(SCENARIOS))
+    if missing:
+        raise SystemExit(f"No benchmark scenario for route(s): {', '.join(missing)}")
+    return [(name, reverse(name)) for name in names]
+
+
+def open_stream(path, kwargs):
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+
+    async def first_events():
+        response = await AsyncClient().get(path, **kwargs)
+        stream = response.streaming_content
+        try:
+            await anext(stream)  # reconnect hint
+            await anext(stream)  # current seat counts
+        finally:
+            await stream.aclose()
+        return response
+
+    return async_to_sync(first_events)()
+
+
+def request(fixture, name, method, path, build):
+    if name in STREAM_ROUTES:
+        response = open_stream(path, build(fixture))
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method.upper()} {path} -> {response.status_code}")
+        return
+    client = fixture.staff_client if name in STAFF_ROUTES else fixture.client
+    response = getattr(client, method)(path, **build(fixture))
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    response.close()
+    if response.status_code >= 400:
+        raise RuntimeError(f"{method.upper()} {path} -> {response.status_code}: {response.content[:200]!r}")
+
+
+def measure(fixture, name, method, path, build, repeat, instrumented):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    request(fixture, name, method, path, build)  # warm-up: imports, prepared statements
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request(fixture, name, method, path, build)
+        latencies.append(time.perf_counter() - started)
+
+    queries, peaks = [], []
+    for _ in range(instrumented):
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as captured:
+            request(fixture, name, method, path, build)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        queries.append(len(captured))
+
+    latencies.sort()
+    return {
+        'samples': repeat,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p90_ms': _percentile(latencies, 90) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'queries': max(queries) if queries else None,
+        'peak_kib': max(peaks) / 1024 if peaks else None,
+    }
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed_to(size, seeded):
+    """Tops the database up from ``seeded`` to ``size`` bookings; returns the new total."""
+    from src.booking.synthetic import generate
+
+    extra = size - seeded
+    if extra > 0:
+        generate(
+            instructors=max(5, size // 50_000), classes=max(extra // 16, 20), bookings=extra,
+            clients=max(size // 10, 100), seed=size,
+        )
+    return max(size, seeded)
+
+
+def run(args):
+    db_path = setup_django()
+    try:
+        from django.conf import settings
+        from src.booking.models import BookingModel
+
+        # Cached class-list pages would hide the query and render cost.
+        if not args.cache:
+            settings.BOOKING_CLASS_LIST_CACHE_TIMEOUT = 0
+        results, seeded = [], 0
+        for size in sorted(args.sizes):
+            started = time.perf_counter()
+            seeded = seed_to(size, seeded)
+            fixture = Fixture(size)
+            rows = BookingModel.objects.count()
+            print(f"size={size}: {rows} bookings seeded in {time.perf_counter() - started:.1f}s", flush=True)
+
+            for name, path in routes():
+                if args.only and name not in args.only:
+                    continue
+                for label, method, build, divisor in SCENARIOS[name]:
+                    repeat = max(args.repeat // divisor, 3)
+                    if name == 'booking-cancel':
+                        fixture.prepare_cancellations(repeat + args.instrumented + 1)
+                    elif name == 'waitlist-leave':
+                        fixture.prepare_waitlist(repeat + args.instrumented + 1)
+                    stats = measure(fixture, name, method, path, build, repeat, args.instrumented)
+                    results.append({'size': size, 'rows': rows, 'route': name, 'method': label, 'path': path, **stats})
+                    print(
+                        f"  {name:<22} {label:<4} p50={stats['p50_ms']:>8.2f}ms p99={stats['p99_ms']:>8.2f}ms "
+                        f"queries={stats['queries']} peak={stats['peak_kib']:.0f}KiB", flush=True,
+                    )
+    finally:
+        teardown_django(db_path)
+
+    report = {'meta': _meta(args), 'results': results}
+    with open(args.output, 'w') as out:
+        json.dump(report, out, indent=2)
+    print(f"wrote {args.output}")
+
+
+def _meta(args):
+    import django
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'created_at': datetime.now(dt_timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'machine': platform.machine(),
+        'sizes': sorted(args.sizes),
+        'repeat': args.repeat,
+    }
+
+
+def compare(args):
+    """Prints per-route changes between two result files; returns the regressions."""
+    def load(path):
+        with open(path) as stream:
+            return {(r['size'], r['route'], r['method']): r for r in json.load(stream)['results']}
+
+    old, new = load(args.baseline), load(args.candidate)
+    regressions = []
+    print(f"{'size':>8} {'route':<22} {'method':<6}" + ''.join(f"{metric:>20}" for metric in METRICS))
+    for key in sorted(old.keys() & new.keys()):
+        cells = []
+        for metric in METRICS:
+            before, after = old[key].get(metric), new[key].get(metric)
+            if before is None or after is None:
+                cells.append(f"{'-':>20}")
+                continue
+            change = (after - before) / before if before else (1.0 if after else 0.0)
+            # Query counts are exact, so any added query is a regression;
+            # timings and memory get the noise threshold.
+            regressed = after > before if metric == 'queries' else change > args.threshold
+            if regressed:
+                regressions.append((key, metric, before, after))
+            cells.append(f"{after:>10.1f} ({change:+6.0%}){'!' if regressed else ' '}")
+        print(f"{key[0]:>8} {key[1]:<22} {key[2]:<6}" + ''.join(cells))
+
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"only in {'baseline' if key in old else 'candidate'}: {key}")
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Seed each size and benchmark every route.")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100_000, 1_000_000])
+    run_parser.add_argument('--repeat', type=int, default=50, help="Timed requests per route and size.")
+    run_parser.add_argument('--instrumented', type=int, default=3, help="Extra requests for queries and memory.")
+    run_parser.add_argument('--only', nargs='+', help="Limit the run to these route names.")
+    run_parser.add_argument('--cache', action='store_true', help="Keep the class-list response cache enabled.")
+    run_parser.add_argument('-o', '--output', default='benchmark-results.json')
+
+    compare_parser = commands.add_parser('compare', help="Flag regressions between two result files.")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%).")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(1 if compare(args) else 0)
+
+
+if __name__ == '__main__':
+    main()
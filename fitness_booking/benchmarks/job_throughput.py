@@ -0,0 +1,78 @@
+"""Measures what the job queue takes off the booking path and how fast workers drain it.
+
+First, the cost a booking request pays for its confirmation email: building
+and sending it inline vs queueing a job for it. Then ``--jobs`` confirmation
+jobs are queued and drained by ``run_jobs`` for each combination of
+``--workers`` and ``--batch-sizes``, sending through the locmem email backend
+so the numbers are the queue's overhead rather than an SMTP server's.
+
+    python benchmarks/job_throughput.py --jobs 2000 --workers 1 4 --batch-sizes 1 50
+"""
+import argparse
+import io
+import time
+
+from _setup import setup_django, teardown_django, create_class
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 50])
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        from django.conf import settings
+        from django.core import mail
+        from django.core.management import call_command
+        from django.db import transaction
+        from src.booking.jobs import enqueue, enqueue_many
+        from src.booking.models import BookingModel, JobModel
+        from src.booking.tasks import send_confirmations
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        mail.outbox = []
+        fitness = create_class(args.jobs)
+        bookings = BookingModel.objects.bulk_create(
+            BookingModel(fitness=fitness, client_name=f'Member {n}', client_email=f'member{n}@example.com')
+            for n in range(args.jobs)
+        )
+        payloads = [{'booking_id': booking.pk} for booking in bookings]
+
+        sample = payloads[:min(len(payloads), 500)]
+        started = time.perf_counter()
+        for payload in sample:
+            send_confirmations([payload])
+        inline = (time.perf_counter() - started) / len(sample)
+        started = time.perf_counter()
+        for payload in sample:
+            with transaction.atomic():
+                enqueue('booking_confirmation', payload)
+        queued = (time.perf_counter() - started) / len(sample)
+        JobModel.objects.all().delete()
+
+        print(f"jobs={args.jobs}")
+        print(f"per booking, inline email: {inline * 1000:.2f}ms  enqueue: {queued * 1000:.2f}ms")
+        for workers in args.workers:
+            for batch_size in args.batch_sizes:
+                enqueue_many('booking_confirmation', payloads)
+                mail.outbox = []
+                started = time.perf_counter()
+                call_command(
+                    'run_jobs', workers=workers, batch_size=batch_size, drain=True,
+                    poll_interval=0.01, stdout=io.StringIO(),
+                )
+                elapsed = time.perf_counter() - started
+                assert len(mail.outbox) == args.jobs and not JobModel.objects.exists()
+                print(
+                    f"workers={workers} batch={batch_size:<4} {elapsed:.3f}s"
+                    f" ({args.jobs / elapsed:.0f} jobs/s)"
+                )
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
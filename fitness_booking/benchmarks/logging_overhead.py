@@ -0,0 +1,139 @@
+"""Request latency cost of logging: off, the old synchronous setup, and the queued one.
+
+``sync`` is the previous configuration: root at DEBUG with a plain
+``StreamHandler`` and ``django.db.backends`` at INFO, so every record is
+formatted and written on the request thread. ``queued`` is the current
+``LOGGING`` with its sampling filter and background handler. Both write to a
+temporary file; ``--write-delay`` adds a sleep per write to stand in for a
+slow terminal, pipe or log shipper.
+
+    python benchmarks/logging_overhead.py --requests 2000 --write-delay 0.2
+"""
+import argparse
+import copy
+import itertools
+import logging
+import logging.config
+import os
+import statistics
+import tempfile
+import time
+
+from _setup import setup_django, teardown_django, create_class
+
+
+class SlowFile:
+    """Text file whose writes each take at least ``delay`` seconds."""
+
+    def __init__(self, path, delay):
+        self.file = open(path, 'a')
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def sync_config(stream):
+    from src.config.logging import FORMAT
+
+    return {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {'standard': {'format': FORMAT}},
+        'handlers': {
+            'console': {'level': 'INFO', 'class': 'logging.StreamHandler', 'formatter': 'standard', 'stream': stream},
+        },
+        'loggers': {
+            name: {'level': 'INFO', 'propagate': True}
+            for name in ('django', 'django.request', 'django.db.backends', 'django.templates', 'src')
+        },
+        'root': {'level': 'DEBUG', 'handlers': ['console']},
+    }
+
+
+def queued_config(stream):
+    from src.config.logging import LOGGING
+
+    config = copy.deepcopy(LOGGING)
+    config['handlers']['console']['stream'] = stream
+    return config
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+_members = itertools.count()
+
+
+def run(client, fitness, requests):
+    latencies = []
+    for n in range(requests):
+        started = time.perf_counter()
+        if n % 4 == 3:
+            member = next(_members)
+            response = client.post('/api/book/', {
+                'fitness_id': fitness.pk, 'client_name': f'Member {member}', 'client_email': f'member{member}@example.com',
+            }, content_type='application/json')
+        else:
+            response = client.get('/api/classes/')
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code in (200, 201), response.content
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--write-delay', type=float, default=0.0, help='milliseconds added to each log write')
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    fd, log_path = tempfile.mkstemp(prefix='booking-bench-', suffix='.log')
+    os.close(fd)
+    try:
+        from django.test import Client
+
+        fitness = create_class(args.requests * 3)
+        client = Client()
+        run(client, fitness, 50)  # warm up URL resolution, templates and connections
+
+        modes = {'off': None, 'sync': sync_config, 'queued': queued_config}
+        for mode, make_config in modes.items():
+            stream = SlowFile(log_path, args.write_delay / 1000)
+            if make_config is None:
+                logging.disable(logging.CRITICAL)
+            else:
+                logging.disable(logging.NOTSET)
+                logging.config.dictConfig(make_config(stream))
+            before = os.path.getsize(log_path)
+            latencies = run(client, fitness, args.requests)
+            for handler in logging.getLogger().handlers:
+                handler.flush()
+            written = os.path.getsize(log_path) - before
+            print(
+                f"{mode:<7} p50={percentile(latencies, 50) * 1000:>7.2f}ms"
+                f"  p99={percentile(latencies, 99) * 1000:>7.2f}ms"
+                f"  mean={statistics.fmean(latencies) * 1000:>7.2f}ms"
+                f"  log={written / 1e3:>8.1f} kB"
+            )
+            for handler in logging.getLogger().handlers:
+                handler.close()
+            logging.getLogger().handlers.clear()
+            stream.close()
+    finally:
+        teardown_django(db_path)
+        os.remove(log_path)
+
+
+if __name__ == '__main__':
+    main()
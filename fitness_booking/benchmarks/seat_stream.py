@@ -0,0 +1,97 @@
+"""Measures the live seat-count hub with many idle Server-Sent Events subscribers.
+
+``--subscribers`` streams are opened on one event loop and left idle; the
+traced memory they add is reported per subscriber. A burst of seat updates
+is then published from another thread, the way committing sync views
+publish, and the script reports how long the last subscriber waited and how
+many events each one received (coalescing folds the burst into a few).
+
+    python benchmarks/seat_stream.py --subscribers 5000 --burst 200 --classes 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+import tracemalloc
+
+from _setup import setup_django, teardown_django
+
+
+async def subscriber(hub, received, done, expected):
+    from src.booking.live import seat_events
+
+    stream = seat_events(hub, cursor=hub.seq, heartbeat=3600)
+    await anext(stream)  # reconnect hint
+    seen = {}
+    events = 0
+    async for chunk in stream:
+        events += 1
+        for line in chunk.decode().splitlines():
+            if line.startswith('data: '):
+                seen.update(json.loads(line[6:]))
+        if seen == expected:
+            received.append((time.perf_counter(), events))
+            if len(received) == done.target:
+                done.set()
+            break
+
+
+async def run(args):
+    from src.booking.live import SeatHub
+
+    hub = SeatHub(coalesce=args.coalesce)
+    received = []
+    done = asyncio.Event()
+    done.target = args.subscribers
+    updates = [(n % args.classes, (args.burst - n) % 7) for n in range(args.burst)]
+    final = dict(updates)  # what every subscriber must end up with
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.ensure_future(subscriber(hub, received, done, final)) for _ in range(args.subscribers)]
+    await asyncio.sleep(0.1)  # let every stream subscribe and go idle
+    idle = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    def burst():
+        for update in updates:
+            hub.deliver([update])
+
+    started = time.perf_counter()
+    thread = threading.Thread(target=burst)
+    thread.start()
+    thread.join()
+    published = time.perf_counter()
+    await asyncio.wait_for(done.wait(), 60)
+    await asyncio.gather(*tasks)
+
+    waits = sorted(at - published for at, _ in received)
+    events = [count for _, count in received]
+    print(f"subscribers={args.subscribers} updates={args.burst} classes={args.classes} coalesce={args.coalesce}s")
+    print(f"idle memory: {idle / 1024:.0f} KiB total, {idle / args.subscribers:.0f} bytes per subscriber")
+    print(f"publish burst: {(published - started) * 1000:.1f}ms")
+    print(
+        f"delivery after publish: p50={waits[len(waits) // 2] * 1000:.1f}ms max={waits[-1] * 1000:.1f}ms"
+        f"  events per subscriber: mean={statistics.fmean(events):.1f} max={max(events)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--burst', type=int, default=200, help="Seat updates published back to back.")
+    parser.add_argument('--classes', type=int, default=20, help="Classes the updates are spread over.")
+    parser.add_argument('--coalesce', type=float, default=0.1, help="Seconds updates are gathered before a wake-up.")
+    args = parser.parse_args()
+
+    handle = setup_django()
+    try:
+        asyncio.run(run(args))
+    finally:
+        teardown_django(handle)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Compares the single-row seat counter against striped shard counters.
+
+For each concurrency level the same booking race is run twice: once with
+the class's seats on its own row and once split over ``--shards`` rows.
+
+    python benchmarks/striped_counters.py --threads 1 4 16 64 --shards 8
+
+SQLite serialises every writer on the database lock, so striping mostly
+shows its cost there; the row-level win appears on a server database
+where each shard row is locked independently.
+"""
+import argparse
+
+from _setup import setup_django, teardown_django
+from booking_contention import run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--slots', type=int, default=400)
+    parser.add_argument('--attempts', type=int, default=800)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        print(f"{'threads':>8} {'mode':>10} {'bookings/s':>11} {'errors':>7} {'oversold':>9}")
+        for threads in args.threads:
+            for shards in (0, args.shards):
+                stats = run(threads, args.slots, args.attempts, shards=shards)
+                mode = f'{shards} shards' if shards else 'single'
+                print(f"{threads:>8} {mode:>10} {stats['bookings_per_second']:>11.1f} "
+                      f"{stats['errors']:>7} {stats['oversold'] + stats['lost_updates']:>9}")
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Measures timezone conversion cost when listing many classes.
+
+Compares the old per-field path (two ``pytz.timezone`` lookups and two
+``astimezone`` calls per row) with the batched ``convert_many`` path, and
+times ``FitnessClassSerializer`` over the same rows.
+
+    python benchmarks/timezone_conversion.py --rows 10000 --timezone America/New_York
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from _setup import setup_django, teardown_django
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--timezone', default='America/New_York')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    try:
+        import pytz
+        from src.booking.models import FitnessModel, InstructorModel
+        from src.booking.serializer import FitnessClassSerializer
+        from src.booking.utils import convert_many
+
+        start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        values = [start + timedelta(minutes=53 * i) for i in range(args.rows)]
+
+        def per_field():
+            for dt in values:
+                dt.astimezone(pytz.timezone(args.timezone)).date()
+                dt.astimezone(pytz.timezone(args.timezone)).time()
+
+        instructor = InstructorModel(id=1, name='Bench', email='bench@example.com')
+        rows = [
+            FitnessModel(id=i + 1, name='YOGA', instructor=instructor, datetime_ist=dt, days_of_week=['MON'])
+            for i, dt in enumerate(values)
+        ]
+
+        def serialize():
+            FitnessClassSerializer(rows, many=True, context={'user_timezone': args.timezone}).data
+
+        old = timed(per_field, args.repeat)
+        new = timed(lambda: convert_many(values, args.timezone), args.repeat)
+        full = timed(serialize, args.repeat)
+        print(f"rows={args.rows} timezone={args.timezone}")
+        print(f"per-field pytz conversion: {old * 1000:8.1f} ms")
+        print(f"batched convert_many:      {new * 1000:8.1f} ms ({old / new:.1f}x)")
+        print(f"full list serialization:   {full * 1000:8.1f} ms")
+    finally:
+        teardown_django(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
 from django import forms
-from .models import InstructorModel, FitnessModel, BookingModel
+from django.utils import timezone
+from .models import InstructorModel, FitnessModel, BookingModel, JobModel
+from .reservation import stripe_capacity
+from .exporter import stream_export
 
 @admin.register(InstructorModel)
 class InstructorAdmin(admin.ModelAdmin):
@@ -16,7 +20,15 @@ class BookingAdmin(admin.ModelAdmin):
     search_fields = ['client_name', 'client_email']
     list_per_page = 10
     ordering=['-id']
-    
+    actions = ['export_csv', 'export_ndjson']
+
+    @admin.action(description="Export selected bookings as CSV")
+    def export_csv(self, request, queryset):
+        return stream_export(queryset, 'csv')
+
+    @admin.action(description="Export selected bookings as NDJSON")
+    def export_ndjson(self, request, queryset):
+        return stream_export(queryset, 'ndjson')
 
 
 class FitnessModelForm(forms.ModelForm):
@@ -34,5 +46,41 @@ class FitnessModelForm(forms.ModelForm):
 @admin.register(FitnessModel)
 class FitnessModelAdmin(admin.ModelAdmin):
     form = FitnessModelForm
-    list_display = ('name', 'instructor', 'days_of_week')
+    list_display = ('name', 'instructor', 'days_of_week', 'shard_count')
     ordering=['-id']
+    actions = ['enable_striped_counters', 'disable_striped_counters']
+
+    def get_readonly_fields(self, request, obj=None):
+        # A striped class's seats live in its shard rows, which a form edit
+        # would not touch; collapse the counter first to change them.
+        if obj is not None and obj.shard_count:
+            return [*super().get_readonly_fields(request, obj), 'total_slots', 'available_slots']
+        return super().get_readonly_fields(request, obj)
+
+    @admin.action(description="Spread seat counter across shard rows")
+    def enable_striped_counters(self, request, queryset):
+        shards = getattr(settings, 'BOOKING_SEAT_SHARDS', 8)
+        for fitness_id in queryset.values_list('pk', flat=True):
+            stripe_capacity(fitness_id, shards)
+        self.message_user(request, f"Striped {queryset.count()} class(es) over {shards} shards.")
+
+    @admin.action(description="Collapse seat counter back to a single row")
+    def disable_striped_counters(self, request, queryset):
+        for fitness_id in queryset.values_list('pk', flat=True):
+            stripe_capacity(fitness_id, 0)
+        self.message_user(request, f"Collapsed {queryset.count()} class(es) to a single counter.")
+
+
+
+@admin.register(JobModel)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['task', 'status', 'attempts', 'run_after', 'created_at']
+    list_filter = ['status', 'task']
+    readonly_fields = ['last_error']
+    ordering = ['-id']
+    actions = ['retry_now']
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_now(self, request, queryset):
+        count = queryset.update(status=JobModel.QUEUED, attempts=0, run_after=timezone.now())
+        self.message_user(request, f"Queued {count} job(s) to run again.")
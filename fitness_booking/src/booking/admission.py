@@ -0,0 +1,160 @@
+"""Admission control for ``POST /api/book/``, checked before the serializer runs.
+
+``BookingAdmissionThrottle`` takes one token from the client's bucket and
+then one from the class's bucket (``BOOKING_CLIENT_BUCKET`` and
+``BOOKING_CLASS_BUCKET``). An empty bucket is answered with 429 and a
+``Retry-After`` of when the next token is due. Retries that replay a stored
+``Idempotency-Key`` response are let through without taking a token.
+
+``sold_out`` remembers classes and sessions that were found full for
+``BOOKING_SOLD_OUT_HINT_SECONDS``, so retries against them are turned away
+without a query. Releasing a seat or saving the class in this process
+clears the hint at once; other processes find out when their hint expires.
+
+Both live in process memory: with several app processes each enforces its
+own share, and a restart starts every bucket full.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.fields import BooleanField
+from rest_framework.throttling import BaseThrottle
+
+from .idempotency import is_replay
+
+
+class TokenBuckets:
+    """Token buckets keyed by client or class; the least recently used are forgotten first."""
+
+    def __init__(self, rate, burst, max_keys=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, now=None):
+        """Takes a token for ``key``; returns 0 on success or the seconds until one is due."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SoldOutHints:
+    def __init__(self):
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key):
+        ttl = settings.BOOKING_SOLD_OUT_HINT_SECONDS
+        if ttl:
+            with self._lock:
+                self._until[key] = time.monotonic() + ttl
+
+    def clear(self, key):
+        with self._lock:
+            self._until.pop(key, None)
+
+    def clear_class(self, fitness_id):
+        """Drops the hints for a class and all of its sessions."""
+        fitness_id = str(fitness_id)
+        with self._lock:
+            for key in [key for key in self._until if key[0] == fitness_id]:
+                del self._until[key]
+
+    def remaining(self, key):
+        """Seconds the hint has left, or 0 when ``key`` is not known to be full."""
+        until = self._until.get(key)
+        if until is None:
+            return 0.0
+        left = until - time.monotonic()
+        if left <= 0:
+            with self._lock:
+                if self._until.get(key) == until:
+                    del self._until[key]
+            return 0.0
+        return left
+
+    def reset(self):
+        with self._lock:
+            self._until.clear()
+
+
+sold_out = SoldOutHints()
+
+
+def sold_out_key(fitness_id, occurrence_id=None):
+    # Ids arrive as ints from the ORM and as strings or ints from request bodies.
+    return str(fitness_id), str(occurrence_id) if occurrence_id else None
+
+
+def sold_out_wait(data):
+    """Seconds left on the sold-out hint for the class or session a booking request names."""
+    if not hasattr(data, 'get') or data.get('fitness_id') is None:
+        return 0.0
+    if data.get('join_waitlist') in BooleanField.TRUE_VALUES:
+        return 0.0  # a full class is exactly what the waitlist is for
+    return sold_out.remaining(sold_out_key(data.get('fitness_id'), data.get('occurrence_id')))
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_buckets(setting):
+    """The shared ``TokenBuckets`` for a ``{'rate': ..., 'burst': ...}`` setting, or None when it is off."""
+    config = getattr(settings, setting, None)
+    if not config:
+        return None
+    with _buckets_lock:
+        if setting not in _buckets:
+            _buckets[setting] = TokenBuckets(config['rate'], config['burst'])
+        return _buckets[setting]
+
+
+@receiver(setting_changed)
+def reset_admission(setting, **kwargs):
+    if setting in ('BOOKING_CLIENT_BUCKET', 'BOOKING_CLASS_BUCKET'):
+        with _buckets_lock:
+            _buckets.pop(setting, None)
+    elif setting == 'BOOKING_SOLD_OUT_HINT_SECONDS':
+        sold_out.reset()
+
+
+class BookingAdmissionThrottle(BaseThrottle):
+    """Per-client, then per-class token bucket for booking attempts."""
+
+    def allow_request(self, request, view):
+        self.delay = 0.0
+        if is_replay(view, request):
+            # Answered from the stored response without touching a seat.
+            return True
+        client = get_buckets('BOOKING_CLIENT_BUCKET')
+        if client is not None:
+            self.delay = client.take(self.get_ident(request))
+            if self.delay:
+                # A rejected client does not use up the class's tokens.
+                return False
+        classes = get_buckets('BOOKING_CLASS_BUCKET')
+        fitness_id = request.data.get('fitness_id') if hasattr(request.data, 'get') else None
+        if classes is not None and fitness_id is not None:
+            self.delay = classes.take(str(fitness_id))
+        return not self.delay
+
+    def wait(self):
+        return math.ceil(self.delay)
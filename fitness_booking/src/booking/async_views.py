@@ -0,0 +1,126 @@
+"""Async twins of the read-only endpoints, for ASGI deployments.
+
+DRF's ``APIView`` is sync-only, so under ASGI every request to it is handed
+to a worker thread. These views are plain Django async views: they fetch
+with the async ORM, serialize the already-loaded rows in the event loop and
+return rendered JSON, matching the sync endpoints' response bodies.
+"""
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.timezone import now
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from .caching import acached_json, aclass_list_cache_key
+from .live import get_hub, seat_events
+from .models import FitnessModel, InstructorModel
+from .pagination import KeysetPagination
+from .serializer import BookingSerializer, FitnessClassSerializer, InstructorSerializer
+from .utils import get_timezone
+from .views import client_bookings, parse_days_filter, upcoming_classes
+
+logger = logging.getLogger(__name__)
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type='application/json')
+
+
+class AsyncClassListView(View):
+    replica_reads = True
+
+    async def get(self, request):
+        try:
+            user_tz = request.GET.get('user_timezone', 'Asia/Kolkata')
+            user_timezone = get_timezone(user_tz)
+            current_time = now().astimezone(user_timezone)
+            days_mask = parse_days_filter(request.GET)
+
+            async def build():
+                paginator = KeysetPagination()
+                page = await paginator.apaginate_queryset(upcoming_classes(current_time, days_mask), request)
+                serializer = FitnessClassSerializer(page, many=True, context={'user_timezone': user_timezone})
+                return JSONRenderer().render(paginator.get_paginated_data(serializer.data)), [fitness.pk for fitness in page]
+
+            return await acached_json(request, await aclass_list_cache_key(request, user_tz), build)
+
+        except ValidationError as e:
+            return json_response({"errors": e.detail}, status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Error fetching class list")
+            return json_response({"error": "Internal server error"}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncBookingListView(View):
+    replica_reads = True
+
+    async def get(self, request):
+        if not request.GET.get('client_email'):
+            logger.warning("Missing client_email in booking list request")
+            return json_response({"error": "client_email is required"}, status.HTTP_400_BAD_REQUEST)
+        try:
+            paginator = KeysetPagination(ordering_field='booked_at', descending=True)
+            page = await paginator.apaginate_queryset(client_bookings(request.GET), request)
+            return json_response(paginator.get_paginated_data(BookingSerializer(page, many=True).data))
+        except ValidationError as e:
+            return json_response({"errors": e.detail}, status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Error retrieving bookings")
+            return json_response({"error": "Internal server error"}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncInstructorView(View):
+    replica_reads = True
+
+    async def get(self, request):
+        try:
+            instructors = [instructor async for instructor in InstructorModel.objects.all()]
+            return json_response(InstructorSerializer(instructors, many=True).data)
+        except Exception as e:
+            logger.exception("Error fetching instructors")
+            return json_response({"error": "Internal server error"}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SeatStreamView(View):
+    """Server-Sent Events stream of ``[[class_id, available_slots], ...]`` seat updates.
+
+    ``?classes=1,2`` limits the stream to those classes and starts it with
+    their current counts. A reconnecting client's ``Last-Event-ID`` resumes
+    from the hub's retained state, so it gets the latest count of every
+    class that changed while it was away.
+    """
+
+    async def get(self, request):
+        classes = None
+        if request.GET.get('classes'):
+            try:
+                classes = {int(value) for value in request.GET['classes'].split(',')}
+            except ValueError:
+                return json_response({"error": "classes must be comma-separated class ids"}, status.HTTP_400_BAD_REQUEST)
+
+        hub = get_hub()
+        last_id = request.headers.get('Last-Event-ID', '')
+        snapshot = None
+        if last_id.isdigit():
+            # An id from before a restart of this process means start over.
+            cursor = int(last_id) if int(last_id) <= hub.seq else 0
+        else:
+            # Taken before the snapshot query, so nothing committed meanwhile is missed.
+            cursor = hub.seq
+            if classes:
+                snapshot = [
+                    list(row) async for row in FitnessModel.objects.with_available_slots()
+                    .filter(pk__in=classes).order_by('pk').values_list('pk', 'live_available_slots')
+                ]
+
+        response = StreamingHttpResponse(
+            seat_events(hub, cursor, classes, snapshot, settings.BOOKING_LIVE_HEARTBEAT_SECONDS),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # stop nginx from holding events back
+        return response
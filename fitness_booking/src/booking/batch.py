@@ -0,0 +1,93 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from .jobs import enqueue_many
+from .models import BookingModel, FitnessModel
+from .reservation import release_seat, reserve_seats
+from .serializer import BatchBookingItemSerializer, BookingSerializer
+
+
+def book_batch(entries):
+    """Books many ``(fitness_id, client)`` entries in one transaction.
+
+    Entries are validated up front with one query per model, seats are taken
+    with one conditional UPDATE per class and the bookings are written with
+    a single ``bulk_create``. Returns one result dict per entry, in order.
+    """
+    results = [None] * len(entries)
+    valid = []
+    # One serializer for every entry: building its fields costs more than
+    # validating an entry, so a serializer per entry dominated the batch.
+    item = BatchBookingItemSerializer()
+    for index, entry in enumerate(entries):
+        try:
+            valid.append((index, item.run_validation(entry)))
+        except ValidationError as e:
+            results[index] = {'index': index, 'errors': as_serializer_error(e)}
+
+    fitness_ids = {data['fitness_id'] for _, data in valid}
+    classes = FitnessModel.objects.select_related('instructor').in_bulk(fitness_ids)
+    emails = {data['client_email'] for _, data in valid}
+    taken = set(
+        BookingModel.objects.filter(fitness_id__in=classes, client_email__in=emails, occurrence__isnull=True)
+        .values_list('fitness_id', 'client_email')
+    )
+
+    wanted = defaultdict(list)
+    for index, data in valid:
+        key = (data['fitness_id'], data['client_email'])
+        if data['fitness_id'] not in classes:
+            results[index] = {'index': index, 'errors': {'fitness_id': ["Fitness class with this ID does not exist."]}}
+        elif key in taken:
+            results[index] = {'index': index, 'errors': ["You have already booked this class."]}
+        else:
+            taken.add(key)
+            wanted[data['fitness_id']].append((index, data))
+
+    with transaction.atomic():
+        bookings = []
+        for fitness_id, items in wanted.items():
+            fitness = classes[fitness_id]
+            granted = reserve_seats(fitness, len(items))
+            for n, (index, data) in enumerate(items):
+                if n < granted:
+                    bookings.append((index, BookingModel(
+                        fitness=fitness,
+                        client_name=data['client_name'],
+                        client_email=data['client_email'],
+                        client_email_normalized=BookingModel.normalize_email(data['client_email']),
+                    )))
+                else:
+                    results[index] = {'index': index, 'errors': ["No slots available for this class."]}
+
+        try:
+            with transaction.atomic():
+                BookingModel.objects.bulk_create([booking for _, booking in bookings])
+        except IntegrityError:
+            # A concurrent request booked one of these emails after the lookup
+            # above: only that entry fails, and its seat goes back.
+            bookings = _create_each(bookings, results)
+        if bookings:
+            enqueue_many('booking_confirmation', [{'booking_id': booking.pk} for _, booking in bookings])
+
+    data = BookingSerializer([booking for _, booking in bookings], many=True).data
+    for (index, _), booking in zip(bookings, data):
+        results[index] = {'index': index, 'booking': booking}
+    return results
+
+
+def _create_each(bookings, results):
+    created = []
+    for index, booking in bookings:
+        try:
+            with transaction.atomic():
+                booking.save(force_insert=True)
+            created.append((index, booking))
+        except IntegrityError:
+            booking.pk = None
+            release_seat(booking.fitness)
+            results[index] = {'index': index, 'errors': ["You have already booked this class."]}
+    return created
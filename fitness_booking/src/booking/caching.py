@@ -0,0 +1,154 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+CATALOG_VERSION_KEY = 'booking:catalog-version'
+SEAT_GENERATION_KEY = 'booking:seat-generation'
+CLASS_SEATS_KEY = 'booking:class-seats:{}'
+
+
+def _get_counter(key):
+    value = cache.get(key)
+    if value is None:
+        # Seed from the clock so a counter evicted from the cache can never
+        # come back as an older number that still has entries under it.
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+async def _aget_counter(key):
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        value = await cache.aget(key)
+    return value
+
+
+def _bump_counter(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return _get_counter(key)
+
+
+def get_catalog_version():
+    return _get_counter(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    return _bump_counter(CATALOG_VERSION_KEY)
+
+
+def invalidate_catalog():
+    """Retires every cached class-list page.
+
+    For changes that can move classes between pages: classes created,
+    edited or deleted, instructors renamed. The version is bumped right away
+    and again on commit, so a page rebuilt from pre-commit data in between
+    is retired as well.
+    """
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+def mark_class_changed(fitness_id):
+    cache.set(CLASS_SEATS_KEY.format(fitness_id), _bump_counter(SEAT_GENERATION_KEY), timeout=None)
+
+
+def invalidate_class(fitness_id):
+    """Retires only the cached pages that show this class, for a change to its seat count.
+
+    The class is stamped with the next seat generation; a page built before
+    that generation is rebuilt the next time it is served. Bumped now and on
+    commit, like ``invalidate_catalog``.
+    """
+    mark_class_changed(fitness_id)
+    transaction.on_commit(lambda: mark_class_changed(fitness_id))
+
+
+def class_list_cache_key(request, user_tz):
+    return _class_list_cache_key(request, user_tz, get_catalog_version())
+
+
+async def aclass_list_cache_key(request, user_tz):
+    return _class_list_cache_key(request, user_tz, await _aget_counter(CATALOG_VERSION_KEY))
+
+
+def _class_list_cache_key(request, user_tz, version):
+    params = sorted(
+        (key, value) for key, value in request.GET.lists() if key != 'user_timezone'
+    )
+    raw = f"{request.get_host()}|{user_tz}|{params}"
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"booking:classes:{version}:{digest}"
+
+
+def cached_json(request, cache_key, build):
+    """Serves a JSON body from the cache, calling ``build()`` on a miss.
+
+    ``build`` returns the rendered bytes and the ids of the classes on the
+    page. The ETag is a hash of the bytes, so it stays stable across
+    evictions and rebuilds of the same content and ``If-None-Match``
+    short-circuits to a 304.
+    """
+    entry = cache.get(cache_key)
+    keys = _class_keys(entry)
+    marks = cache.get_many(keys) if keys else {}
+    if entry is None or _seats_changed(entry, marks):
+        # Read before building, so a seat change committed mid-build is newer.
+        generation = _get_counter(SEAT_GENERATION_KEY)
+        for key in _unmarked(keys, marks):
+            cache.add(key, generation, timeout=None)
+        entry = _make_entry(*build(), generation)
+        cache.set(cache_key, entry, settings.BOOKING_CLASS_LIST_CACHE_TIMEOUT)
+    return _entry_response(request, entry)
+
+
+async def acached_json(request, cache_key, build):
+    """``cached_json`` for async views; ``build`` is a coroutine function."""
+    entry = await cache.aget(cache_key)
+    keys = _class_keys(entry)
+    marks = await cache.aget_many(keys) if keys else {}
+    if entry is None or _seats_changed(entry, marks):
+        generation = await _aget_counter(SEAT_GENERATION_KEY)
+        for key in _unmarked(keys, marks):
+            await cache.aadd(key, generation, timeout=None)
+        entry = _make_entry(*await build(), generation)
+        await cache.aset(cache_key, entry, settings.BOOKING_CLASS_LIST_CACHE_TIMEOUT)
+    return _entry_response(request, entry)
+
+
+def _make_entry(body, class_ids, generation):
+    etag = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    return etag, body, generation, tuple(class_ids)
+
+
+def _class_keys(entry):
+    return [CLASS_SEATS_KEY.format(fitness_id) for fitness_id in entry[3]] if entry else []
+
+
+def _seats_changed(entry, marks):
+    # A class whose mark was evicted may have changed, so its page is rebuilt.
+    return len(marks) < len(entry[3]) or any(mark > entry[2] for mark in marks.values())
+
+
+def _unmarked(keys, marks):
+    # Stamped with the rebuild's generation so the rebuilt page is trusted again.
+    return [key for key in keys if key not in marks]
+
+
+def _entry_response(request, entry):
+    etag, body = entry[:2]
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
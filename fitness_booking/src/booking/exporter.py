@@ -0,0 +1,77 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Column name -> lookup; related columns are joined in the same query, so
+# every chunk the iterator fetches already carries its class and instructor.
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'booked_at': 'booked_at',
+    'status': 'status',
+    'client_name': 'client_name',
+    'client_email': 'client_email',
+    'fitness_id': 'fitness_id',
+    'class_name': 'fitness__name',
+    'instructor': 'fitness__instructor__name',
+    'class_starts_at': 'fitness__datetime_ist',
+    'occurrence_starts_at': 'occurrence__starts_at',
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Spreadsheet apps evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_rows(bookings, chunk_size=2000):
+    """Yields one dict per booking, reading ``chunk_size`` rows at a time.
+
+    The queryset is reduced to plain values in key order, so memory stays at
+    one chunk no matter how many bookings are exported.
+    """
+    rows = bookings.order_by('pk').values_list(*EXPORT_COLUMNS.values())
+    columns = list(EXPORT_COLUMNS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, row))
+
+
+class _Echo:
+    """File-like sink that hands each written line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(EXPORT_COLUMNS))
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row.values()])
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_export(bookings, fmt='csv', filename='bookings', chunk_size=2000):
+    """Streams ``bookings`` as a CSV or NDJSON download."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    render = render_csv if fmt == 'csv' else render_ndjson
+    response = StreamingHttpResponse(
+        render(export_rows(bookings, chunk_size)), content_type=EXPORT_FORMATS[fmt]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
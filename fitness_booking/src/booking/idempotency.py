@@ -0,0 +1,155 @@
+"""``Idempotency-Key`` support for the booking write endpoints.
+
+The first request with a key runs normally. Its response, with the headers
+the view set on it, is stored in the same transaction as the write it made,
+so a retry with the same key and body is answered from one primary-key
+lookup and never reaches the seat counters or the bookings table. Admission
+control lets such replays through (see ``is_replay``): a retry must get its
+answer, not a 429, and must not spend tokens. The key row is inserted before the view runs: a
+duplicate sent while the original is still in flight waits on that row and
+then replays the result.
+
+Server errors and transient refusals (409, 429, and responses a view marks
+with ``transient``, such as "no slots available") are not stored, so they
+can be retried. Keys expire after ``BOOKING_IDEMPOTENCY_TTL`` seconds; expired
+rows are removed with ``purge_idempotency_keys``.
+"""
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKeyModel
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Responses worth replaying; anything else is rolled back so a retry runs again.
+UNSTORED_STATUSES = {status.HTTP_409_CONFLICT, status.HTTP_429_TOO_MANY_REQUESTS}
+
+
+def _digest(*parts):
+    return hashlib.sha256(b'\n'.join(parts)).hexdigest()
+
+
+def idempotent(scope):
+    """Makes an ``APIView`` handler replay its stored response for a repeated key."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None:
+                return handler(view, request, *args, **kwargs)
+            if not key or len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {"error": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            key_hash = _digest(scope.encode(), key.encode())
+            request_hash = _digest(request.body)
+
+            stored = _stored(request, key_hash)
+            if stored is not None:
+                return _replay(stored, request_hash)
+            try:
+                with transaction.atomic():
+                    _claim(key_hash, request_hash)
+                    response = handler(view, request, *args, **kwargs)
+                    if not _storable(response):
+                        transaction.set_rollback(True)
+                        return response
+                    body = JSONRenderer().render(response.data)
+                    IdempotencyKeyModel.objects.filter(pk=key_hash).update(
+                        status_code=response.status_code,
+                        response_body=body,
+                        # Content-Type is settled when the response renders; a replay is always JSON.
+                        response_headers={k: v for k, v in response.items() if k.lower() != 'content-type'},
+                    )
+                    return response
+            except IntegrityError:
+                # A concurrent request with this key committed first.
+                stored = _lookup(key_hash)
+                if stored is None:
+                    raise
+                return _replay(stored, request_hash)
+        wrapper.idempotency_scope = scope
+        return wrapper
+    return decorator
+
+
+def is_replay(view, request):
+    """True when ``request`` will be answered from a stored response by its ``@idempotent`` handler."""
+    handler = getattr(view, request.method.lower(), None)
+    scope = getattr(handler, 'idempotency_scope', None)
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if scope is None or not key or len(key) > MAX_KEY_LENGTH:
+        return False
+    stored = _stored(request, _digest(scope.encode(), key.encode()))
+    return stored is not None and stored.request_hash == _digest(request.body)
+
+
+def _stored(request, key_hash):
+    # Looked up once per request, whether admission control or the handler asks first.
+    cached = getattr(request, '_idempotency_lookup', None)
+    if cached is None or cached[0] != key_hash:
+        cached = request._idempotency_lookup = (key_hash, _lookup(key_hash))
+    return cached[1]
+
+
+def transient(response):
+    """Marks a refusal that a later retry may not get (e.g. a full class), so it is not stored."""
+    response.idempotency_transient = True
+    return response
+
+
+def _lookup(key_hash):
+    return IdempotencyKeyModel.objects.filter(pk=key_hash, expires_at__gt=timezone.now()).first()
+
+
+def _claim(key_hash, request_hash):
+    now = timezone.now()
+    IdempotencyKeyModel.objects.filter(pk=key_hash, expires_at__lte=now).delete()
+    IdempotencyKeyModel.objects.create(
+        key_hash=key_hash,
+        request_hash=request_hash,
+        expires_at=now + timedelta(seconds=settings.BOOKING_IDEMPOTENCY_TTL),
+    )
+
+
+def _storable(response):
+    return (
+        isinstance(response, Response)
+        and response.status_code < 500
+        and response.status_code not in UNSTORED_STATUSES
+        and not getattr(response, 'idempotency_transient', False)
+    )
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return Response(
+            {"error": f"{IDEMPOTENCY_HEADER} was already used with a different request body"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = HttpResponse(bytes(stored.response_body), status=stored.status_code, content_type='application/json')
+    for header, value in stored.response_headers.items():
+        response[header] = value
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def purge_expired(batch_size=10000):
+    """Deletes expired keys in batches and returns how many were removed."""
+    removed = 0
+    while True:
+        expired = IdempotencyKeyModel.objects.filter(expires_at__lte=timezone.now()).values_list('pk', flat=True)[:batch_size]
+        deleted, _ = IdempotencyKeyModel.objects.filter(pk__in=list(expired)).delete()
+        removed += deleted
+        if deleted < batch_size:
+            return removed
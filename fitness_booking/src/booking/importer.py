@@ -0,0 +1,146 @@
+import codecs
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from .caching import invalidate_catalog
+from .models import ClassChangeModel, FitnessModel, InstructorModel, days_to_mask
+from .schedule import materialize_new
+from .serializer import FitnessImportSerializer, InstructorImportSerializer
+
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_records(stream, fmt):
+    """Yields one dict per CSV row or NDJSON line without reading the whole file."""
+    # Uploaded files and binary handles iterate as byte lines; decode lazily.
+    text = stream if isinstance(stream, io.TextIOBase) else codecs.iterdecode(stream, 'utf-8-sig')
+
+    if fmt == 'csv':
+        for row in csv.DictReader(text):
+            days = row.get('days_of_week')
+            if days is not None:
+                row['days_of_week'] = [day.strip() for day in days.split(',') if day.strip()]
+            yield {key: value for key, value in row.items() if value not in ('', None)}
+    elif fmt == 'ndjson':
+        for line in text:
+            line = line.strip()
+            if line:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield {'_error': "Malformed JSON line."}
+                    continue
+                yield record if isinstance(record, dict) else {'_error': "Expected a JSON object."}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def guess_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'ndjson'
+
+
+def import_timetable(records, chunk_size=1000, progress=None):
+    """Imports instructor and class records in chunked transactions.
+
+    Rows with ``type: instructor`` create instructors; every other row is a
+    class whose ``instructor_email`` is resolved with one lookup per chunk
+    (unknown emails are created when ``instructor_name`` is given). Invalid
+    rows are reported and skipped. ``progress`` is called with the running
+    report after each chunk.
+    """
+    report = {'rows': 0, 'instructors_created': 0, 'classes_created': 0, 'failed': 0, 'errors': []}
+    records = iter(records)
+    offset = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        _import_chunk(chunk, offset, report)
+        offset += len(chunk)
+        if progress:
+            progress(report)
+    return report
+
+
+def _import_chunk(chunk, offset, report):
+    def fail(index, errors):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': offset + index + 1, 'errors': errors})
+
+    new_instructors = {}
+    classes = []
+    instructor = InstructorImportSerializer()
+    for index, record in enumerate(chunk):
+        if '_error' in record:
+            fail(index, [record['_error']])
+            continue
+        email = (record.get('email') if record.get('type') == 'instructor' else record.get('instructor_email')) or ''
+        email = email.strip()
+        if not email:
+            fail(index, {'instructor_email': ["This field is required."]})
+            continue
+
+        if record.get('type') == 'instructor':
+            try:
+                data = instructor.run_validation({
+                    'name': record.get('name') or email, 'email': email, 'bio': record.get('bio', ''),
+                })
+            except ValidationError as e:
+                fail(index, as_serializer_error(e))
+                continue
+            new_instructors.setdefault(email, InstructorModel(**data))
+            continue
+
+        item = FitnessImportSerializer(data=record)
+        if not item.is_valid():
+            fail(index, item.errors)
+            continue
+        if record.get('instructor_name'):
+            try:
+                data = instructor.run_validation({
+                    'name': record['instructor_name'], 'email': email, 'bio': record.get('instructor_bio', ''),
+                })
+            except ValidationError as e:
+                # Reported under the class row's own column names.
+                fail(index, {f'instructor_{field}': errors for field, errors in as_serializer_error(e).items()})
+                continue
+            new_instructors.setdefault(email, InstructorModel(**data))
+        classes.append((index, email, item.validated_data))
+
+    with transaction.atomic():
+        emails = set(new_instructors) | {email for _, email, _ in classes}
+        instructors = InstructorModel.objects.in_bulk(emails, field_name='email')
+        created = InstructorModel.objects.bulk_create(
+            [obj for email, obj in new_instructors.items() if email not in instructors]
+        )
+        instructors.update((obj.email, obj) for obj in created)
+
+        rows = []
+        for index, email, data in classes:
+            if email not in instructors:
+                fail(index, {'instructor_email': [f"No instructor with email {email}."]})
+                continue
+            # bulk_create skips save(), so the weekday mask is filled in here.
+            rows.append(FitnessModel(
+                instructor=instructors[email], days_mask=days_to_mask(data.get('days_of_week')), **data
+            ))
+        FitnessModel.objects.bulk_create(rows)
+        if rows:
+            # bulk_create sends no post_save, so the rows are logged for delta
+            # sync and expanded into dated occurrences here.
+            ClassChangeModel.record(*(row.pk for row in rows))
+            materialize_new(rows)
+
+        if created or rows:
+            invalidate_catalog()
+
+    report['rows'] += len(chunk)
+    report['instructors_created'] += len(created)
+    report['classes_created'] += len(rows)
@@ -0,0 +1,167 @@
+"""Database-backed queue for work that should not hold up a response.
+
+``enqueue`` writes a ``JobModel`` row in the caller's transaction, so a job
+becomes visible to workers only when the booking it belongs to commits, and
+vanishes with it on rollback. ``python src/manage.py run_jobs`` runs a pool
+of worker threads. Each one claims up to ``batch_size`` due jobs in one short
+transaction by pushing their ``run_after`` past a lease, runs them grouped by
+task, deletes the successful ones with a single DELETE and reschedules the
+failures with exponential backoff. A worker that dies mid-batch loses
+nothing: its jobs fall due again when the lease runs out, so a job may run
+more than once and handlers must tolerate that. After
+``BOOKING_JOB_MAX_ATTEMPTS`` a job stays in the table as failed.
+
+Handlers are registered with ``@task(name)``. A ``batch=True`` handler is
+called once with the payloads of every claimed job of its task, which lets
+it load rows with one query and send mail over one connection. It returns
+one error (or None) per payload, so only the jobs that failed are retried;
+returning None means all succeeded, and raising retries the whole group.
+"""
+import logging
+import random
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import JobModel
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name, batch=False):
+    """Registers a job handler under ``name``."""
+    def register(func):
+        TASKS[name] = (func, batch)
+        return func
+    return register
+
+
+def enqueue(name, payload, delay=0):
+    return enqueue_many(name, [payload], delay)[0]
+
+
+def enqueue_many(name, payloads, delay=0):
+    """Queues one job per payload with a single INSERT, in the current transaction."""
+    if name not in TASKS:
+        raise ValueError(f"Unknown job task: {name!r}")
+    run_after = timezone.now() + timedelta(seconds=delay)
+    return JobModel.objects.bulk_create(
+        JobModel(task=name, payload=payload, run_after=run_after) for payload in payloads
+    )
+
+
+def claim(batch_size):
+    """Takes up to ``batch_size`` due jobs, oldest first, and leases them to this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        # SKIP LOCKED lets workers claim side by side on PostgreSQL; SQLite
+        # runs the whole claim as one IMMEDIATE transaction instead.
+        jobs = list(
+            JobModel.objects.select_for_update(skip_locked=True)
+            .filter(status=JobModel.QUEUED, run_after__lte=now)
+            .order_by('run_after', 'id')[:batch_size]
+        )
+        if jobs:
+            JobModel.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                run_after=now + timedelta(seconds=settings.BOOKING_JOB_LEASE_SECONDS),
+                attempts=F('attempts') + 1,
+            )
+    for job in jobs:
+        job.attempts += 1
+    return jobs
+
+
+def run_batch(jobs):
+    """Runs claimed jobs; returns ``(succeeded, failed)`` counts."""
+    groups = defaultdict(list)
+    for job in jobs:
+        groups[job.task].append(job)
+
+    done, failed = [], []
+    for name, group in groups.items():
+        func, batch = TASKS.get(name, (None, False))
+        if func is None:
+            failed += [(job, f"Unknown job task: {name!r}") for job in group]
+        elif batch:
+            try:
+                errors = func([job.payload for job in group])
+            except Exception as e:
+                logger.exception("Job batch %s failed (%d jobs)", name, len(group))
+                failed += [(job, repr(e)) for job in group]
+                continue
+            for job, error in zip(group, errors or [None] * len(group)):
+                if error is None:
+                    done.append(job)
+                else:
+                    logger.error("Job %s failed: %s", job, error)
+                    failed.append((job, error))
+        else:
+            for job in group:
+                try:
+                    func(job.payload)
+                    done.append(job)
+                except Exception as e:
+                    logger.exception("Job %s failed", job)
+                    failed.append((job, repr(e)))
+
+    if done:
+        JobModel.objects.filter(pk__in=[job.pk for job in done]).delete()
+    for job, error in failed:
+        reschedule(job, error)
+    return len(done), len(failed)
+
+
+def backoff(attempts):
+    """Seconds before retry number ``attempts``: doubling from the base, capped, with jitter."""
+    delay = min(settings.BOOKING_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.BOOKING_JOB_BACKOFF_MAX_SECONDS)
+    # Jitter keeps jobs that failed together from all retrying together.
+    return delay * random.uniform(1, 1.25)
+
+
+def reschedule(job, error):
+    if job.attempts >= settings.BOOKING_JOB_MAX_ATTEMPTS:
+        logger.error("Job %s gave up after %d attempts: %s", job, job.attempts, error)
+        changes = {'status': JobModel.FAILED}
+    else:
+        changes = {'run_after': timezone.now() + timedelta(seconds=backoff(job.attempts))}
+    JobModel.objects.filter(pk=job.pk).update(last_error=error[:2000], **changes)
+
+
+def work(batch_size=50, poll_interval=1.0, stop=None, drain=False):
+    """Claims and runs batches until ``stop`` is set, or until the queue is empty with ``drain``.
+
+    Returns ``(succeeded, failed)`` totals.
+    """
+    def idle():
+        if stop is not None:
+            stop.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
+
+    succeeded = failed = 0
+    while stop is None or not stop.is_set():
+        close_old_connections()
+        try:
+            jobs = claim(batch_size)
+            if not jobs:
+                if drain:
+                    break
+                idle()
+                continue
+            ok, bad = run_batch(jobs)
+        except DatabaseError:
+            # A lost connection or lock timeout must not kill the worker; the
+            # batch's lease runs out and the jobs are claimed again.
+            logger.exception("Job worker hit a database error")
+            idle()
+            continue
+        succeeded += ok
+        failed += bad
+    return succeeded, failed
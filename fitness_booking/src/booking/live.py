@@ -0,0 +1,198 @@
+"""Live seat counts pushed to Server-Sent Events subscribers.
+
+Seat changes are published once their transaction commits, as
+``(class_id, available_slots)`` pairs, to the backend named by
+``BOOKING_LIVE_BACKEND``. The backend hands them to each process's
+``SeatHub``, which keeps only the latest count per class: a subscriber
+that wakes up after ten bookings on one class gets one update for it.
+
+An idle subscriber is a suspended coroutine waiting on an event shared by
+every subscriber on its event loop, so thousands of open streams cost no
+threads or queues. Publishing wakes each loop once, after
+``BOOKING_LIVE_COALESCE_SECONDS``, however many streams it serves.
+
+``LocalBackend`` delivers within the process, which is all a single ASGI
+server needs. With several processes, a backend built on a broker (Redis
+pub/sub, PostgreSQL LISTEN/NOTIFY) implements the same three methods:
+``publish`` sends to the broker, a listener calls ``hub.deliver`` in each
+process, and ``wants_updates`` returns True.
+"""
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import FitnessModel
+
+
+class _LoopState:
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.listeners = 0
+        self.wake_pending = False
+
+
+class SeatHub:
+    """Latest seat count per class, fanned out to the subscribers in this process."""
+
+    def __init__(self, coalesce=0.1):
+        self.coalesce = coalesce
+        self.seq = 0
+        self.listeners = 0
+        # class_id -> (seq, available_slots), least recently changed first.
+        self._latest = OrderedDict()
+        self._loops = {}
+        self._lock = threading.Lock()
+
+    def deliver(self, updates):
+        """Records ``(class_id, available_slots)`` pairs and wakes subscribers; callable from any thread."""
+        with self._lock:
+            for class_id, available in updates:
+                self.seq += 1
+                self._latest[class_id] = (self.seq, available)
+                self._latest.move_to_end(class_id)
+            loops = list(self._loops)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._schedule_wake, loop)
+            except RuntimeError:
+                pass  # loop closed; its subscribers are gone
+
+    def since(self, cursor, classes=None):
+        """Updates after ``cursor``, oldest first, and the cursor to continue from."""
+        updates = []
+        with self._lock:
+            for class_id, (seq, available) in reversed(self._latest.items()):
+                if seq <= cursor:
+                    break
+                if classes is None or class_id in classes:
+                    updates.append((class_id, available))
+            return updates[::-1], self.seq
+
+    def listen(self):
+        """Registers a subscriber on the running loop; returns the state to wait on."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = _LoopState()
+            state.listeners += 1
+            self.listeners += 1
+        return state
+
+    def unlisten(self, state):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state.listeners -= 1
+            self.listeners -= 1
+            if not state.listeners and self._loops.get(loop) is state:
+                del self._loops[loop]
+
+    def _schedule_wake(self, loop):
+        state = self._loops.get(loop)
+        if state is None or state.wake_pending:
+            return
+        state.wake_pending = True
+        loop.call_later(self.coalesce, self._wake, state)
+
+    def _wake(self, state):
+        state.wake_pending = False
+        event, state.event = state.event, asyncio.Event()
+        event.set()
+
+
+class LocalBackend:
+    """Delivers straight to this process's hub; the stand-in for a broker."""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def wants_updates(self):
+        # Nobody listening in this process means nobody to tell.
+        return self.hub.listeners > 0
+
+    def publish(self, updates):
+        self.hub.deliver(updates)
+
+
+_hub = None
+_backend = None
+_state_lock = threading.Lock()
+
+
+def get_hub():
+    global _hub
+    with _state_lock:
+        if _hub is None:
+            _hub = SeatHub(settings.BOOKING_LIVE_COALESCE_SECONDS)
+        return _hub
+
+
+def get_backend():
+    global _backend
+    hub = get_hub()
+    with _state_lock:
+        if _backend is None:
+            _backend = import_string(settings.BOOKING_LIVE_BACKEND)(hub)
+        return _backend
+
+
+@receiver(setting_changed)
+def reset_live(setting, **kwargs):
+    global _hub, _backend
+    if setting in ('BOOKING_LIVE_BACKEND', 'BOOKING_LIVE_COALESCE_SECONDS'):
+        with _state_lock:
+            _hub = _backend = None
+
+
+def seats_changed(fitness_id):
+    """Publishes the class's seat count once the current transaction commits."""
+    backend = get_backend()
+    if backend.wants_updates():
+        # robust: the write has committed, so a failed push must not turn it into a 500.
+        transaction.on_commit(lambda: publish_seats(backend, [fitness_id]), robust=True)
+
+
+def publish_seats(backend, fitness_ids):
+    rows = (
+        FitnessModel.objects.with_available_slots()
+        .filter(pk__in=fitness_ids)
+        .values_list('pk', 'live_available_slots')
+    )
+    backend.publish(list(rows))
+
+
+def format_event(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+async def seat_events(hub, cursor, classes=None, snapshot=None, heartbeat=15):
+    """The SSE byte stream for one subscriber; runs until the client disconnects."""
+    yield b'retry: 3000\n\n'
+    if snapshot:
+        yield format_event('seats', snapshot, cursor)
+    state = hub.listen()
+    try:
+        while True:
+            # Take the event before reading, so a delivery in between still wakes us.
+            woken = state.event
+            updates, cursor = hub.since(cursor, classes)
+            if updates:
+                yield format_event('seats', updates, cursor)
+                continue
+            try:
+                async with asyncio.timeout(heartbeat):
+                    await woken.wait()
+            except TimeoutError:
+                # Keeps proxies from closing the stream and notices dropped clients.
+                yield b': keepalive\n\n'
+    finally:
+        hub.unlisten(state)
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.booking.models import ClassChangeModel
+
+
+class Command(BaseCommand):
+    help = "Drop delta-sync log rows superseded by a later change of the same class (run hourly or daily)."
+
+    def handle(self, *args, **options):
+        settled_before = timezone.now() - timedelta(seconds=settings.BOOKING_CHANGES_SETTLE_SECONDS)
+        removed = ClassChangeModel.compact(settled_before)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} superseded class changes."))
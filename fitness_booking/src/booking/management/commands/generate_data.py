@@ -0,0 +1,56 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.booking.synthetic import generate
+
+
+class Command(BaseCommand):
+    help = "Fill the database with skewed synthetic instructors, classes and bookings for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--instructors', type=int, default=20)
+        parser.add_argument('--classes', type=int, default=1000)
+        parser.add_argument('--bookings', type=int, default=10000, help="Confirmed bookings to create (capped by seats).")
+        parser.add_argument('--clients', type=int, default=2000, help="Distinct members making the bookings.")
+        parser.add_argument('--recurring-share', type=float, default=0.6, help="Fraction of classes that repeat weekly.")
+        parser.add_argument('--cancel-rate', type=float, default=0.08)
+        parser.add_argument('--client-skew', type=float, default=1.1, help="Zipf exponent; higher means heavier repeat clients.")
+        parser.add_argument('--past-days', type=int, default=60)
+        parser.add_argument('--future-days', type=int, default=28)
+        parser.add_argument('--start-date', type=date.fromisoformat, help="Anchor date (YYYY-MM-DD); defaults to today.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['past_days'] + options['future_days'] <= 0:
+            raise CommandError("--past-days plus --future-days must be positive.")
+        if options['instructors'] <= 0 or options['clients'] <= 0:
+            raise CommandError("--instructors and --clients must be positive.")
+
+        def progress(report):
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f"  {report['classes']} classes, {report['bookings']} bookings so far"
+                )
+
+        report = generate(
+            instructors=options['instructors'],
+            classes=options['classes'],
+            bookings=options['bookings'],
+            clients=options['clients'],
+            recurring_share=options['recurring_share'],
+            cancel_rate=options['cancel_rate'],
+            client_skew=options['client_skew'],
+            past_days=options['past_days'],
+            future_days=options['future_days'],
+            start_date=options['start_date'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['instructors']} instructors, {report['classes']} classes, "
+            f"{report['occurrences']} occurrences and {report['bookings']} bookings "
+            f"({report['cancelled']} cancelled)."
+        ))
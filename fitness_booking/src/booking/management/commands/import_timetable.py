@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from src.booking.importer import guess_format, import_timetable, iter_records
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or NDJSON timetable of instructors and classes into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+
+        def progress(report):
+            self.stdout.write(
+                f"{report['rows']} rows: {report['classes_created']} classes, "
+                f"{report['instructors_created']} instructors, {report['failed']} failed"
+            )
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                report = import_timetable(iter_records(stream, fmt), options['chunk_size'], progress)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['classes_created']} classes and {report['instructors_created']} instructors "
+            f"from {report['rows']} rows ({report['failed']} failed)."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from src.booking.schedule import refresh_horizon
+
+
+class Command(BaseCommand):
+    help = "Roll the dated occurrence table forward to the configured horizon (run daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon-days', type=int, help="Defaults to BOOKING_SCHEDULE_HORIZON_DAYS.")
+
+    def handle(self, *args, **options):
+        count = refresh_horizon(horizon_days=options['horizon_days'])
+        self.stdout.write(self.style.SUCCESS(f"Materialized occurrences for {count} classes."))
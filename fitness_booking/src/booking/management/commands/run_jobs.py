@@ -0,0 +1,46 @@
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from src.booking.jobs import work
+
+
+class Command(BaseCommand):
+    help = "Run background jobs (booking emails) with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=50, help="Jobs each worker claims at a time.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds an idle worker waits before looking again.")
+        parser.add_argument('--drain', action='store_true', help="Exit once no job is due, instead of waiting for more.")
+
+    def handle(self, *args, **options):
+        if options['workers'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError("--workers and --batch-size must be positive.")
+
+        stop = threading.Event()
+        totals = []
+
+        def worker():
+            try:
+                totals.append(work(options['batch_size'], options['poll_interval'], stop, options['drain']))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, name=f'job-worker-{n}') for n in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            # Workers finish their current batch; unfinished leases expire on their own.
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        succeeded = sum(ok for ok, _ in totals)
+        failed = sum(bad for _, bad in totals)
+        self.stdout.write(self.style.SUCCESS(f"Ran {succeeded} jobs, {failed} failed and rescheduled."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_alter_fitnessmodel_days_of_week'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fitnessmodel',
+            name='shard_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='SeatShardModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('capacity', models.PositiveIntegerField()),
+                ('available_slots', models.PositiveIntegerField()),
+                ('fitness', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_shards', to='booking.fitnessmodel')),
+            ],
+            options={
+                'unique_together': {('fitness', 'shard')},
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_fitnessmodel_shard_count_seatshardmodel'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='bookingmodel',
+            unique_together=set(),
+        ),
+        migrations.CreateModel(
+            name='ClassOccurrenceModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('total_slots', models.PositiveIntegerField()),
+                ('available_slots', models.PositiveIntegerField()),
+                ('fitness', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='booking.fitnessmodel')),
+            ],
+            options={
+                'ordering': ['starts_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='bookingmodel',
+            name='occurrence',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='booking.classoccurrencemodel'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookingmodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('occurrence__isnull', True)), fields=('fitness', 'client_email'), name='booking_unique_class_email'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookingmodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('occurrence__isnull', False)), fields=('occurrence', 'client_email'), name='booking_unique_occurrence_email'),
+        ),
+        migrations.AddIndex(
+            model_name='classoccurrencemodel',
+            index=models.Index(fields=['starts_at'], name='booking_occ_starts_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='classoccurrencemodel',
+            unique_together={('fitness', 'starts_at')},
+        ),
+    ]
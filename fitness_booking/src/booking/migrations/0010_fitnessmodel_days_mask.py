@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+DAY_BITS = {code: 1 << index for index, code in enumerate(['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN'])}
+BATCH_SIZE = 1000
+
+
+def backfill_days_mask(apps, schema_editor):
+    FitnessModel = apps.get_model('booking', 'FitnessModel')
+    last_id = 0
+    while True:
+        batch = list(
+            FitnessModel.objects.filter(pk__gt=last_id).order_by('pk').only('pk', 'days_of_week')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for fitness in batch:
+            days = fitness.days_of_week
+            if isinstance(days, str):
+                days = days.split(',')
+            fitness.days_mask = 0
+            for day in days or ():
+                fitness.days_mask |= DAY_BITS.get(day.strip(), 0)
+        FitnessModel.objects.bulk_update(batch, ['days_mask'])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0009_classoccurrencemodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fitnessmodel',
+            name='days_mask',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_days_mask, migrations.RunPython.noop),
+    ]
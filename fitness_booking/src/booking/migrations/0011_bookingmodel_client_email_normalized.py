@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:29
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 5000
+
+
+def backfill_normalized_email(apps, schema_editor):
+    BookingModel = apps.get_model('booking', 'BookingModel')
+    last_id = 0
+    while True:
+        # pk of the last row in this batch, or None when fewer rows remain.
+        upper = next(iter(
+            BookingModel.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[BATCH_SIZE - 1:BATCH_SIZE]
+        ), None)
+        batch = BookingModel.objects.filter(pk__gt=last_id)
+        if upper is not None:
+            batch = batch.filter(pk__lte=upper)
+        batch.update(client_email_normalized=Lower(Trim('client_email')))
+        if upper is None:
+            break
+        last_id = upper
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0010_fitnessmodel_days_mask'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bookingmodel',
+            name='booking_boo_client__c4b392_idx',
+        ),
+        migrations.AddField(
+            model_name='bookingmodel',
+            name='client_email_normalized',
+            field=models.EmailField(default='', editable=False, max_length=254),
+        ),
+        migrations.RunPython(backfill_normalized_email, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='bookingmodel',
+            index=models.Index(fields=['client_email_normalized', 'status', 'booked_at'], name='booking_boo_email_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingmodel',
+            index=models.Index(fields=['client_email_normalized', 'booked_at'], name='booking_boo_email_booked_idx'),
+        ),
+    ]
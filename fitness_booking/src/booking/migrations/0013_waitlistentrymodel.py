@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0012_idempotencykeymodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntryModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_name', models.CharField(max_length=100)),
+                ('client_email', models.EmailField(max_length=254, validators=[django.core.validators.EmailValidator()])),
+                ('client_email_normalized', models.EmailField(default='', editable=False, max_length=254)),
+                ('joined_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fitness', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='booking.fitnessmodel')),
+                ('occurrence', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='booking.classoccurrencemodel')),
+            ],
+            options={
+                'ordering': ['joined_at', 'id'],
+                'indexes': [models.Index(fields=['fitness', 'occurrence', 'joined_at', 'id'], name='booking_wait_queue_idx'), models.Index(fields=['client_email_normalized', 'joined_at'], name='booking_wait_email_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('occurrence__isnull', True)), fields=('fitness', 'client_email_normalized'), name='waitlist_unique_class_email'), models.UniqueConstraint(condition=models.Q(('occurrence__isnull', False)), fields=('occurrence', 'client_email_normalized'), name='waitlist_unique_occurrence_email')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:26
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def number_existing_classes(apps, schema_editor):
+    # Every existing class counts as changed once, so since=0 returns them all.
+    db = schema_editor.connection.alias
+    FitnessModel = apps.get_model('booking', 'FitnessModel')
+    ChangeSequenceModel = apps.get_model('booking', 'ChangeSequenceModel')
+    FitnessModel.objects.using(db).update(change_seq=F('pk'))
+    top = FitnessModel.objects.using(db).aggregate(top=Max('pk'))['top'] or 0
+    ChangeSequenceModel.objects.using(db).create(pk=1, value=top)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0013_waitlistentrymodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequenceModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DeletedClassModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fitness_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField(unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='fitnessmodel',
+            name='change_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(number_existing_classes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:46
+
+import django.utils.timezone
+from django.core.management.color import no_style
+from django.db import migrations, models
+
+
+def carry_over_changes(apps, schema_editor):
+    # Each class and tombstone keeps its old change number as its log id, so
+    # cursors clients already hold stay valid.
+    db = schema_editor.connection.alias
+    FitnessModel = apps.get_model('booking', 'FitnessModel')
+    DeletedClassModel = apps.get_model('booking', 'DeletedClassModel')
+    ClassChangeModel = apps.get_model('booking', 'ClassChangeModel')
+    numbered, unnumbered, taken = [], [], set()
+    for fitness_id, seq in [
+        *FitnessModel.objects.using(db).values_list('pk', 'change_seq'),
+        *DeletedClassModel.objects.using(db).values_list('fitness_id', 'change_seq'),
+    ]:
+        if seq and seq not in taken:
+            taken.add(seq)
+            numbered.append(ClassChangeModel(pk=seq, fitness_id=fitness_id))
+        else:
+            unnumbered.append(ClassChangeModel(fitness_id=fitness_id))
+    ClassChangeModel.objects.using(db).bulk_create(sorted(numbered, key=lambda row: row.pk), batch_size=1000)
+    for sql in schema_editor.connection.ops.sequence_reset_sql(no_style(), [ClassChangeModel]):
+        schema_editor.execute(sql)
+    ClassChangeModel.objects.using(db).bulk_create(unnumbered, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0015_jobmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassChangeModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fitness_id', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='classchangemodel',
+            index=models.Index(fields=['fitness_id', 'id'], name='booking_change_class_idx'),
+        ),
+        migrations.RunPython(carry_over_changes, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='ChangeSequenceModel',
+        ),
+        migrations.DeleteModel(
+            name='DeletedClassModel',
+        ),
+        migrations.RemoveField(
+            model_name='fitnessmodel',
+            name='change_seq',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0016_classchangemodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykeymodel',
+            name='response_headers',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, Exists, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator, EmailValidator
 
@@ -16,6 +18,51 @@ class InstructorModel(models.Model):
     class Meta:
         ordering = ['name']
 
+DAY_CODES = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+DAY_BITS = {code: 1 << index for index, code in enumerate(DAY_CODES)}
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Display string for every possible 7-bit weekday mask, built once at import.
+MASK_LABELS = [
+    ', '.join(name for index, name in enumerate(DAY_NAMES) if mask & (1 << index))
+    for mask in range(128)
+]
+
+
+def days_to_mask(days_of_week):
+    """Bitmask (Monday = bit 0) for a days_of_week list or legacy 'MON,WED' string."""
+    if isinstance(days_of_week, str):
+        days_of_week = days_of_week.split(',')
+    mask = 0
+    for day in days_of_week or ():
+        mask |= DAY_BITS.get(day.strip(), 0)
+    return mask
+
+
+class FitnessQuerySet(models.QuerySet):
+    def on_days(self, mask):
+        """Classes running on any of the weekdays in ``mask``.
+
+        The bitwise test is evaluated here over the 127 possible masks, so
+        the database gets an IN list it can answer from the days_mask index.
+        """
+        return self.filter(days_mask__in=[m for m in range(1, 128) if m & mask])
+
+    def with_available_slots(self):
+        """Annotates ``live_available_slots``, summing seat shards for striped classes."""
+        shard_total = (
+            SeatShardModel.objects.filter(fitness=OuterRef('pk'))
+            .values('fitness')
+            .annotate(total=Sum('available_slots'))
+            .values('total')
+        )
+        return self.annotate(
+            live_available_slots=Case(
+                When(shard_count=0, then=F('available_slots')),
+                default=Coalesce(Subquery(shard_total), 0),
+            )
+        )
+
+
 class FitnessModel(models.Model):
     CLASS_TYPES = [
         ('YOGA', 'Yoga'),
@@ -43,21 +90,111 @@ class FitnessModel(models.Model):
     total_slots = models.PositiveIntegerField(default=20, validators=[MinValueValidator(1), MaxValueValidator(50)])
     available_slots = models.PositiveIntegerField(default=20, validators=[MinValueValidator(0)])
     days_of_week = models.JSONField(default=list)  # e.g., 'MON,WED,THU'
+    # Mirror of days_of_week kept in sync by save(); bit 0 is Monday.
+    days_mask = models.PositiveSmallIntegerField(default=0, db_index=True, editable=False)
+    # 0 keeps the seat count on this row; N > 0 spreads it over N SeatShardModel rows.
+    shard_count = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = FitnessQuerySet.as_manager()
+
+    def get_available_slots(self):
+        if hasattr(self, 'live_available_slots'):
+            return self.live_available_slots
+        if not self.shard_count:
+            return self.available_slots
+        return self.seat_shards.aggregate(total=Coalesce(Sum('available_slots'), 0))['total']
+
+    def save(self, *args, **kwargs):
+        self.days_mask = days_to_mask(self.days_of_week)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'days_of_week' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'days_mask'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        days_str = ', '.join([dict(self.DAYS_OF_WEEK).get(day, day) for day in self.days_of_week])
+        days_str = MASK_LABELS[days_to_mask(self.days_of_week)]
         return f"{self.get_name_display()} with {self.instructor} on {days_str} at {self.datetime_ist.time()}"
 
     class Meta:
         ordering = ['datetime_ist']
+        indexes = [
+            models.Index(fields=['datetime_ist'], name='booking_fit_datetim_914163_idx'),
+            models.Index(fields=['name'], name='booking_fit_name_f287c3_idx'),
+        ]
+
+
+class ClassChangeModel(models.Model):
+    """Append-only log of class changes; its id is the delta-sync cursor.
+
+    Every change to a class (seats, edits, deletion) inserts a row here, so
+    writers to different classes never wait on a shared row. Ids can become
+    visible out of order when transactions commit in a different order than
+    they inserted, which is why /api/classes/changes/ holds its cursor back
+    from rows younger than ``BOOKING_CHANGES_SETTLE_SECONDS``.
+    """
+    fitness_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def record(cls, *fitness_ids):
+        cls.objects.bulk_create([cls(fitness_id=fitness_id) for fitness_id in fitness_ids])
+
+    @classmethod
+    def compact(cls, settled_before):
+        """Drops settled rows that a later change of the same class supersedes.
+
+        A poll reports a class's current state, so only its latest row is
+        needed; this keeps the log near one row per class.
+        """
+        newer = cls.objects.filter(fitness_id=OuterRef('fitness_id'), pk__gt=OuterRef('pk'))
+        return cls.objects.filter(Exists(newer), changed_at__lt=settled_before).delete()[0]
+
+    class Meta:
+        indexes = [models.Index(fields=['fitness_id', 'id'], name='booking_change_class_idx')]
+
+
+class SeatShardModel(models.Model):
+    fitness = models.ForeignKey(FitnessModel, on_delete=models.CASCADE, related_name='seat_shards')
+    shard = models.PositiveSmallIntegerField()
+    capacity = models.PositiveIntegerField()
+    available_slots = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"Shard {self.shard} of {self.fitness_id}: {self.available_slots}/{self.capacity}"
+
+    class Meta:
+        unique_together = [('fitness', 'shard')]
+
+
+class ClassOccurrenceModel(models.Model):
+    """One dated session of a (possibly recurring) class, with its own seat count."""
+    fitness = models.ForeignKey(FitnessModel, on_delete=models.CASCADE, related_name='occurrences')
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    total_slots = models.PositiveIntegerField()
+    available_slots = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.fitness.get_name_display()} at {self.starts_at}"
+
+    class Meta:
+        ordering = ['starts_at']
+        unique_together = [('fitness', 'starts_at')]
+        indexes = [
+            models.Index(fields=['starts_at'], name='booking_occ_starts_idx'),
+        ]
 
 
 class BookingModel(models.Model):
     fitness = models.ForeignKey(FitnessModel, on_delete=models.CASCADE, related_name='bookings')
+    occurrence = models.ForeignKey(
+        ClassOccurrenceModel, on_delete=models.CASCADE, related_name='bookings', null=True, blank=True
+    )
     client_name = models.CharField(max_length=100)
     client_email = models.EmailField(validators=[EmailValidator()])
+    # Lower-cased copy of client_email for case-insensitive, index-served lookups.
+    client_email_normalized = models.EmailField(editable=False, default='')
     booked_at = models.DateTimeField(default=timezone.now)
     status = models.CharField(
         max_length=20,
@@ -68,7 +205,122 @@ class BookingModel(models.Model):
         default='CONFIRMED'
     )
 
+    @staticmethod
+    def normalize_email(email):
+        return (email or '').strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.client_email_normalized = self.normalize_email(self.client_email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'client_email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'client_email_normalized'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Booking for {self.client_name} in {self.fitness}"
 
-   
\ No newline at end of file
+    class Meta:
+        # A client books a class once, or each of its dated sessions once.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fitness', 'client_email'],
+                condition=models.Q(occurrence__isnull=True),
+                name='booking_unique_class_email',
+            ),
+            models.UniqueConstraint(
+                fields=['occurrence', 'client_email'],
+                condition=models.Q(occurrence__isnull=False),
+                name='booking_unique_occurrence_email',
+            ),
+        ]
+        indexes = [
+            # Serve a client's history newest-first, with or without a status filter.
+            models.Index(fields=['client_email_normalized', 'status', 'booked_at'], name='booking_boo_email_status_idx'),
+            models.Index(fields=['client_email_normalized', 'booked_at'], name='booking_boo_email_booked_idx'),
+            models.Index(fields=['booked_at'], name='booking_boo_booked__3b3ba6_idx'),
+        ]
+
+
+class WaitlistEntryModel(models.Model):
+    """A client queued for a full class (or one of its sessions), first come first served.
+
+    Rows only exist while the client is waiting: promotion turns the entry
+    into a booking and deletes it.
+    """
+    fitness = models.ForeignKey(FitnessModel, on_delete=models.CASCADE, related_name='waitlist')
+    occurrence = models.ForeignKey(
+        ClassOccurrenceModel, on_delete=models.CASCADE, related_name='waitlist', null=True, blank=True
+    )
+    client_name = models.CharField(max_length=100)
+    client_email = models.EmailField(validators=[EmailValidator()])
+    client_email_normalized = models.EmailField(editable=False, default='')
+    joined_at = models.DateTimeField(default=timezone.now)
+
+    def save(self, *args, **kwargs):
+        self.client_email_normalized = BookingModel.normalize_email(self.client_email)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.client_name} waiting for {self.fitness}"
+
+    class Meta:
+        ordering = ['joined_at', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fitness', 'client_email_normalized'],
+                condition=models.Q(occurrence__isnull=True),
+                name='waitlist_unique_class_email',
+            ),
+            models.UniqueConstraint(
+                fields=['occurrence', 'client_email_normalized'],
+                condition=models.Q(occurrence__isnull=False),
+                name='waitlist_unique_occurrence_email',
+            ),
+        ]
+        indexes = [
+            # The head of each queue is one index seek, however long the queue is.
+            models.Index(fields=['fitness', 'occurrence', 'joined_at', 'id'], name='booking_wait_queue_idx'),
+            models.Index(fields=['client_email_normalized', 'joined_at'], name='booking_wait_email_idx'),
+        ]
+
+
+class IdempotencyKeyModel(models.Model):
+    """Stored outcome of a booking write, looked up by its ``Idempotency-Key``."""
+    # sha256 of endpoint scope + client key, so rows are fixed width whatever the client sends.
+    key_hash = models.CharField(max_length=64, primary_key=True)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(default=0)
+    response_body = models.BinaryField(default=b'')
+    # Headers the view set on the response (e.g. Retry-After, Location), replayed with it.
+    response_headers = models.JSONField(default=dict)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='booking_idem_expires_idx'),
+        ]
+
+
+class JobModel(models.Model):
+    """A queued background job; see jobs.py. Rows are deleted once the job succeeds."""
+    QUEUED = 'QUEUED'
+    FAILED = 'FAILED'
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=[(QUEUED, 'Queued'), (FAILED, 'Failed')], default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Not before this time; a claimed job is pushed past its lease, so it comes
+    # back on its own if the worker dies.
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest due jobs with one range scan.
+            models.Index(fields=['status', 'run_after', 'id'], name='booking_job_due_idx'),
+        ]
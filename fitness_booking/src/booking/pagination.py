@@ -0,0 +1,98 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on ``(ordering_field, id)``.
+
+    Each page resumes strictly after the last row of the previous one with a
+    range predicate on the index, so page 1000 costs the same as page 1.
+    Unlike DRF's ``CursorPagination`` the ``id`` tiebreaker is part of the
+    key, so rows sharing a timestamp are never skipped or repeated.
+    """
+    ordering_field = 'datetime_ist'
+    descending = False
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def __init__(self, ordering_field=None, descending=None):
+        if ordering_field is not None:
+            self.ordering_field = ordering_field
+        if descending is not None:
+            self.descending = descending
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, size = self.page_queryset(queryset, request)
+        return self.finish_page(list(queryset[:size + 1]), size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, fetching with the async ORM."""
+        queryset, size = self.page_queryset(queryset, request)
+        return self.finish_page([row async for row in queryset[:size + 1]], size)
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        size = self.get_page_size(request)
+        field = self.ordering_field
+        prefix = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
+        # request.GET works for both DRF requests and plain async HttpRequests.
+        cursor = request.GET.get(self.cursor_query_param)
+        if cursor:
+            value, last_id = self.decode_cursor(cursor, queryset.model)
+            # The leading range bound lets the database seek the index; the OR
+            # only breaks ties between rows that share the boundary value.
+            op = 'lt' if self.descending else 'gt'
+            bound = 'lte' if self.descending else 'gte'
+            queryset = queryset.filter(**{f'{field}__{bound}': value}).filter(
+                Q(**{f'{field}__{op}': value}) | Q(**{f'id__{op}': last_id})
+            )
+        return queryset, size
+
+    def finish_page(self, rows, size):
+        self.has_next = len(rows) > size
+        rows = rows[:size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.GET.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj):
+        value = getattr(obj, self.ordering_field)
+        payload = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value, obj.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, model):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value = model._meta.get_field(self.ordering_field).to_python(value)
+            return value, int(last_id)
+        except Exception:
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'next_cursor': self.next_cursor, 'results': data}
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
@@ -0,0 +1,186 @@
+"""Per-request timing, exposed as ``Server-Timing`` headers and structured logs.
+
+``RequestTimingMiddleware`` starts a ``RequestTimer`` for every request.
+Database time and query count are collected for every connection by an
+execute wrapper, installed when the connection is opened. Views mark other
+phases with ``phase('serialize')`` and similar, and DRF response rendering is
+timed by the middleware itself. Phase times are wall time and nest: a
+query run lazily while serializing counts in both ``db`` and ``serialize``.
+
+A single request can also be captured with cProfile, either by sampling
+(``BOOKING_PROFILE_SAMPLE_RATE``) or on demand by sending the
+``BOOKING_PROFILE_HEADER`` header when ``BOOKING_PROFILE_ALLOW_HEADER`` is on.
+The stats are written to ``BOOKING_PROFILE_DIR`` as ``.prof`` files for
+``pstats``/snakeviz.
+"""
+import cProfile
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger('src.booking.timing')
+
+_current = ContextVar('booking_request_timer', default=None)
+
+
+class LazyJson:
+    """Renders ``value`` as JSON only when a handler formats the log record."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return json.dumps(self.value)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.queries = 0
+        self.db = 0.0
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        metrics = [f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"']
+        metrics += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.phases.items()]
+        metrics.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def phase(name):
+    """Adds the wall time of the block to ``name`` on the current request, if any."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    timer = _current.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.db += time.perf_counter() - started
+        timer.queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # connection_created handler. The context variable follows a request
+    # into sync_to_async threads, so async views are counted as well.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'BOOKING_REQUEST_TIMING', True)
+        self.sample_rate = getattr(settings, 'BOOKING_PROFILE_SAMPLE_RATE', 0.0)
+        self.allow_header = getattr(settings, 'BOOKING_PROFILE_ALLOW_HEADER', False)
+        self.header = 'HTTP_' + getattr(settings, 'BOOKING_PROFILE_HEADER', 'X-Profile').upper().replace('-', '_')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        timer, token, profiler = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+            _current.reset(token)
+        return self.finish(request, response, timer, profiler)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        # cProfile only sees this thread, so ORM work an async view hands to
+        # sync_to_async shows up as time waiting on the executor.
+        timer, token, profiler = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+            _current.reset(token)
+        return self.finish(request, response, timer, profiler)
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns, inside the handler.
+        timer = _current.get()
+        if timer is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda r: timer.add('render', time.perf_counter() - started))
+        return response
+
+    def start(self, request):
+        timer = RequestTimer()
+        token = _current.set(timer)
+        profiler = None
+        if (self.allow_header and request.META.get(self.header)) or (
+            self.sample_rate and random.random() < self.sample_rate
+        ):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler already owns this thread
+                profiler = None
+        return timer, token, profiler
+
+    def finish(self, request, response, timer, profiler):
+        total = timer.total()
+        response['Server-Timing'] = timer.server_timing(total)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(timer.db * 1000, 2),
+            'queries': timer.queries,
+            'phases_ms': {name: round(seconds * 1000, 2) for name, seconds in timer.phases.items()},
+        }
+        if profiler:
+            record['profile'] = str(dump_profile(profiler, request))
+            response['X-Profile-File'] = Path(record['profile']).name
+        logger.info("request %s", LazyJson(record), extra={'timing': record})
+        return response
+
+
+def dump_profile(profiler, request):
+    directory = Path(getattr(settings, 'BOOKING_PROFILE_DIR', settings.BASE_DIR / 'profiles'))
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+    path = directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+    profiler.dump_stats(path)
+    return path
@@ -0,0 +1,157 @@
+import random
+
+from django.db import transaction
+from django.db.models import F
+
+from .admission import sold_out, sold_out_key
+from .caching import invalidate_class
+from .live import seats_changed
+from .models import ClassChangeModel, ClassOccurrenceModel, FitnessModel, SeatShardModel
+
+
+def reserve_seat(fitness):
+    """Atomically takes one seat; returns False when the class is full."""
+    with transaction.atomic():
+        if fitness.shard_count:
+            updated = _claim_shard(fitness.pk)
+        else:
+            updated = FitnessModel.objects.filter(
+                pk=fitness.pk, available_slots__gt=0
+            ).update(available_slots=F('available_slots') - 1)
+        if updated:
+            _seats_changed(fitness.pk)
+    return bool(updated)
+
+
+def reserve_seats(fitness, count):
+    """Takes up to ``count`` seats at once and returns how many were granted."""
+    if count <= 0:
+        return 0
+    with transaction.atomic():
+        if fitness.shard_count:
+            granted = 0
+            while granted < count and _claim_shard(fitness.pk):
+                granted += 1
+            if granted:
+                _seats_changed(fitness.pk)
+            return granted
+
+        wanted = count
+        while wanted:
+            if FitnessModel.objects.filter(pk=fitness.pk, available_slots__gte=wanted).update(
+                available_slots=F('available_slots') - wanted
+            ):
+                _seats_changed(fitness.pk)
+                return wanted
+            # Not enough for everyone: retry for whatever is left right now.
+            left = FitnessModel.objects.filter(pk=fitness.pk).values_list('available_slots', flat=True).first()
+            wanted = min(count, left or 0)
+    return 0
+
+
+def release_seat(fitness):
+    """Atomically returns one seat, never exceeding the class capacity."""
+    transaction.on_commit(lambda: sold_out.clear(sold_out_key(fitness.pk)))
+    with transaction.atomic():
+        if fitness.shard_count:
+            updated = _return_shard(fitness.pk)
+        else:
+            updated = FitnessModel.objects.filter(
+                pk=fitness.pk, available_slots__lt=F('total_slots')
+            ).update(available_slots=F('available_slots') + 1)
+        if updated:
+            _seats_changed(fitness.pk)
+    return bool(updated)
+
+
+def reserve_occurrence_seat(occurrence):
+    """Takes one seat of a single dated session."""
+    return ClassOccurrenceModel.objects.filter(
+        pk=occurrence.pk, available_slots__gt=0
+    ).update(available_slots=F('available_slots') - 1) == 1
+
+
+def release_occurrence_seat(occurrence_id, fitness_id):
+    transaction.on_commit(lambda: sold_out.clear(sold_out_key(fitness_id, occurrence_id)))
+    return ClassOccurrenceModel.objects.filter(
+        pk=occurrence_id, available_slots__lt=F('total_slots')
+    ).update(available_slots=F('available_slots') + 1) == 1
+
+
+def _seats_changed(fitness_id):
+    # Logged for delta sync with an INSERT, so neither the class row (kept
+    # untouched on the striped path) nor any shared row is locked for it.
+    ClassChangeModel.record(fitness_id)
+    invalidate_class(fitness_id)
+    seats_changed(fitness_id)
+
+
+def _claim_shard(fitness_id):
+    # Shards are tried in random order so concurrent bookings land on
+    # different rows; a second pass covers shards emptied under us.
+    for _ in range(2):
+        shards = list(SeatShardModel.objects.filter(
+            fitness_id=fitness_id, available_slots__gt=0
+        ).values_list('pk', flat=True))
+        if not shards:
+            return False
+        random.shuffle(shards)
+        for pk in shards:
+            if SeatShardModel.objects.filter(pk=pk, available_slots__gt=0).update(
+                available_slots=F('available_slots') - 1
+            ):
+                return True
+    return False
+
+
+def _return_shard(fitness_id):
+    shards = list(SeatShardModel.objects.filter(
+        fitness_id=fitness_id, available_slots__lt=F('capacity')
+    ).values_list('pk', flat=True))
+    random.shuffle(shards)
+    for pk in shards:
+        if SeatShardModel.objects.filter(pk=pk, available_slots__lt=F('capacity')).update(
+            available_slots=F('available_slots') + 1
+        ):
+            return True
+    return False
+
+
+def stripe_capacity(fitness_id, shards):
+    """Re-splits a class's seat counter across ``shards`` rows (0 collapses it back).
+
+    While striped, ``FitnessModel.available_slots`` is held at 0 so any code
+    still writing the single row fails its conditional update instead of
+    overselling; reads go through ``FitnessModel.get_available_slots``.
+    """
+    with transaction.atomic():
+        fitness = FitnessModel.objects.select_for_update().get(pk=fitness_id)
+        # Bookings on the striped path write the shard rows, not the class
+        # row, so the shards are locked too before they are summed and
+        # dropped; otherwise a seat taken in between would be handed out again.
+        shard_seats = list(SeatShardModel.objects.select_for_update().filter(
+            fitness_id=fitness_id
+        ).values_list('available_slots', flat=True))
+        available = sum(shard_seats) if fitness.shard_count else fitness.available_slots
+        fitness.seat_shards.all().delete()
+
+        if shards:
+            SeatShardModel.objects.bulk_create([
+                SeatShardModel(
+                    fitness=fitness,
+                    shard=i,
+                    capacity=_split(fitness.total_slots, shards, i),
+                    available_slots=_split(available, shards, i),
+                )
+                for i in range(shards)
+            ])
+            available = 0
+
+        fitness.shard_count = shards
+        fitness.available_slots = available
+        fitness.save(update_fields=['shard_count', 'available_slots'])
+    return fitness
+
+
+def _split(total, parts, index):
+    return total // parts + (1 if index < total % parts else 0)
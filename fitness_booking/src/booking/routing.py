@@ -0,0 +1,84 @@
+"""Sends read-only listing queries to the replica database.
+
+Only views that set ``replica_reads = True`` are eligible, and only for
+safe methods. Everything else, including reads inside a transaction on the
+primary, stays on ``default``. After a client writes, ``ReplicaRoutingMiddleware``
+sets a short-lived cookie that pins its reads to the primary, so a booking
+shows up in that client's next listing even if the replica is behind.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Alias reads are routed to for the current request; None means the primary.
+_read_alias = ContextVar('booking_read_alias', default=None)
+
+
+def replica_alias():
+    alias = getattr(settings, 'BOOKING_READ_REPLICA', None)
+    return alias if alias in connections.settings else None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same rows.
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie = getattr(settings, 'BOOKING_PRIMARY_PIN_COOKIE', 'booking_primary')
+        self.pin_seconds = getattr(settings, 'BOOKING_READ_YOUR_WRITES_SECONDS', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.pin(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        alias = replica_alias()
+        if (
+            alias
+            and getattr(view_class, 'replica_reads', False)
+            and request.method in SAFE_METHODS
+            and self.cookie not in request.COOKIES
+        ):
+            _read_alias.set(alias)
+
+    def pin(self, request, response):
+        if replica_alias() and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(self.cookie, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
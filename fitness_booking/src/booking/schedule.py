@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ClassOccurrenceModel, FitnessModel, days_to_mask
+from .utils import get_timezone, localizer
+
+STUDIO_TIMEZONE = 'Asia/Kolkata'
+
+# Fields whose change alters the dated sessions of a class.
+SCHEDULE_FIELDS = frozenset(['datetime_ist', 'days_of_week', 'duration_minutes', 'total_slots'])
+
+
+def weekdays(days_of_week):
+    """Weekday numbers (Monday=0) for a days_of_week list or legacy 'MON,WED' string."""
+    mask = days_to_mask(days_of_week)
+    return {index for index in range(7) if mask & (1 << index)}
+
+
+def occurrence_times(fitness, start, end):
+    """Start times in ``[start, end)`` of a class's sessions.
+
+    ``datetime_ist`` is the first session; a class with ``days_of_week``
+    then repeats at the same studio wall-clock time on each listed day.
+    """
+    tz = get_timezone(STUDIO_TIMEZONE)
+    first = fitness.datetime_ist.astimezone(tz)
+    days = weekdays(fitness.days_of_week)
+    if not days:
+        return [first] if start <= first < end else []
+
+    wall_time = first.time().replace(tzinfo=None)
+    day = max(first.date(), start.astimezone(tz).date())
+    last = end.astimezone(tz).date()
+    localize = localizer(tz, max(start, first), end)
+    times = []
+    while day <= last:
+        if day.weekday() in days:
+            at = localize(datetime.combine(day, wall_time))
+            if first <= at and start <= at < end:
+                times.append(at)
+        day += timedelta(days=1)
+    return times
+
+
+def materialize(fitness, now=None, horizon_days=None):
+    """Brings a class's future occurrence rows in line with its schedule.
+
+    Only the difference is written: missing sessions are inserted, sessions
+    dropped from the schedule are deleted unless somebody booked them, and
+    duration or capacity changes are applied in place with one UPDATE each
+    (capacity changes shift ``available_slots`` by the same delta).
+    """
+    now = now or timezone.now()
+    horizon = timedelta(days=horizon_days or settings.BOOKING_SCHEDULE_HORIZON_DAYS)
+    duration = timedelta(minutes=fitness.duration_minutes)
+    wanted = set(occurrence_times(fitness, now, now + horizon))
+
+    with transaction.atomic():
+        future = ClassOccurrenceModel.objects.filter(fitness=fitness, starts_at__gte=now)
+        existing = dict(future.values_list('starts_at', 'pk'))
+
+        stale = [pk for starts_at, pk in existing.items() if starts_at not in wanted]
+        if stale:
+            ClassOccurrenceModel.objects.filter(pk__in=stale, bookings__isnull=True).delete()
+
+        ClassOccurrenceModel.objects.bulk_create([
+            ClassOccurrenceModel(
+                fitness=fitness,
+                starts_at=at,
+                ends_at=at + duration,
+                total_slots=fitness.total_slots,
+                available_slots=fitness.total_slots,
+            )
+            for at in sorted(wanted - set(existing))
+        ])
+
+        future.exclude(ends_at=F('starts_at') + duration).update(ends_at=F('starts_at') + duration)
+        future.exclude(total_slots=fitness.total_slots).update(
+            available_slots=Greatest(F('available_slots') + fitness.total_slots - F('total_slots'), 0),
+            total_slots=fitness.total_slots,
+        )
+
+
+def materialize_new(classes, now=None, horizon_days=None):
+    """Inserts the occurrence rows of just-created classes; returns how many.
+
+    For ``bulk_create``d classes, which send no post_save: they have no rows
+    to diff against, so every class in the batch is covered by one insert
+    instead of ``materialize``'s queries per class.
+    """
+    now = now or timezone.now()
+    horizon = timedelta(days=horizon_days or settings.BOOKING_SCHEDULE_HORIZON_DAYS)
+    occurrences = [
+        ClassOccurrenceModel(
+            fitness=fitness,
+            starts_at=at,
+            ends_at=at + timedelta(minutes=fitness.duration_minutes),
+            total_slots=fitness.total_slots,
+            available_slots=fitness.total_slots,
+        )
+        for fitness in classes
+        for at in occurrence_times(fitness, now, now + horizon)
+    ]
+    ClassOccurrenceModel.objects.bulk_create(occurrences)
+    return len(occurrences)
+
+
+def refresh_horizon(now=None, horizon_days=None, classes=None):
+    """Rolls the occurrence horizon forward for every class; returns the count."""
+    now = now or timezone.now()
+    horizon = timedelta(days=horizon_days or settings.BOOKING_SCHEDULE_HORIZON_DAYS)
+    if classes is None:
+        # One-off classes already in the past have nothing left to materialize.
+        classes = FitnessModel.objects.filter(
+            Q(days_mask__gt=0) | Q(datetime_ist__gte=now), datetime_ist__lt=now + horizon,
+        )
+    count = 0
+    for fitness in classes.iterator(chunk_size=500):
+        materialize(fitness, now=now, horizon_days=horizon_days)
+        count += 1
+    return count
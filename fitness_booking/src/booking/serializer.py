@@ -1,6 +1,13 @@
+from django.db import IntegrityError, models, transaction
+from django.utils.timezone import now
 from rest_framework import serializers
-from .models import FitnessModel, BookingModel, InstructorModel
-from src.booking.utils import convert_to_timezone
+from .models import ClassOccurrenceModel, FitnessModel, BookingModel, InstructorModel, WaitlistEntryModel
+from .admission import sold_out, sold_out_key
+from .reservation import reserve_occurrence_seat, reserve_seat
+from .waitlist import join_waitlist, position
+from .jobs import enqueue
+from src.booking.utils import convert_to_timezone, convert_many
+from .profiling import phase
 
 
 
@@ -9,63 +16,169 @@ class InstructorSerializer(serializers.ModelSerializer):
         model = InstructorModel
         fields = ['id', 'name', 'email']
 
+class FitnessClassListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        user_tz = self.context.get('user_timezone', 'Asia/Kolkata')
+        with phase('tz'):
+            local = convert_many([row.datetime_ist for row in rows], user_tz)
+        self.child._local_datetimes = {row.pk: dt for row, dt in zip(rows, local)}
+        return super().to_representation(rows)
+
+
 class FitnessClassSerializer(serializers.ModelSerializer):
     instructor = InstructorSerializer(read_only=True)
     start_date = serializers.SerializerMethodField()
     start_time = serializers.SerializerMethodField()
+    available_slots = serializers.IntegerField(source='get_available_slots', read_only=True)
 
     class Meta:
         model = FitnessModel
         fields = ['id', 'name', 'description', 'instructor', 'start_time', 'start_date', 'duration_minutes', 'total_slots', 'available_slots','days_of_week']
-    
-    def validate_instructor(self, value):
-        if not InstructorModel.objects.filter(pk=value.id).exists():
-            raise serializers.ValidationError("Instructor with this ID does not exist.")
-        return value
-        
+        list_serializer_class = FitnessClassListSerializer
+
+    def get_local_datetime(self, obj):
+        # Filled in bulk by FitnessClassListSerializer; single objects are
+        # converted once here and shared by start_date and start_time.
+        cache = self.__dict__.setdefault('_local_datetimes', {})
+        if obj.pk not in cache:
+            user_tz = self.context.get('user_timezone', 'Asia/Kolkata')
+            cache[obj.pk] = convert_to_timezone(obj.datetime_ist, user_tz)
+        return cache[obj.pk]
+
     def get_start_date(self, obj):
-        user_tz = self.context.get('user_timezone', 'Asia/Kolkata')
-        local_dt = convert_to_timezone(obj.datetime_ist, user_tz)
-        return local_dt.date()
+        return self.get_local_datetime(obj).date()
 
     def get_start_time(self, obj):
-        user_tz = self.context.get('user_timezone', 'Asia/Kolkata')
-        local_dt = convert_to_timezone(obj.datetime_ist, user_tz)
-        return local_dt.time()
+        return self.get_local_datetime(obj).time()
+
+
 
+class NoSlotsAvailable(serializers.ValidationError):
+    """The class is full right now; unlike other validation errors, a retry may succeed."""
 
 
 class BookingSerializer(serializers.ModelSerializer):
+    # PrimaryKeyRelatedField already rejects unknown ids; loading the instructor
+    # here lets the response render ``fitness`` without another query.
     fitness_id = serializers.PrimaryKeyRelatedField(
-        queryset=FitnessModel.objects.all(),
+        queryset=FitnessModel.objects.select_related('instructor'),
         source='fitness',
         write_only=True
     )
     fitness = serializers.StringRelatedField(read_only=True)  # Show string representation of fitness
+    occurrence_id = serializers.PrimaryKeyRelatedField(
+        queryset=ClassOccurrenceModel.objects.all(),
+        source='occurrence',
+        required=False,
+        allow_null=True,
+    )
+    # Queue for the class instead of failing when it is full.
+    join_waitlist = serializers.BooleanField(write_only=True, required=False, default=False)
 
     class Meta:
         model = BookingModel
-        fields = ['id', 'fitness', 'fitness_id', 'client_name', 'client_email', 'booked_at', 'status']
-        
-    def validate_fitness(self, fitness):
-        if not FitnessModel.objects.filter(pk=fitness.id).exists():
-            raise serializers.ValidationError("Fitness class with this ID does not exist.")
-        return fitness
+        fields = ['id', 'fitness', 'fitness_id', 'occurrence_id', 'client_name', 'client_email', 'booked_at', 'status', 'join_waitlist']
+        # Uniqueness is left to the partial unique constraints and reported
+        # from create(), so a duplicate costs no extra lookup query.
+        validators = []
+
+    def validate(self, attrs):
+        occurrence = attrs.get('occurrence')
+        if occurrence is not None:
+            if occurrence.fitness_id != attrs['fitness'].id:
+                raise serializers.ValidationError({"occurrence_id": "This session belongs to a different class."})
+            if occurrence.starts_at < now():
+                raise serializers.ValidationError({"occurrence_id": "This session has already started."})
+        return attrs
 
     def create(self, validated_data):
+        """Returns the booking, or a ``WaitlistEntryModel`` when the class is full and ``join_waitlist`` is set."""
         fitness = validated_data['fitness']
+        occurrence = validated_data.get('occurrence')
+        join = validated_data.pop('join_waitlist', False)
+
+        # The seat and the booking row commit together, so a failed insert
+        # (e.g. a duplicate booking) hands the seat straight back.
+        try:
+            with transaction.atomic():
+                if occurrence is not None:
+                    reserved = reserve_occurrence_seat(occurrence)
+                else:
+                    reserved = reserve_seat(fitness)
+                if reserved:
+                    booking = BookingModel.objects.create(**validated_data)
+                    enqueue('booking_confirmation', {'booking_id': booking.pk})
+        except IntegrityError:
+            raise serializers.ValidationError("You have already booked this class.")
+        if reserved:
+            return booking
+
+        sold_out.mark(sold_out_key(fitness.id, occurrence.id if occurrence else None))
+        if join:
+            return join_waitlist(validated_data)
+        raise NoSlotsAvailable(
+            "No slots available for this session." if occurrence else "No slots available for this class."
+        )
+
 
-        if fitness.available_slots <= 0:
-            raise serializers.ValidationError("No slots available for this class.")
+class FitnessCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model=FitnessModel
+        fields="__all__"
 
-        fitness.available_slots -= 1
-        fitness.save(update_fields=['available_slots'])
+class BatchBookingItemSerializer(serializers.Serializer):
+    # Field-level checks only; class lookups happen once for the whole batch.
+    fitness_id = serializers.IntegerField(min_value=1)
+    client_name = serializers.CharField(max_length=100)
+    client_email = serializers.EmailField()
 
-        booking = BookingModel.objects.create(**validated_data)
-        return booking
 
+class FitnessImportSerializer(serializers.ModelSerializer):
+    # The instructor is resolved per chunk by the importer, not per row.
+    days_of_week = serializers.ListField(
+        child=serializers.ChoiceField(choices=FitnessModel.DAYS_OF_WEEK), required=False
+    )
 
-class FitnessCreateSerializer(serializers.ModelSerializer):
     class Meta:
-        model=FitnessModel
-        fields="__all__"
\ No newline at end of file
+        model = FitnessModel
+        fields = ['name', 'description', 'datetime_ist', 'duration_minutes', 'total_slots', 'available_slots', 'days_of_week']
+
+    def validate(self, attrs):
+        attrs.setdefault('available_slots', attrs.get('total_slots', 20))
+        if attrs['available_slots'] > attrs.get('total_slots', 20):
+            raise serializers.ValidationError("available_slots cannot exceed total_slots.")
+        return attrs
+
+
+class InstructorImportSerializer(serializers.ModelSerializer):
+    # Existing emails are matched per chunk by the importer, so the unique
+    # check (a query per row) is left out.
+    email = serializers.EmailField(max_length=254)
+
+    class Meta:
+        model = InstructorModel
+        fields = ['name', 'email', 'bio']
+
+
+class OccurrenceSerializer(serializers.ModelSerializer):
+    fitness_id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(source='fitness.name', read_only=True)
+    instructor = serializers.CharField(source='fitness.instructor.name', read_only=True)
+
+    class Meta:
+        model = ClassOccurrenceModel
+        fields = ['id', 'fitness_id', 'name', 'instructor', 'starts_at', 'ends_at', 'total_slots', 'available_slots']
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    fitness = serializers.StringRelatedField()
+    position = serializers.SerializerMethodField()
+
+    class Meta:
+        model = WaitlistEntryModel
+        fields = ['id', 'fitness', 'fitness_id', 'occurrence_id', 'client_name', 'client_email', 'joined_at', 'position']
+
+    def get_position(self, obj):
+        # Listings annotate it with waitlist.with_positions; a single entry counts.
+        return obj.position if hasattr(obj, 'position') else position(obj)
@@ -0,0 +1,40 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .admission import sold_out
+from .caching import invalidate_catalog
+from .profiling import install_query_recorder
+from .models import ClassChangeModel, FitnessModel, InstructorModel, SeatShardModel
+from .schedule import SCHEDULE_FIELDS, materialize
+
+
+# Seat counters change through queryset.update(), which sends no signals;
+# reservation.py retires just the pages showing the class instead.
+@receiver([post_save, post_delete], sender=FitnessModel)
+@receiver([post_save, post_delete], sender=InstructorModel)
+@receiver([post_save, post_delete], sender=SeatShardModel)
+def catalog_changed(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver([post_save, post_delete], sender=FitnessModel)
+def capacity_changed(sender, instance, **kwargs):
+    # Capacity may have been raised (or the id reused); let the next booking check.
+    sold_out.clear_class(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=FitnessModel)
+def class_changed(sender, instance, **kwargs):
+    # A deleted class's last change row is what tells delta sync it is gone.
+    ClassChangeModel.record(instance.pk)
+
+
+@receiver(post_save, sender=FitnessModel)
+def schedule_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SCHEDULE_FIELDS.intersection(update_fields):
+        return
+    materialize(instance)
+
+
+connection_created.connect(install_query_recorder)
@@ -0,0 +1,310 @@
+"""Synthetic studio data for load testing.
+
+Demand is skewed the way a real studio's is: classes at peak hours fill up
+while mid-afternoon ones stay half empty, and a small share of members make
+most of the bookings. Everything is drawn from one ``random.Random(seed)``,
+so a seed and start date always produce the same data set.
+
+Instructors and classes go through ``bulk_create``. Occurrences and bookings,
+which make up nearly all of the rows, are written as plain value tuples with
+``executemany``, since per-field ORM preparation dominates at 10M rows. Their
+datetimes still go through the connection's adapter, so the raw rows load on
+SQLite and PostgreSQL alike.
+"""
+import random
+from contextlib import contextmanager, nullcontext
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .caching import invalidate_catalog
+from .models import DAY_CODES, BookingModel, ClassChangeModel, ClassOccurrenceModel, FitnessModel, InstructorModel, days_to_mask
+from .schedule import STUDIO_TIMEZONE, occurrence_times
+from .utils import get_timezone
+
+FIRST_NAMES = [
+    'Aarav', 'Alice', 'Bob', 'Chen', 'Diya', 'Emma', 'Fatima', 'Gabriel', 'Hana', 'Ishaan',
+    'Jane', 'John', 'Kabir', 'Lena', 'Mateo', 'Meera', 'Noah', 'Olivia', 'Priya', 'Rohan',
+    'Sara', 'Tariq', 'Uma', 'Vikram', 'Yuki', 'Zara',
+]
+LAST_NAMES = [
+    'Brown', 'Das', 'Doe', 'Garcia', 'Gupta', 'Iyer', 'Johnson', 'Khan', 'Kim', 'Lee',
+    'Mehta', 'Nair', 'Patel', 'Rao', 'Reddy', 'Silva', 'Singh', 'Smith', 'Tanaka', 'Williams',
+]
+
+# Relative demand by studio start hour: before-work and after-work peaks.
+HOUR_DEMAND = {
+    6: 6, 7: 9, 8: 7, 9: 4, 10: 2, 11: 2, 12: 3, 13: 2,
+    14: 1, 15: 1, 16: 2, 17: 6, 18: 10, 19: 8, 20: 4,
+}
+CLASS_DEMAND = {'YOGA': 4, 'HIIT': 3, 'ZUMBA': 2, 'PILATES': 2}
+SLOT_CHOICES = [10, 12, 15, 20, 20, 25, 30, 40, 50]
+
+# Above this many bookings the lookup indexes are dropped for the load and
+# rebuilt once at the end, which is several times cheaper than keeping them
+# up to date row by row.
+DEFER_INDEXES_ABOVE = 100_000
+
+
+def generate(instructors=20, classes=1000, bookings=10000, clients=2000, recurring_share=0.6,
+             cancel_rate=0.08, client_skew=1.1, past_days=60, future_days=28, start_date=None,
+             seed=0, batch_size=5000, progress=None):
+    """Creates instructors, classes, their occurrences and bookings; returns counts.
+
+    ``bookings`` is the confirmed-booking target, spread over classes by
+    demand and capped by each class's seats; about ``cancel_rate`` of that
+    again is added as cancelled rows. Members are drawn from a Zipf
+    distribution over ``clients`` (a higher ``client_skew`` means heavier
+    repeat clients). ``progress`` is called with the running report after
+    each batch.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    start_date = start_date or now.astimezone(get_timezone(STUDIO_TIMEZONE)).date()
+    report = {'instructors': 0, 'classes': 0, 'occurrences': 0, 'bookings': 0, 'cancelled': 0}
+    progress = progress or (lambda report: None)
+
+    with _bulk_load():
+        coaches = _instructors(rng, instructors, report)
+        schedule, demand, capacity = _classes(
+            rng, coaches, classes, recurring_share, start_date - timedelta(days=past_days),
+            past_days + future_days, now, future_days, batch_size, report, progress,
+        )
+        allocation = _allocate(bookings, demand, capacity)
+        deferred = _deferred_indexes(BookingModel) if bookings > DEFER_INDEXES_ABOVE else nullcontext()
+        with deferred:
+            taken = _bookings(
+                rng, schedule, allocation, _members(rng, clients), client_skew, cancel_rate, now,
+                batch_size, report, progress,
+            )
+
+        # Seat counters follow the confirmed bookings, one UPDATE per distinct count.
+        by_taken = {}
+        for fitness_id, confirmed in taken:
+            by_taken.setdefault(confirmed, []).append(fitness_id)
+        with transaction.atomic():
+            for confirmed, ids in by_taken.items():
+                for start in range(0, len(ids), batch_size):
+                    FitnessModel.objects.filter(pk__in=ids[start:start + batch_size]).update(
+                        available_slots=F('total_slots') - confirmed
+                    )
+        invalidate_catalog()
+    progress(report)
+    return report
+
+
+def _classes(rng, coaches, count, recurring_share, first_day, days, now, future_days, batch_size, report, progress):
+    """Creates ``count`` classes with their occurrences.
+
+    Returns ``(id, starts_at, created_at)`` per class plus parallel lists of
+    demand weights and seat counts; small tuples rather than model instances,
+    so half a million classes stay cheap to hold.
+    """
+    tz = get_timezone(STUDIO_TIMEZONE)
+    hours, hour_weights = list(HOUR_DEMAND), list(HOUR_DEMAND.values())
+    names, name_weights = list(CLASS_DEMAND), list(CLASS_DEMAND.values())
+    schedule, demand, capacity = [], [], []
+    for offset in range(0, count, batch_size):
+        rows = []
+        for _ in range(min(batch_size, count - offset)):
+            hour = rng.choices(hours, weights=hour_weights)[0]
+            name = rng.choices(names, weights=name_weights)[0]
+            day = first_day + timedelta(days=rng.randrange(days))
+            starts_at = tz.localize(datetime.combine(day, time(hour, rng.choice((0, 0, 30)))))
+            weekdays = []
+            if rng.random() < recurring_share:
+                weekdays = sorted(rng.sample(DAY_CODES, k=rng.randint(1, 3)), key=DAY_CODES.index)
+            total_slots = rng.choice(SLOT_CHOICES)
+            instructor = rng.choice(coaches)
+            rows.append(FitnessModel(
+                name=name,
+                description=f"{name.title()} session with {instructor.name}",
+                instructor=instructor,
+                datetime_ist=starts_at,
+                duration_minutes=rng.choice((45, 60, 60, 90)),
+                total_slots=total_slots,
+                available_slots=total_slots,
+                days_of_week=weekdays,
+                days_mask=days_to_mask(weekdays),
+                created_at=min(starts_at - timedelta(days=30), now),
+            ))
+            # Lognormal noise so equally-timed classes still differ in popularity.
+            demand.append(HOUR_DEMAND[hour] * CLASS_DEMAND[name] * rng.lognormvariate(0, 0.5))
+            capacity.append(total_slots)
+        with transaction.atomic():
+            FitnessModel.objects.bulk_create(rows, batch_size=batch_size)
+            ClassChangeModel.objects.bulk_create(
+                [ClassChangeModel(fitness_id=fitness.pk) for fitness in rows], batch_size=batch_size
+            )
+            report['occurrences'] += _materialize(rows, now, future_days)
+        schedule.extend((fitness.pk, fitness.datetime_ist, fitness.created_at) for fitness in rows)
+        report['classes'] += len(rows)
+        progress(report)
+    return schedule, demand, capacity
+
+
+def _bookings(rng, schedule, allocation, members, client_skew, cancel_rate, now, batch_size, report, progress):
+    """Writes the bookings; returns ``(fitness_id, confirmed)`` for every booked class."""
+    cumulative = list(accumulate(1 / (rank + 1) ** client_skew for rank in range(len(members))))
+    columns = ['fitness', 'client_name', 'client_email', 'client_email_normalized', 'booked_at', 'status']
+    batch, taken = [], []
+    for (fitness_id, starts_at, created_at), confirmed in zip(schedule, allocation):
+        cancelled = sum(1 for _ in range(confirmed) if rng.random() < cancel_rate)
+        picked = _distinct_members(rng, cumulative, confirmed + cancelled)
+        confirmed = min(confirmed, len(picked))
+        if confirmed:
+            taken.append((fitness_id, confirmed))
+        opened = created_at
+        window = max((min(starts_at, now) - created_at).total_seconds(), 0)
+        for position, member in enumerate(picked):
+            name, email = members[member]
+            booked_at = opened + timedelta(seconds=rng.random() * window)
+            status = 'CONFIRMED' if position < confirmed else 'CANCELLED'
+            batch.append((fitness_id, name, email, email, _db_datetime(booked_at), status))
+        report['cancelled'] += len(picked) - confirmed
+        report['bookings'] += len(picked)
+        if len(batch) >= batch_size:
+            _insert(BookingModel, columns, batch)
+            batch = []
+            progress(report)
+    _insert(BookingModel, columns, batch)
+    return taken
+
+
+def _instructors(rng, count, report):
+    # Names are drawn even for coaches that already exist, so a re-run
+    # consumes the random stream exactly like the first run did.
+    wanted = {f"coach{n}@example.com": (n, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}") for n in range(count)}
+    existing = {i.email: i for i in InstructorModel.objects.filter(email__in=wanted)}
+    created = InstructorModel.objects.bulk_create([
+        InstructorModel(name=name, email=email, bio=f"Coach #{n}")
+        for email, (n, name) in wanted.items() if email not in existing
+    ])
+    report['instructors'] = len(created)
+    return sorted([*existing.values(), *created], key=lambda instructor: instructor.email)
+
+
+def _members(rng, count):
+    return [
+        (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"member{n}@example.com")
+        for n in range(count)
+    ]
+
+
+def _materialize(classes, now, future_days):
+    # Same rows schedule.materialize() would write, without its per-class queries.
+    horizon = now + timedelta(days=future_days)
+    occurrences = [
+        (fitness.pk, _db_datetime(at), _db_datetime(at + timedelta(minutes=fitness.duration_minutes)),
+         fitness.total_slots, fitness.total_slots)
+        for fitness in classes
+        for at in occurrence_times(fitness, now, horizon)
+    ]
+    _insert(ClassOccurrenceModel, ['fitness', 'starts_at', 'ends_at', 'total_slots', 'available_slots'], occurrences)
+    return len(occurrences)
+
+
+def _allocate(target, weights, caps):
+    """Splits ``target`` over classes in proportion to ``weights``, capped per class.
+
+    Seats a full class cannot take are handed to the rest in a few further
+    rounds, so the total falls short only when every class is full.
+    """
+    allocation = [0] * len(weights)
+    remaining = target
+    for _ in range(8):
+        open_classes = [i for i, cap in enumerate(caps) if allocation[i] < cap]
+        total = sum(weights[i] for i in open_classes)
+        if remaining <= 0 or not total:
+            break
+        given = 0
+        for i in open_classes:
+            share = min(caps[i] - allocation[i], round(remaining * weights[i] / total))
+            allocation[i] += share
+            given += share
+        remaining -= given
+        if not given:
+            break
+    # Rounding leaves a few seats over; give them to the most popular open classes.
+    for i in sorted(range(len(weights)), key=weights.__getitem__, reverse=True):
+        if remaining <= 0:
+            break
+        if allocation[i] < caps[i]:
+            allocation[i] += 1
+            remaining -= 1
+    return allocation
+
+
+def _distinct_members(rng, cumulative, count):
+    """``count`` distinct member indexes drawn by Zipf weight."""
+    if count * 2 > len(cumulative):
+        # Too few members for rejection sampling to finish quickly.
+        return rng.sample(range(len(cumulative)), min(count, len(cumulative)))
+    picked = {}
+    total = cumulative[-1]
+    while len(picked) < count:
+        for _ in range(count - len(picked)):
+            picked.setdefault(bisect_left(cumulative, rng.random() * total), None)
+    return list(picked)
+
+
+@contextmanager
+def _bulk_load():
+    """Trades SQLite durability for write speed while generating.
+
+    A crash mid-run can corrupt the file, which only matters for a throwaway
+    load-test database; the previous settings are restored afterwards.
+    """
+    # SQLite refuses to change the sync level inside a transaction.
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        saved = {
+            pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ('synchronous', 'cache_size', 'temp_store')
+        }
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA cache_size = -262144")  # 256 MiB for the index B-trees
+        cursor.execute("PRAGMA temp_store = MEMORY")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for pragma, value in saved.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@contextmanager
+def _deferred_indexes(model):
+    """Drops ``model``'s Meta indexes for the duration of a bulk load, then rebuilds them."""
+    with connection.schema_editor() as editor:
+        for index in model._meta.indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in model._meta.indexes:
+                editor.add_index(model, index)
+
+
+def _db_datetime(value):
+    # What the ORM would send for an aware datetime: naive UTC text on SQLite,
+    # the datetime itself on backends whose driver adapts it.
+    return connection.ops.adapt_datetimefield_value(value)
+
+
+def _insert(model, fields, rows):
+    """Inserts value tuples for ``fields`` in one ``executemany`` inside a transaction."""
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})", rows)
@@ -0,0 +1,91 @@
+"""Job handlers for booking side effects: confirmation and cancellation emails.
+
+Each email carries a calendar invite whose UID is fixed per booking, so the
+cancellation's invite removes the event the confirmation added. Mail goes
+through ``EMAIL_BACKEND`` (console by default, locmem under tests), one
+connection per batch but one send per message: a refused address fails only
+its own job, and the rest of the batch is not sent again on retry.
+"""
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import mail
+
+from .jobs import task
+from .models import BookingModel
+
+logger = logging.getLogger(__name__)
+
+
+def _bookings(payloads, status):
+    # A booking cancelled before its confirmation went out needs no confirmation.
+    ids = [payload['booking_id'] for payload in payloads]
+    return BookingModel.objects.filter(pk__in=ids, status=status).select_related('fitness__instructor', 'occurrence').in_bulk()
+
+
+def _ics_time(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_invite(booking, method):
+    fitness = booking.fitness
+    starts_at = booking.occurrence.starts_at if booking.occurrence_id else fitness.datetime_ist
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Fitness Booking//EN',
+        f'METHOD:{method}',
+        'BEGIN:VEVENT',
+        f'UID:booking-{booking.pk}@fitness-booking',
+        f'DTSTAMP:{_ics_time(booking.booked_at)}',
+        f'DTSTART:{_ics_time(starts_at)}',
+        f'DTEND:{_ics_time(starts_at + timedelta(minutes=fitness.duration_minutes))}',
+        f'SUMMARY:{fitness.get_name_display()} with {fitness.instructor}',
+        f'STATUS:{"CANCELLED" if method == "CANCEL" else "CONFIRMED"}',
+        'END:VEVENT',
+        'END:VCALENDAR',
+    ]
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def _message(booking, subject, body, method):
+    message = mail.EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [booking.client_email])
+    message.attach('invite.ics', calendar_invite(booking, method), f'text/calendar; method={method}')
+    return message
+
+
+def _send(payloads, bookings, build):
+    """Sends one message per payload whose booking is in ``bookings``; returns the error per payload."""
+    errors = [None] * len(payloads)
+    wanted = [(index, bookings[payload['booking_id']]) for index, payload in enumerate(payloads) if payload['booking_id'] in bookings]
+    if not wanted:
+        return errors
+    with mail.get_connection() as connection:
+        for index, booking in wanted:
+            try:
+                connection.send_messages([build(booking)])
+            except Exception as e:
+                logger.warning("Could not email booking %s: %r", booking.pk, e)
+                errors[index] = repr(e)
+    return errors
+
+
+@task('booking_confirmation', batch=True)
+def send_confirmations(payloads):
+    return _send(payloads, _bookings(payloads, 'CONFIRMED'), lambda booking: _message(
+        booking,
+        f"Booking confirmed: {booking.fitness.get_name_display()}",
+        f"Hi {booking.client_name},\n\nYou are booked into {booking.fitness}. See you there!\n",
+        'REQUEST',
+    ))
+
+
+@task('booking_cancelled', batch=True)
+def send_cancellations(payloads):
+    return _send(payloads, _bookings(payloads, 'CANCELLED'), lambda booking: _message(
+        booking,
+        f"Booking cancelled: {booking.fitness.get_name_display()}",
+        f"Hi {booking.client_name},\n\nYour booking for {booking.fitness} has been cancelled.\n",
+        'CANCEL',
+    ))
@@ -1,12 +1,27 @@
 from django.urls import path
-from .views import ClassListView, BookingCreateView, BookingListView, BookingCancelView,InstructorView
+from .async_views import AsyncClassListView, AsyncBookingListView, AsyncInstructorView, SeatStreamView
+from .views import ClassListView, ClassChangesView, ClassImportView, OccurrenceListView, BookingCreateView, BatchBookingCreateView, BookingListView, BookingExportView, BookingCancelView,InstructorView, WaitlistView, WaitlistLeaveView
 
 urlpatterns = [
     path('classes/', ClassListView.as_view(), name='class-list'),
+    path('classes/changes/', ClassChangesView.as_view(), name='class-changes'),
+    path('classes/import/', ClassImportView.as_view(), name='class-import'),
+    path('occurrences/', OccurrenceListView.as_view(), name='occurrence-list'),
     path('book/', BookingCreateView.as_view(), name='booking-create'),
+    path('book/batch/', BatchBookingCreateView.as_view(), name='booking-batch-create'),
     path('bookings/', BookingListView.as_view(), name='booking-list'),
+    path('bookings/export/', BookingExportView.as_view(), name='booking-export'),
     
     #optional
     path('instructor/',InstructorView.as_view(),name='instructors'),
     path('cancel/', BookingCancelView.as_view(), name='booking-cancel'),
+    path('waitlist/', WaitlistView.as_view(), name='waitlist'),
+    path('waitlist/leave/', WaitlistLeaveView.as_view(), name='waitlist-leave'),
+
+    # Async read path for ASGI servers (same responses as the routes above)
+    path('async/classes/', AsyncClassListView.as_view(), name='async-class-list'),
+    path('async/bookings/', AsyncBookingListView.as_view(), name='async-booking-list'),
+    path('async/instructor/', AsyncInstructorView.as_view(), name='async-instructors'),
+    # Live seat counts over Server-Sent Events; serve with an ASGI server (src/config/asgi.py).
+    path('async/seats/', SeatStreamView.as_view(), name='seat-stream'),
 ]
\ No newline at end of file
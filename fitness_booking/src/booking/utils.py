@@ -1,12 +1,87 @@
-import pytz
+from bisect import bisect_right
+from datetime import timedelta, tzinfo
+from functools import lru_cache
+
 from pytz import timezone as pytz_timezone, UnknownTimeZoneError
 
 
+@lru_cache(maxsize=128)
+def get_timezone(tz_name):
+    """Returns the pytz timezone for ``tz_name``, cached process-wide."""
+    return pytz_timezone(tz_name)
 
-def convert_to_timezone(dt, tz_name):
-    """Converts a datetime object to a target timezone."""
+
+def resolve_timezone(tz):
+    """Accepts a tzinfo or a zone name; returns None for unknown names."""
+    if isinstance(tz, tzinfo):
+        return tz
     try:
-        target_tz = pytz.timezone(tz_name)
-        return dt.astimezone(target_tz)
+        return get_timezone(tz)
     except UnknownTimeZoneError:
-        return dt
\ No newline at end of file
+        return None
+
+
+def convert_to_timezone(dt, tz_name):
+    """Converts a datetime object to a target timezone."""
+    target_tz = resolve_timezone(tz_name)
+    if target_tz is None:
+        return dt
+    return dt.astimezone(target_tz)
+
+
+@lru_cache(maxsize=128)
+def _transition_table(tz):
+    # pytz keeps every historical and future DST switch of a zone as a sorted
+    # list of naive UTC instants plus the (offset, dst, name) in force after
+    # each one; fixed-offset zones have no table at all.
+    transitions = getattr(tz, '_utc_transition_times', None)
+    if not transitions:
+        return None
+    offsets = [(info[0], tz._tzinfos[info]) for info in tz._transition_info]
+    return transitions, offsets
+
+
+def convert_many(datetimes, tz_name):
+    """Converts a batch of aware datetimes to one target timezone.
+
+    Equivalent to calling ``astimezone`` on each value, but the zone is
+    resolved once and each row costs one bisect into the precomputed DST
+    transition table instead of a full pytz ``fromutc`` round trip.
+    """
+    target_tz = resolve_timezone(tz_name)
+    if target_tz is None:
+        return list(datetimes)
+
+    table = _transition_table(target_tz)
+    if table is None:
+        return [dt.astimezone(target_tz) for dt in datetimes]
+
+    transitions, offsets = table
+    converted = []
+    for dt in datetimes:
+        utc = dt.replace(tzinfo=None) - dt.utcoffset()
+        offset, local_tz = offsets[max(bisect_right(transitions, utc) - 1, 0)]
+        converted.append((utc + offset).replace(tzinfo=local_tz))
+    return converted
+
+
+def localizer(tz, start, end):
+    """Returns a function that attaches ``tz`` to naive wall times in ``[start, end]``.
+
+    Same result as ``tz.localize``, but when the zone has no offset change
+    anywhere in the window (the common case) every call is a plain
+    ``replace(tzinfo=...)`` rather than pytz's ambiguity search.
+    """
+    table = _transition_table(tz)
+    if table is None:
+        return tz.localize
+
+    transitions, offsets = table
+    # Widen by a day so wall times near either edge are covered as well.
+    first = start.replace(tzinfo=None) - start.utcoffset() - timedelta(days=1)
+    last = end.replace(tzinfo=None) - end.utcoffset() + timedelta(days=1)
+    index = bisect_right(transitions, first)
+    if index < len(transitions) and transitions[index] <= last:
+        return tz.localize
+    local_tz = offsets[max(index - 1, 0)][1]
+    return lambda naive: naive.replace(tzinfo=local_tz)
@@ -1,31 +1,105 @@
 from rest_framework.views import APIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils.timezone import now
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now, override as override_timezone
 from rest_framework.exceptions import ValidationError
-from .models import FitnessModel, BookingModel ,InstructorModel
-from .serializer import FitnessClassSerializer, BookingSerializer ,FitnessCreateSerializer ,InstructorSerializer
-import pytz
+from rest_framework.permissions import IsAdminUser
+from .models import ClassChangeModel, ClassOccurrenceModel, FitnessModel, BookingModel ,InstructorModel, WaitlistEntryModel, days_to_mask
+from .serializer import FitnessClassSerializer, BookingSerializer, NoSlotsAvailable ,FitnessCreateSerializer ,InstructorSerializer, OccurrenceSerializer, WaitlistEntrySerializer
+from .reservation import release_occurrence_seat, release_seat
+from .pagination import KeysetPagination
+from .utils import get_timezone
+from .caching import cached_json, class_list_cache_key
+from .batch import book_batch
+from .importer import guess_format, import_timetable, iter_records
+from .exporter import EXPORT_FORMATS, stream_export
+from .profiling import phase
+from .idempotency import idempotent, transient
+from .admission import BookingAdmissionThrottle, sold_out_wait
+from .waitlist import promote_next, with_positions
+from .jobs import enqueue
 import logging
+import math
+from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
 
+# Query builders shared by these views and their async twins in async_views.py.
+
+def parse_days_filter(params):
+    days = params.get('days')
+    days_mask = days_to_mask(days) if days else None
+    if days_mask == 0:
+        raise ValidationError({"days": "Use comma-separated day codes such as MON,WED."})
+    return days_mask
+
+
+def upcoming_classes(current_time, days_mask=None):
+    classes = (
+        FitnessModel.objects.with_available_slots()
+        .select_related('instructor')
+        .filter(datetime_ist__gte=current_time)
+    )
+    if days_mask:
+        classes = classes.on_days(days_mask)
+    return classes
+
+
+def client_bookings(params):
+    email = params.get('client_email')
+    bookings = BookingModel.objects.filter(
+        client_email_normalized=BookingModel.normalize_email(email)
+    ).select_related('fitness__instructor')
+    return filter_bookings(bookings, params)
+
+
+def filter_bookings(bookings, params):
+    booking_status = params.get('status')
+    if booking_status:
+        if booking_status.upper() not in ('CONFIRMED', 'CANCELLED'):
+            raise ValidationError({"status": "Must be CONFIRMED or CANCELLED."})
+        bookings = bookings.filter(status=booking_status.upper())
+    for param, lookup in (('booked_after', 'booked_at__gte'), ('booked_before', 'booked_at__lt')):
+        value = params.get(param)
+        if value:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValidationError({param: "Must be an ISO datetime."})
+            bookings = bookings.filter(**{lookup: make_aware(parsed) if is_naive(parsed) else parsed})
+    return bookings
+
+
 class ClassListView(APIView):
+    replica_reads = True
+
     def get(self, request):
         try:
             user_tz = request.GET.get('user_timezone', 'Asia/Kolkata')
-            user_timezone = pytz.timezone(user_tz)
+            user_timezone = get_timezone(user_tz)
 
             current_time = now().astimezone(user_timezone)
-            logger.info(f"User timezone: {user_tz}, Current time: {current_time}")
+            logger.info("User timezone: %s, Current time: %s", user_tz, current_time)
 
-            classes = FitnessModel.objects.filter(datetime_ist__gte=current_time)
-            
-            serializer = FitnessClassSerializer(classes, many=True,context={'user_timezone': user_tz})
-            
-            return Response(serializer.data,status=status.HTTP_200_OK)
-        
+            days_mask = parse_days_filter(request.GET)
+
+            def build():
+                classes = upcoming_classes(current_time, days_mask)
+                paginator = KeysetPagination()
+                page = paginator.paginate_queryset(classes, request, view=self)
+                with phase('serialize'):
+                    data = FitnessClassSerializer(page, many=True, context={'user_timezone': user_timezone}).data
+                with phase('render'):
+                    return JSONRenderer().render(paginator.get_paginated_data(data)), [fitness.pk for fitness in page]
+
+            return cached_json(request, class_list_cache_key(request, user_tz), build)
+
+        except ValidationError as e:
+            return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("Error fetching class list")
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -36,34 +110,199 @@ class ClassListView(APIView):
         try:
             if serializer.is_valid(raise_exception=True):
                 serializer.save()
-                logger.info(f"Fitness class created: {serializer.validated_data.get('name')}")
+                logger.info("Fitness class created: %s", serializer.validated_data.get('name'))
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
         except ValidationError as e:
-            logger.warning(f"Validation failed: {e.detail}")
+            logger.warning("Validation failed: %s", e.detail)
             return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("Unexpected error creating fitness class")
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ClassChangesView(APIView):
+    """Classes changed after ``since``, as compact tuples in change order.
+
+    Each row is ``[id, seq, available_slots, total_slots, starts_at]`` with
+    the class's current state; a two-element ``[id, seq]`` means the class
+    was deleted. Pass the returned ``seq`` as the next ``since``. The change
+    log is read by range on its primary key, so a poll costs what changed,
+    not the catalog size. ``seq`` stops short of changes younger than
+    ``BOOKING_CHANGES_SETTLE_SECONDS``, which may still have earlier ids
+    committing behind them; those rows are sent again by the next poll.
+    """
+    replica_reads = True
+    change_fields = ['id', 'seq', 'available_slots', 'total_slots', 'starts_at']
+    default_limit = 500
+    max_limit = 2000
+
+    def get(self, request):
+
+        try:
+            since = int(request.query_params.get('since', ''))
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({"error": "since and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or not 0 < limit <= self.max_limit:
+            return Response({"error": f"since must be >= 0 and limit between 1 and {self.max_limit}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            settled_before = now() - timedelta(seconds=settings.BOOKING_CHANGES_SETTLE_SECONDS)
+            log = list(
+                ClassChangeModel.objects.filter(pk__gt=since).order_by('pk')
+                .values_list('pk', 'fitness_id', 'changed_at')[:limit + 1]
+            )
+            more = len(log) > limit
+            log = log[:limit]
+            latest = {}
+            for seq, fitness_id, _ in log:
+                latest[fitness_id] = seq
+            current = {
+                row[0]: row[1:]
+                for row in FitnessModel.objects.with_available_slots().filter(pk__in=latest)
+                .values_list('id', 'live_available_slots', 'total_slots', 'datetime_ist')
+            }
+            with phase('serialize'):
+                rows = sorted(
+                    ([fitness_id, seq, *current[fitness_id]] if fitness_id in current else [fitness_id, seq]
+                     for fitness_id, seq in latest.items()),
+                    key=lambda row: row[1],
+                )
+                cursor = since
+                for seq, _, changed_at in log:
+                    if changed_at > settled_before:
+                        # Held back: don't ask for an immediate re-poll either.
+                        more = False
+                        break
+                    cursor = seq
+            return Response({
+                "seq": cursor,
+                "more": more,
+                "fields": self.change_fields,
+                "changes": rows,
+            })
+        except Exception as e:
+            logger.exception("Error fetching class changes")
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ClassImportView(APIView):
+    def post(self, request):
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get('format') or guess_format(upload.name)
+        try:
+            report = import_timetable(iter_records(upload, fmt))
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning("Timetable import rejected: %s", e)
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Unexpected error importing timetable")
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        logger.info("Timetable imported: %d classes from %d rows", report['classes_created'], report['rows'])
+        return Response(report, status=status.HTTP_201_CREATED)
+
+
+class OccurrenceListView(APIView):
+    def get(self, request):
+
+        start = parse_datetime(request.query_params.get('start') or '')
+        end = parse_datetime(request.query_params.get('end') or '')
+        if start is None or end is None or end <= start:
+            return Response({"error": "start and end ISO datetimes are required, with end after start"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user_timezone = get_timezone(request.query_params.get('user_timezone', 'Asia/Kolkata'))
+            if is_naive(start):
+                start = make_aware(start, user_timezone)
+            if is_naive(end):
+                end = make_aware(end, user_timezone)
+
+            occurrences = (
+                ClassOccurrenceModel.objects.select_related('fitness__instructor')
+                .filter(starts_at__gte=start, starts_at__lt=end)
+            )
+            paginator = KeysetPagination(ordering_field='starts_at')
+            page = paginator.paginate_queryset(occurrences, request, view=self)
+            with override_timezone(user_timezone), phase('serialize'):
+                data = OccurrenceSerializer(page, many=True).data
+            return paginator.get_paginated_response(data)
+        except ValidationError as e:
+            return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Error fetching occurrences")
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class BookingCreateView(APIView):
+    throttle_classes = [BookingAdmissionThrottle]
+
+    @idempotent('book')
     def post(self, request):
-        
+
+        # Retries against a class just found full are answered from memory.
+        wait = sold_out_wait(request.data)
+        if wait:
+            target = "session" if request.data.get('occurrence_id') else "class"
+            return transient(Response(
+                {"errors": [f"No slots available for this {target}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+                headers={'Retry-After': str(math.ceil(wait))},
+            ))
+
         serializer = BookingSerializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
             booking = serializer.save()
-            logger.info(f"Booking created for {booking.client_email}")
+            if isinstance(booking, WaitlistEntryModel):
+                logger.info("Waitlisted %s for class %s", booking.client_email, booking.fitness_id)
+                return Response(WaitlistEntrySerializer(booking).data, status=status.HTTP_202_ACCEPTED)
+            logger.info("Booking created for %s", booking.client_email)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
+        except NoSlotsAvailable as e:
+            logger.warning("Booking validation failed: %s", e.detail)
+            # Seats can free up, so a retry with the same Idempotency-Key runs again.
+            return transient(Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST))
         except ValidationError as e:
-            logger.warning(f"Booking validation failed: {e.detail}")
+            logger.warning("Booking validation failed: %s", e.detail)
             return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("Unexpected error during booking creation")
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class BatchBookingCreateView(APIView):
+    max_batch_size = 500
+
+    def post(self, request):
+
+        entries = request.data.get('bookings') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response({"error": "bookings must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > self.max_batch_size:
+            return Response({"error": f"At most {self.max_batch_size} bookings per batch"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = book_batch(entries)
+        except Exception as e:
+            logger.exception("Unexpected error during batch booking")
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        created = sum(1 for result in results if 'booking' in result)
+        logger.info("Batch booking: %d/%d created", created, len(results))
+        return Response(
+            {"created": created, "failed": len(results) - created, "results": results},
+            status=status.HTTP_201_CREATED if created == len(results) else status.HTTP_207_MULTI_STATUS,
+        )
+
+
 class BookingListView(APIView):
+    replica_reads = True
+
     def get(self, request):
         
         email = request.query_params.get('client_email')
@@ -71,12 +310,39 @@ class BookingListView(APIView):
             logger.warning("Missing client_email in booking list request")
             return Response({"error": "client_email is required"}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            bookings = BookingModel.objects.filter(client_email=email)
-            serializer = BookingSerializer(bookings, many=True)
-            return Response(serializer.data)
+            bookings = client_bookings(request.query_params)
+
+            paginator = KeysetPagination(ordering_field='booked_at', descending=True)
+            page = paginator.paginate_queryset(bookings, request, view=self)
+            with phase('serialize'):
+                data = BookingSerializer(page, many=True).data
+            return paginator.get_paginated_response(data)
+        except ValidationError as e:
+            return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("Error retrieving bookings")
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BookingExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+
+        # ``format`` is reserved by DRF for renderer selection.
+        fmt = request.query_params.get('file_format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": f"file_format must be one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            bookings = filter_bookings(BookingModel.objects.all(), request.query_params)
+            email = request.query_params.get('client_email')
+            if email:
+                bookings = bookings.filter(client_email_normalized=BookingModel.normalize_email(email))
+        except ValidationError as e:
+            return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info("Booking export started as %s", fmt)
+        return stream_export(bookings, fmt)
         
         
         
@@ -85,6 +351,8 @@ class BookingListView(APIView):
 
 
 class InstructorView(APIView):
+    replica_reads = True
+
     
     def get(self,request):
         
@@ -104,7 +372,7 @@ class InstructorView(APIView):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except ValidationError as e:
-            logger.warning(f"Booking validation failed: {e.detail}")
+            logger.warning("Booking validation failed: %s", e.detail)
             return Response({"errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.exception("Unexpected error during booking creation")
@@ -115,6 +383,7 @@ class InstructorView(APIView):
     
     
 class BookingCancelView(APIView):
+    @idempotent('cancel')
     def post(self, request):
         
         booking_id = request.data.get('booking_id')
@@ -124,15 +393,27 @@ class BookingCancelView(APIView):
             return Response({"error": "booking_id and client_email are required"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            booking = BookingModel.objects.get(id=booking_id, client_email=email)
-            if booking.status == 'CANCELLED':
-                return Response({"message": "Booking already cancelled"}, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                booking = BookingModel.objects.select_related('fitness').get(id=booking_id, client_email=email)
 
-            booking.status = 'CANCELLED'
-            booking.save(update_fields=['status'])
+                # Conditional update so two concurrent cancels free only one seat.
+                cancelled = BookingModel.objects.filter(
+                    pk=booking.pk, status='CONFIRMED'
+                ).update(status='CANCELLED')
+                if not cancelled:
+                    return Response({"message": "Booking already cancelled"}, status=status.HTTP_400_BAD_REQUEST)
+                enqueue('booking_cancelled', {'booking_id': booking.pk})
 
-            booking.fitness.available_slots += 1
-            booking.fitness.save(update_fields=['available_slots'])
+                # The seat goes to the head of the waitlist if there is one;
+                # otherwise it goes back on sale.
+                promoted = promote_next(booking.fitness_id, booking.occurrence_id)
+                if promoted is not None:
+                    logger.info("Promoted %s from the waitlist for class %s", promoted.client_email, booking.fitness_id)
+                else:
+                    if booking.occurrence_id:
+                        release_occurrence_seat(booking.occurrence_id, booking.fitness_id)
+                    else:
+                        release_seat(booking.fitness)
 
             return Response({"message": "Booking cancelled successfully"})
         except BookingModel.DoesNotExist:
@@ -140,3 +421,31 @@ class BookingCancelView(APIView):
         except Exception as e:
             logger.exception("Error cancelling booking")
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class WaitlistView(APIView):
+    def get(self, request):
+
+        email = request.query_params.get('client_email')
+        if not email:
+            return Response({"error": "client_email is required"}, status=status.HTTP_400_BAD_REQUEST)
+        entries = with_positions(WaitlistEntryModel.objects.filter(
+            client_email_normalized=BookingModel.normalize_email(email)
+        ).select_related('fitness__instructor'))
+        return Response(WaitlistEntrySerializer(entries, many=True).data)
+
+
+class WaitlistLeaveView(APIView):
+    def post(self, request):
+
+        entry_id = request.data.get('entry_id')
+        email = request.data.get('client_email')
+        if not entry_id or not email:
+            return Response({"error": "entry_id and client_email are required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        deleted, _ = WaitlistEntryModel.objects.filter(
+            pk=entry_id, client_email_normalized=BookingModel.normalize_email(email)
+        ).delete()
+        if not deleted:
+            return Response({"error": "Waitlist entry not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"message": "Left the waitlist"})
@@ -0,0 +1,94 @@
+"""Waitlist for full classes and sessions.
+
+A client asks to wait by booking with ``join_waitlist``. When a booking is
+cancelled, ``promote_next`` hands its seat straight to the first waiter in
+the same transaction: the seat counter is never raised and lowered again,
+so nobody racing on ``/api/book/`` can take it in between, and the promoted
+client needs no further request. Finding the first waiter is a seek on
+``booking_wait_queue_idx``, so the cost does not depend on queue length.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+from .jobs import enqueue
+from .models import BookingModel, WaitlistEntryModel
+
+# Waiters skipped because they already hold a booking for the class, before
+# the seat goes back to the pool instead.
+MAX_PROMOTION_ATTEMPTS = 5
+
+
+def queue_for(fitness_id, occurrence_id=None):
+    entries = WaitlistEntryModel.objects.filter(fitness_id=fitness_id)
+    if occurrence_id:
+        return entries.filter(occurrence_id=occurrence_id)
+    return entries.filter(occurrence__isnull=True)
+
+
+def position(entry):
+    """1-based place in the queue."""
+    ahead = queue_for(entry.fitness_id, entry.occurrence_id).filter(joined_at__lte=entry.joined_at).exclude(
+        joined_at=entry.joined_at, id__gte=entry.id
+    )
+    return ahead.count() + 1
+
+
+def with_positions(entries):
+    """Annotates ``position`` on every entry in the same query, for listing many at once."""
+    # NULL occurrence (the class-wide queue) has to match itself, hence the Coalesce.
+    ahead = WaitlistEntryModel.objects.annotate(queue=Coalesce('occurrence_id', 0)).filter(
+        Q(joined_at__lt=OuterRef('joined_at')) | Q(joined_at=OuterRef('joined_at'), id__lt=OuterRef('id')),
+        fitness_id=OuterRef('fitness_id'),
+        queue=Coalesce(OuterRef('occurrence_id'), 0),
+    ).order_by().values('fitness_id').annotate(count=Count('id')).values('count')
+    return entries.annotate(position=Coalesce(Subquery(ahead), 0) + 1)
+
+
+def join_waitlist(validated_data):
+    """Queues the client from a validated booking request."""
+    fitness = validated_data['fitness']
+    occurrence = validated_data.get('occurrence')
+    email = BookingModel.normalize_email(validated_data['client_email'])
+    booked = BookingModel.objects.filter(fitness=fitness, client_email_normalized=email)
+    booked = booked.filter(occurrence=occurrence) if occurrence else booked.filter(occurrence__isnull=True)
+    if booked.exists():
+        raise serializers.ValidationError("You have already booked this class.")
+    try:
+        with transaction.atomic():
+            return WaitlistEntryModel.objects.create(
+                fitness=fitness,
+                occurrence=occurrence,
+                client_name=validated_data['client_name'],
+                client_email=validated_data['client_email'],
+            )
+    except IntegrityError:
+        raise serializers.ValidationError("You are already on the waitlist for this class.")
+
+
+def promote_next(fitness_id, occurrence_id=None):
+    """Books the first waiter into a seat just freed; returns the booking or None.
+
+    Must run inside the transaction that freed the seat. Entries being
+    promoted by a concurrent cancellation are skipped rather than waited on.
+    """
+    queue = queue_for(fitness_id, occurrence_id).select_for_update(skip_locked=True).order_by('joined_at', 'id')
+    for _ in range(MAX_PROMOTION_ATTEMPTS):
+        entry = queue.first()
+        if entry is None:
+            return None
+        entry.delete()
+        try:
+            with transaction.atomic():
+                booking = BookingModel.objects.create(
+                    fitness_id=fitness_id,
+                    occurrence_id=occurrence_id,
+                    client_name=entry.client_name,
+                    client_email=entry.client_email,
+                )
+                enqueue('booking_confirmation', {'booking_id': booking.pk})
+                return booking
+        except IntegrityError:
+            continue  # booked the class some other way meanwhile
+    return None
@@ -0,0 +1,54 @@
+"""Cache profiles, selected with the ``BOOKING_CACHE_PROFILE`` environment variable.
+
+Cached class-list pages and the versions that retire them live in the
+default cache, so every app process must share it: a booking handled by one
+process has to retire the pages all the others serve.
+
+``redis`` (the default when ``BOOKING_CACHE_URL`` is set) is shared by every
+host and needs the ``redis`` package. ``file`` (the default otherwise) is a
+directory shared by the processes of one host, which covers a SQLite
+deployment. ``locmem`` is private to one process, so it is only for the test
+suite, the benchmarks and a single ``runserver``.
+"""
+import os
+
+# Bounds the cached pages; the version keys are stored without expiry.
+MAX_ENTRIES = 2000
+
+
+def locmem_cache():
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'booking',
+        'OPTIONS': {'MAX_ENTRIES': MAX_ENTRIES, 'CULL_FREQUENCY': 4},
+    }
+
+
+def file_cache(location):
+    return {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(location),
+        'OPTIONS': {'MAX_ENTRIES': MAX_ENTRIES, 'CULL_FREQUENCY': 4},
+    }
+
+
+def redis_cache(env=os.environ):
+    return {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env['BOOKING_CACHE_URL'],
+        'KEY_PREFIX': 'booking',
+    }
+
+
+def cache_profile(profile, file_location, env=os.environ):
+    if profile is None:
+        profile = 'redis' if env.get('BOOKING_CACHE_URL') else 'file'
+    if profile == 'redis':
+        if not env.get('BOOKING_CACHE_URL'):
+            raise ValueError("BOOKING_CACHE_PROFILE=redis needs BOOKING_CACHE_URL, e.g. redis://localhost:6379/0")
+        return redis_cache(env)
+    if profile == 'file':
+        return file_cache(file_location)
+    if profile == 'locmem':
+        return locmem_cache()
+    raise ValueError(f"Unknown BOOKING_CACHE_PROFILE: {profile!r} (expected 'redis', 'file' or 'locmem')")
@@ -0,0 +1,100 @@
+"""Database profiles, selected with the ``BOOKING_DB_PROFILE`` environment variable.
+
+``sqlite`` (the default) is a single file tuned for concurrent bookings:
+WAL lets readers carry on while one writer commits, writers take the lock
+up front (``BEGIN IMMEDIATE``) and wait on ``busy_timeout`` instead of
+failing with "database is locked", and reads are served from a memory map.
+
+``postgres`` is for running several app processes against one server. Each
+process keeps a pool of open connections (Django's psycopg pool, which needs
+``psycopg[pool]``) and checks a connection before handing it out, so a
+dropped server connection costs a reconnect rather than a failed request.
+Set ``POSTGRES_POOL=0`` to fall back to persistent per-thread connections
+with ``CONN_HEALTH_CHECKS``.
+"""
+import os
+
+# Applied on every new connection. journal_mode is stored in the file, the
+# rest are per connection.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # In WAL mode NORMAL only syncs at checkpoints: a power cut can lose the
+    # last commits but never corrupts the file.
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -32768,  # KiB, i.e. 32 MiB per connection
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+def sqlite_profile(name):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {pragma}={value}' for pragma, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+            # Seconds the driver waits for a lock; matches busy_timeout.
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+    }
+
+
+def postgres_profile(env=os.environ):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('POSTGRES_DB', 'booking'),
+        'USER': env.get('POSTGRES_USER', 'booking'),
+        'PASSWORD': env.get('POSTGRES_PASSWORD', ''),
+        'HOST': env.get('POSTGRES_HOST', 'localhost'),
+        'PORT': env.get('POSTGRES_PORT', '5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if env.get('POSTGRES_POOL', '1') == '1':
+        # The pool owns connection lifetime, so CONN_MAX_AGE stays 0.
+        from psycopg_pool import ConnectionPool
+
+        database['OPTIONS']['pool'] = {
+            'min_size': int(env.get('POSTGRES_POOL_MIN', 2)),
+            'max_size': int(env.get('POSTGRES_POOL_MAX', 20)),
+            'timeout': 10,
+            'max_idle': 300,
+            'check': ConnectionPool.check_connection,
+        }
+    else:
+        database['CONN_MAX_AGE'] = int(env.get('POSTGRES_CONN_MAX_AGE', 60))
+    return database
+
+
+def replica_profile(primary, env=os.environ):
+    """Settings for the read replica, or None when no replica is configured.
+
+    SQLite: ``BOOKING_DB_REPLICA`` is the path of a second database file
+    (kept in sync by something like Litestream, or a copy for local testing).
+    PostgreSQL: ``POSTGRES_REPLICA_HOST``/``POSTGRES_REPLICA_PORT`` point at a
+    streaming replica; everything else is shared with the primary.
+    """
+    replica = {**primary, 'OPTIONS': {**primary['OPTIONS']}}
+    if primary['ENGINE'].endswith('sqlite3'):
+        if not env.get('BOOKING_DB_REPLICA'):
+            return None
+        replica['NAME'] = env['BOOKING_DB_REPLICA']
+    else:
+        if not env.get('POSTGRES_REPLICA_HOST'):
+            return None
+        replica['HOST'] = env['POSTGRES_REPLICA_HOST']
+        replica['PORT'] = env.get('POSTGRES_REPLICA_PORT', primary['PORT'])
+        if 'pool' in replica['OPTIONS']:
+            replica['OPTIONS']['pool'] = {**replica['OPTIONS']['pool']}
+    return replica
+
+
+def database_profile(profile, sqlite_name, env=os.environ):
+    if profile == 'sqlite':
+        return sqlite_profile(sqlite_name)
+    if profile == 'postgres':
+        return postgres_profile(env)
+    raise ValueError(f"Unknown BOOKING_DB_PROFILE: {profile!r} (expected 'sqlite' or 'postgres')")
@@ -1,28 +1,144 @@
+"""Logging setup: records are queued on the request thread and written by a listener thread.
+
+The request thread merges the message with its arguments and renders any
+traceback, as ``QueueHandler.prepare`` does, so a record shows its arguments
+as they were when it was logged. Applying the format string and the stream
+I/O happen on the listener. When the queue is full the record is dropped and
+counted rather than blocking the request. High-volume
+INFO lines are thinned per logger by ``SamplingFilter`` before they are
+queued; warnings and errors are always kept.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueListener
+
+FORMAT = '%(asctime)s %(levelname)s %(name)s-%(message)s'
+
+# Share of INFO-and-below records kept per logger (the longest matching
+# prefix wins; loggers not listed keep everything).
+LOG_SAMPLE_RATES = {
+    'src.booking.timing': 0.1,
+    'src.booking.views': 0.2,
+}
+
+
+class BackgroundStreamHandler(logging.Handler):
+    """``StreamHandler`` whose writes run on a listener thread."""
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__()
+        self.dropped = 0
+        self.target = logging.StreamHandler(stream)
+        self._start_listener(maxsize)
+        atexit.register(self.close)
+        # Threads do not survive fork(); give each forked worker its own listener.
+        os.register_at_fork(after_in_child=lambda: self._start_listener(self.queue.maxsize))
+
+    def _start_listener(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Arguments may be mutated (or hold a transaction's state) after the
+        # call returns, and exc_info pins the traceback's frames, so both are
+        # rendered here; the copy keeps the record intact for other handlers.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or (self.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        # Waits until the listener has written everything queued so far.
+        if self.listener is not None:
+            self.queue.join()
+        self.target.flush()
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            try:
+                listener.stop()
+            except queue.Full:
+                pass  # no room for the stop sentinel; the thread is a daemon
+        self.target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of INFO-and-below records per logger name prefix."""
+
+    def __init__(self, rates=None):
+        super().__init__()
+        # Longest prefix first so 'src.booking.views' beats 'src'.
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1 or random.random() < rate
+        return True
+
 
 LOGGING={
     'version':1,
     'disable_existing_loggers':False,
     'formatters':{
         'standard':{
-            'format': '%(asctime)s %(levelname)s %(name)s-%(message)s'
+            'format': FORMAT
+        },
+    },
+    'filters':{
+        'sampling':{
+            '()': SamplingFilter,
+            'rates': LOG_SAMPLE_RATES,
         },
     },
     'handlers':{
         'console':{
             'level':'INFO',
-            'class':'logging.StreamHandler',
+            'class':'src.config.logging.BackgroundStreamHandler',
+            'stream': 'ext://sys.stderr',
             'formatter':'standard',
-            'filters':[],
+            'filters':['sampling'],
         },
     },
     'loggers':{
-        logger_name :{
-            'level': 'INFO',
-            'propagate' :True,
-        }for logger_name in ('django','django.request','django.db.backends','django.templates','src')
+        **{
+            logger_name :{
+                'level': 'INFO',
+                'propagate' :True,
+            }for logger_name in ('django','django.request','django.templates','src')
+        },
+        # SQL is logged at DEBUG only; keep the per-query records from being built at all.
+        'django.db.backends': {
+            'level': 'WARNING',
+            'propagate': True,
+        },
     },
     'root':{
-        'level':'DEBUG',
+        'level':'INFO',
         'handlers':['console'],
     }
 }
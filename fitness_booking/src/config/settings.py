@@ -10,10 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
+from src.config.caches import cache_profile
+from src.config.databases import database_profile, replica_profile
 from src.config.logging import LOGGING
 
 # Quick-start development settings - unsuitable for production
@@ -42,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'src.booking.profiling.RequestTimingMiddleware',
+    'src.booking.routing.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,13 +79,42 @@ WSGI_APPLICATION = 'src.config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# BOOKING_DB_PROFILE picks 'sqlite' (WAL-tuned file) or 'postgres' (pooled
+# connections configured from POSTGRES_* variables); see src/config/databases.py.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_profile(os.environ.get('BOOKING_DB_PROFILE', 'sqlite'), BASE_DIR / 'db.sqlite3'),
+}
+
+# Listing views read from 'replica' when one is configured (BOOKING_DB_REPLICA
+# or POSTGRES_REPLICA_HOST). A client that just wrote is pinned to the
+# primary for BOOKING_READ_YOUR_WRITES_SECONDS through a cookie.
+_replica = replica_profile(DATABASES['default'])
+if _replica is not None:
+    DATABASES['replica'] = _replica
+
+DATABASE_ROUTERS = ['src.booking.routing.PrimaryReplicaRouter']
+BOOKING_READ_REPLICA = 'replica'
+BOOKING_READ_YOUR_WRITES_SECONDS = 5
+BOOKING_PRIMARY_PIN_COOKIE = 'booking_primary'
+
+
+# Cache
+# The class list is cached per catalog version, and each page also notes the
+# classes on it so a seat change only retires the pages showing that class.
+# Entries expire after BOOKING_CLASS_LIST_CACHE_TIMEOUT seconds so classes
+# drop off the list soon after they start. Every app process must share the
+# cache: BOOKING_CACHE_PROFILE picks 'redis' (BOOKING_CACHE_URL), 'file' or
+# 'locmem' (one process only; the test runner uses it); see src/config/caches.py.
+
+CACHES = {
+    'default': cache_profile(os.environ.get('BOOKING_CACHE_PROFILE'), BASE_DIR.parent / '.cache'),
 }
 
+TEST_RUNNER = 'src.config.testing.LocMemCacheTestRunner'
+
+BOOKING_CLASS_LIST_CACHE_TIMEOUT = 30
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -125,3 +159,55 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Number of seat-counter rows a class is split into when striping is enabled.
+BOOKING_SEAT_SHARDS = 8
+
+# How far ahead recurring classes are expanded into dated occurrences.
+BOOKING_SCHEDULE_HORIZON_DAYS = 28
+
+# /api/classes/changes/ keeps its cursor behind changes younger than this, so
+# a change whose id was taken before a newer one but committed after it is
+# not skipped. Must exceed the longest transaction that writes a class.
+BOOKING_CHANGES_SETTLE_SECONDS = 5
+
+# How long an Idempotency-Key on POST /api/book/ or /api/cancel/ is replayed.
+BOOKING_IDEMPOTENCY_TTL = 24 * 60 * 60
+
+# Token buckets in front of POST /api/book/: 'rate' tokens per second up to
+# 'burst'. The client bucket is per IP address (so it must allow for shared
+# NATs); the class bucket caps write attempts per class. None turns one off.
+BOOKING_CLIENT_BUCKET = {'rate': 5, 'burst': 60}
+BOOKING_CLASS_BUCKET = {'rate': 50, 'burst': 100}
+# How long a class found full is turned away without touching the database.
+BOOKING_SOLD_OUT_HINT_SECONDS = 2
+
+# Live seat counts over Server-Sent Events (/api/async/seats/). The backend
+# fans updates out to every process's hub; LocalBackend only reaches this one.
+BOOKING_LIVE_BACKEND = 'src.booking.live.LocalBackend'
+# Updates arriving within this window reach subscribers as one event.
+BOOKING_LIVE_COALESCE_SECONDS = 0.1
+BOOKING_LIVE_HEARTBEAT_SECONDS = 15
+
+# Background jobs (src/booking/jobs.py, run with `manage.py run_jobs`).
+# A failed job is retried after BACKOFF, 2x, 4x... seconds (capped at
+# BACKOFF_MAX) until MAX_ATTEMPTS; a claimed job reappears after LEASE if
+# its worker dies.
+BOOKING_JOB_MAX_ATTEMPTS = 5
+BOOKING_JOB_BACKOFF_SECONDS = 10
+BOOKING_JOB_BACKOFF_MAX_SECONDS = 3600
+BOOKING_JOB_LEASE_SECONDS = 300
+
+# Booking emails are printed to the console; set EMAIL_BACKEND to
+# django.core.mail.backends.smtp.EmailBackend (and EMAIL_HOST etc.) to send them.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'bookings@fitness-booking.example')
+
+# Per-request phase timings (Server-Timing header + 'src.booking.timing' log).
+BOOKING_REQUEST_TIMING = True
+# cProfile capture: a random share of requests, or any request carrying
+# BOOKING_PROFILE_HEADER when allowed. Keep the header off in production.
+BOOKING_PROFILE_SAMPLE_RATE = 0.0
+BOOKING_PROFILE_HEADER = 'X-Profile'
+BOOKING_PROFILE_ALLOW_HEADER = DEBUG
+BOOKING_PROFILE_DIR = BASE_DIR.parent / 'profiles'
@@ -0,0 +1,21 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from src.config.caches import locmem_cache
+
+
+class LocMemCacheTestRunner(DiscoverRunner):
+    """Runs the suite against a cache private to the test process.
+
+    A shared cache would carry cached pages and versions over from earlier
+    runs or from a running server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES={'default': locmem_cache()})
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
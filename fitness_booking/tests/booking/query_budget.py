@@ -0,0 +1,32 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Asserts that an endpoint's query count does not grow with the data.
+
+    ``seed(n)`` adds ``n`` more rows and ``call()`` exercises the endpoint.
+    The endpoint is measured after each seeding step; any difference in
+    query count between sizes means a per-row (N+1) query slipped in.
+    """
+    query_budget_sizes = (1, 5, 20)
+
+    def assertConstantQueries(self, seed, call, max_queries=None):
+        counts = {}
+        seeded = 0
+        for size in self.query_budget_sizes:
+            seed(size - seeded)
+            seeded = size
+            with CaptureQueriesContext(connection) as ctx:
+                response = call()
+            self.assertLess(response.status_code, 400, getattr(response, 'data', response))
+            counts[size] = len(ctx.captured_queries)
+
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"Query count grows with result size: {counts}\n"
+            + "\n".join(q['sql'] for q in ctx.captured_queries),
+        )
+        if max_queries is not None:
+            self.assertLessEqual(counts[seeded], max_queries)
+        return counts[seeded]
@@ -0,0 +1,104 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.admission import TokenBuckets
+from src.booking.models import BookingModel, FitnessModel, InstructorModel
+
+
+class TokenBucketsTest(SimpleTestCase):
+    def test_burst_then_refill(self):
+        buckets = TokenBuckets(rate=2, burst=3)
+        self.assertEqual([buckets.take('a', now=0.0) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(buckets.take('a', now=0.0), 0.5)
+        self.assertEqual(buckets.take('b', now=0.0), 0)
+        self.assertEqual(buckets.take('a', now=0.5), 0)
+
+    def test_forgets_least_recently_used(self):
+        buckets = TokenBuckets(rate=1, burst=1, max_keys=2)
+        for key in ('a', 'b', 'c'):
+            buckets.take(key, now=0.0)
+        self.assertEqual(buckets.take('a', now=0.0), 0)  # evicted, so full again
+        self.assertGreater(buckets.take('c', now=0.0), 0)
+
+
+class BookingAdmissionTests(APITestCase):
+    def setUp(self):
+        instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='HIIT',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=1,
+            available_slots=1,
+            days_of_week=['TUE'],
+        )
+
+    def book(self, n, ip='10.0.0.1'):
+        return self.client.post(reverse('booking-create'), {
+            'fitness_id': self.fitness.id, 'client_name': f'Member {n}', 'client_email': f'member{n}@example.com',
+        }, format='json', REMOTE_ADDR=ip)
+
+    @override_settings(BOOKING_CLIENT_BUCKET={'rate': 0.1, 'burst': 2}, BOOKING_CLASS_BUCKET=None)
+    def test_client_bucket_returns_retry_after(self):
+        self.book(1)
+        self.book(2)
+        with self.assertNumQueries(0):
+            response = self.book(3)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '10')
+        self.assertNotEqual(self.book(4, ip='10.0.0.2').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(BOOKING_CLIENT_BUCKET={'rate': 0.1, 'burst': 1}, BOOKING_CLASS_BUCKET={'rate': 0.1, 'burst': 2})
+    def test_class_bucket_across_clients(self):
+        self.book(1, ip='10.0.0.1')
+        # Throttled by its own bucket, so it does not spend a class token.
+        self.assertEqual(self.book(2, ip='10.0.0.1').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotEqual(self.book(3, ip='10.0.0.2').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.book(4, ip='10.0.0.3').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(BOOKING_CLIENT_BUCKET=None, BOOKING_CLASS_BUCKET=None, BOOKING_SOLD_OUT_HINT_SECONDS=30)
+    def test_sold_out_hint_skips_the_database(self):
+        first = self.book(1)
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.book(2).status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertNumQueries(0):
+            response = self.book(3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"errors": ["No slots available for this class."]})
+        self.assertEqual(response['Retry-After'], '30')
+
+        # A committed cancellation frees the seat and drops the hint.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('booking-cancel'), {
+                'booking_id': first.json()['id'], 'client_email': 'member1@example.com',
+            }, format='json')
+        self.assertEqual(self.book(3).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(BookingModel.objects.filter(status='CONFIRMED').count(), 1)
+
+    @override_settings(BOOKING_CLIENT_BUCKET=None, BOOKING_CLASS_BUCKET=None, BOOKING_SOLD_OUT_HINT_SECONDS=30)
+    def test_raising_capacity_drops_hint(self):
+        self.book(1)
+        self.book(2)
+        self.fitness.refresh_from_db()
+        self.fitness.total_slots = 2
+        self.fitness.available_slots = 1
+        self.fitness.save()
+        self.assertEqual(self.book(3).status_code, status.HTTP_201_CREATED)
+
+    @override_settings(BOOKING_CLIENT_BUCKET={'rate': 0.01, 'burst': 2}, BOOKING_CLASS_BUCKET=None)
+    def test_idempotent_retry_is_replayed_without_spending_a_token(self):
+        data = {'fitness_id': self.fitness.id, 'client_name': 'Alice', 'client_email': 'alice@example.com'}
+
+        def keyed():
+            return self.client.post(reverse('booking-create'), data, format='json', REMOTE_ADDR='10.0.0.1', HTTP_IDEMPOTENCY_KEY='retry-1')
+
+        self.assertEqual(keyed().status_code, status.HTTP_201_CREATED)
+        for _ in range(3):
+            retry = keyed()
+            self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertNotEqual(self.book(2).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.book(3).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,62 @@
+import asyncio
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from src.booking.models import InstructorModel, FitnessModel, BookingModel
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            days_of_week=['MON'],
+        )
+        BookingModel.objects.create(fitness=self.fitness, client_name='Bob', client_email='bob@example.com')
+        self.async_client = AsyncClient()
+
+    async def assertSameAsSync(self, sync_name, async_name, params=None):
+        sync_response = await self.async_client.get(reverse(sync_name), params or {})
+        async_response = await self.async_client.get(reverse(async_name), params or {})
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+        return async_response
+
+    async def test_class_list_matches_sync_view(self):
+        response = await self.assertSameAsSync('class-list', 'async-class-list', {'user_timezone': 'Europe/London'})
+        self.assertEqual(response.json()['results'][0]['id'], self.fitness.id)
+
+    async def test_booking_list_matches_sync_view(self):
+        response = await self.assertSameAsSync('booking-list', 'async-booking-list', {'client_email': 'BOB@example.com'})
+        self.assertEqual(len(response.json()['results']), 1)
+        await self.assertSameAsSync('booking-list', 'async-booking-list')
+
+    async def test_instructor_list_matches_sync_view(self):
+        await self.assertSameAsSync('instructors', 'async-instructors')
+
+    async def test_class_list_cache_stays_off_the_event_loop(self):
+        backend = caches['default']
+        on_loop = []
+
+        def watch(name):
+            method = getattr(backend, name)
+
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(name)
+                except RuntimeError:
+                    pass  # in a worker thread, as sync_to_async runs it
+                return method(*args, **kwargs)
+            return mock.patch.object(backend, name, call)
+
+        with watch('get'), watch('get_many'), watch('add'), watch('set'):
+            for _ in range(2):  # a miss, then a hit
+                response = await self.async_client.get(reverse('async-class-list'))
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(on_loop, [])
@@ -0,0 +1,127 @@
+from django.db import connection
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.models import ClassChangeModel, FitnessModel, InstructorModel, SeatShardModel
+from src.booking.reservation import stripe_capacity
+
+
+@override_settings(BOOKING_CHANGES_SETTLE_SECONDS=0)
+class ClassChangesTests(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.classes = [self.make_class() for _ in range(3)]
+        self.seq = self.changes(0).json()['seq']
+
+    def make_class(self):
+        return FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=10,
+            available_slots=10,
+            days_of_week=['MON'],
+        )
+
+    def changes(self, since, **params):
+        return self.client.get(reverse('class-changes'), {'since': since, **params})
+
+    def book(self, fitness, email):
+        return self.client.post(reverse('booking-create'), {
+            'fitness_id': fitness.id, 'client_name': 'Alice', 'client_email': email,
+        }, format='json')
+
+    def test_snapshot_from_zero(self):
+        body = self.changes(0).json()
+        self.assertEqual(body['fields'], ['id', 'seq', 'available_slots', 'total_slots', 'starts_at'])
+        self.assertEqual([row[0] for row in body['changes']], [c.id for c in self.classes])
+        self.assertFalse(body['more'])
+
+    def test_booking_and_cancellation_stamp_only_their_class(self):
+        booking = self.book(self.classes[1], 'alice@example.com').json()
+        body = self.changes(self.seq).json()
+        self.assertEqual([row[:4] for row in body['changes']], [[self.classes[1].id, body['seq'], 9, 10]])
+
+        self.client.post(reverse('booking-cancel'), {'booking_id': booking['id'], 'client_email': 'alice@example.com'}, format='json')
+        after = self.changes(body['seq']).json()
+        self.assertEqual([row[2] for row in after['changes']], [10])
+        self.assertGreater(after['seq'], body['seq'])
+
+    def test_nothing_changed(self):
+        body = self.changes(self.seq).json()
+        self.assertEqual((body['seq'], body['changes'], body['more']), (self.seq, [], False))
+
+    def test_edit_and_delete(self):
+        edited, deleted = self.classes[0], self.classes[2]
+        edited.total_slots = 12
+        edited.save(update_fields=['total_slots'])
+        deleted_id = deleted.id
+        deleted.delete()
+
+        rows = self.changes(self.seq).json()['changes']
+        self.assertEqual([row[0] for row in rows], [edited.id, deleted_id])
+        self.assertEqual(rows[0][3], 12)
+        self.assertEqual(len(rows[1]), 2)  # tombstone: [id, seq]
+
+    def test_striped_class_reports_shard_total(self):
+        stripe_capacity(self.classes[0].id, 4)
+        self.book(self.classes[0], 'bob@example.com')
+        rows = self.changes(self.seq).json()['changes']
+        self.assertEqual(rows[-1][:1] + rows[-1][2:4], [self.classes[0].id, 9, 10])
+
+    def test_striped_booking_leaves_class_row_alone(self):
+        stripe_capacity(self.classes[0].id, 4)
+        with CaptureQueriesContext(connection) as captured:
+            self.book(self.classes[0], 'bob@example.com')
+        writes = [query['sql'] for query in captured if query['sql'].startswith(('UPDATE', 'INSERT'))]
+        self.assertFalse([sql for sql in writes if f'"{FitnessModel._meta.db_table}"' in sql.split(' SET')[0]])
+        self.assertTrue([sql for sql in writes if SeatShardModel._meta.db_table in sql])
+
+    def test_cursor_waits_for_recent_changes_to_settle(self):
+        self.book(self.classes[1], 'alice@example.com')
+        with override_settings(BOOKING_CHANGES_SETTLE_SECONDS=60):
+            body = self.changes(self.seq).json()
+        # The change is sent, but the cursor stays put so a late commit with
+        # a lower id cannot be skipped.
+        self.assertEqual([row[0] for row in body['changes']], [self.classes[1].id])
+        self.assertEqual((body['seq'], body['more']), (self.seq, False))
+
+    def test_compaction_keeps_latest_change_per_class(self):
+        for n in range(3):
+            self.book(self.classes[0], f'client{n}@example.com')
+        before = self.changes(0).json()['changes']
+        call_command('compact_class_changes', stdout=open('/dev/null', 'w'))
+        self.assertEqual(ClassChangeModel.objects.count(), len(self.classes))
+        self.assertEqual(self.changes(0).json()['changes'], before)
+
+    def test_paging_with_limit_misses_nothing(self):
+        for n, fitness in enumerate(self.classes):
+            self.book(fitness, f'client{n}@example.com')
+        seen, since = [], self.seq
+        while True:
+            body = self.changes(since, limit=2).json()
+            seen += [row[0] for row in body['changes']]
+            since = body['seq']
+            if not body['more']:
+                break
+        self.assertEqual(seen, [c.id for c in self.classes])
+
+    def test_cost_tracks_changes_not_catalog(self):
+        for _ in range(50):
+            self.make_class()
+        since = self.changes(0).json()['seq']
+        self.book(self.classes[0], 'alice@example.com')
+        with CaptureQueriesContext(connection) as captured:
+            body = self.changes(since).json()
+        self.assertEqual(len(body['changes']), 1)
+        self.assertEqual(len(captured), 2)
+        self.assertIn(f'"{ClassChangeModel._meta.db_table}"."id" >', captured[0]['sql'])
+        self.assertIn(f'"{FitnessModel._meta.db_table}"."id" IN ({self.classes[0].id})', captured[1]['sql'])
+
+    def test_rejects_bad_parameters(self):
+        for params in ({}, {'since': 'abc'}, {'since': -1}, {'since': 0, 'limit': 0}):
+            self.assertEqual(self.client.get(reverse('class-changes'), params).status_code, status.HTTP_400_BAD_REQUEST)
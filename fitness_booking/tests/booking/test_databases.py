@@ -0,0 +1,41 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from src.config.caches import cache_profile
+from src.config.databases import SQLITE_PRAGMAS, database_profile, postgres_profile
+
+
+class SqliteProfileTest(TestCase):
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            # The test database lives in memory, which has no journal or memory map.
+            for pragma in ('busy_timeout', 'cache_size', 'foreign_keys'):
+                value = cursor.execute(f'PRAGMA {pragma}').fetchone()[0]
+                expected = {'ON': 1}.get(SQLITE_PRAGMAS[pragma], SQLITE_PRAGMAS[pragma])
+                self.assertEqual(value, expected, pragma)
+            self.assertEqual(cursor.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            database_profile('mysql', 'db.sqlite3')
+
+    def test_postgres_without_pool_uses_persistent_connections(self):
+        database = postgres_profile({'POSTGRES_POOL': '0', 'POSTGRES_HOST': 'db'})
+        self.assertEqual(database['HOST'], 'db')
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertNotIn('pool', database['OPTIONS'])
+
+
+class CacheProfileTest(SimpleTestCase):
+    def test_shared_backend_by_default(self):
+        self.assertTrue(cache_profile(None, '/tmp/booking-cache', env={})['BACKEND'].endswith('FileBasedCache'))
+        cache = cache_profile(None, '/tmp/booking-cache', env={'BOOKING_CACHE_URL': 'redis://cache:6379/0'})
+        self.assertTrue(cache['BACKEND'].endswith('RedisCache'))
+        self.assertEqual(cache['LOCATION'], 'redis://cache:6379/0')
+
+    def test_redis_needs_url(self):
+        with self.assertRaises(ValueError):
+            cache_profile('redis', '/tmp/booking-cache', env={})
+
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.exporter import stream_export
+from src.booking.models import InstructorModel, FitnessModel, BookingModel
+
+
+class BookingExportTests(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            days_of_week=['MON'],
+        )
+        for n in range(5):
+            BookingModel.objects.create(fitness=self.fitness, client_name=f'Member {n}', client_email=f'm{n}@example.com')
+        BookingModel.objects.create(fitness=self.fitness, client_name='=HYPERLINK("x")', client_email='evil@example.com', status='CANCELLED')
+        self.admin = User.objects.create_superuser('finance', 'finance@example.com', 'secret')
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_requires_staff(self):
+        response = self.client.get(reverse('booking-export'))
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_csv_export_streams_every_booking_with_related_columns(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('booking-export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="bookings.csv"', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]['class_name'], 'YOGA')
+        self.assertEqual(rows[0]['instructor'], 'Jane Doe')
+        # Formula-looking names are neutralised for spreadsheet apps.
+        self.assertEqual(rows[-1]['client_name'], '\'=HYPERLINK("x")')
+
+    def test_ndjson_export_applies_filters(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('booking-export'), {'file_format': 'ndjson', 'status': 'cancelled'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([record['client_email'] for record in records], ['evil@example.com'])
+
+    def test_rejects_unknown_format(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('booking-export'), {'file_format': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_related_columns_come_from_the_same_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            body = b''.join(stream_export(BookingModel.objects.all(), 'ndjson', chunk_size=2).streaming_content)
+        self.assertEqual(len(body.splitlines()), 6)
+        self.assertEqual(len(queries), 1)
+
+    def test_admin_action_streams_selected_bookings(self):
+        self.client.force_login(self.admin)
+        selected = list(BookingModel.objects.filter(status='CONFIRMED').values_list('pk', flat=True)[:2])
+        response = self.client.post(
+            reverse('admin:booking_bookingmodel_changelist'),
+            {'action': 'export_csv', '_selected_action': selected},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(sorted(int(row['id']) for row in rows), sorted(selected))
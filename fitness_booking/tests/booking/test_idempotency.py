@@ -0,0 +1,136 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from src.booking.idempotency import idempotent
+from src.booking.models import BookingModel, FitnessModel, IdempotencyKeyModel, InstructorModel
+
+
+class LocatedView(APIView):
+    @idempotent('test')
+    def post(self, request):
+        return Response({'ok': True}, status=status.HTTP_201_CREATED, headers={'Location': '/api/bookings/7/'})
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='HIIT',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=5,
+            available_slots=5,
+            days_of_week=['TUE'],
+        )
+        self.booking_data = {'fitness_id': self.fitness.id, 'client_name': 'Alice', 'client_email': 'alice@example.com'}
+
+    def book(self, key, data=None):
+        return self.client.post(reverse('booking-create'), data or self.booking_data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_without_booking_again(self):
+        first = self.book('abc-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        # One lookup on the key table; no seat or booking queries.
+        with self.assertNumQueries(1):
+            retry = self.book('abc-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(BookingModel.objects.count(), 1)
+        self.fitness.refresh_from_db()
+        self.assertEqual(self.fitness.available_slots, 4)
+
+    def test_without_key_duplicates_are_rejected_as_before(self):
+        self.client.post(reverse('booking-create'), self.booking_data, format='json')
+        response = self.client.post(reverse('booking-create'), self.booking_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_key_reused_with_different_body(self):
+        self.book('abc-2')
+        response = self.book('abc-2', {**self.booking_data, 'client_email': 'bob@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(BookingModel.objects.filter(client_email='bob@example.com').exists())
+
+    def test_client_errors_are_replayed(self):
+        self.client.post(reverse('booking-create'), self.booking_data, format='json')
+        first = self.book('abc-3')
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)  # already booked
+        BookingModel.objects.all().delete()
+        retry = self.book('abc-3')
+        self.assertEqual(retry.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+
+    def test_full_class_is_not_replayed_once_a_seat_frees_up(self):
+        FitnessModel.objects.filter(pk=self.fitness.pk).update(available_slots=0)
+        self.assertEqual(self.book('abc-5').status_code, status.HTTP_400_BAD_REQUEST)
+        hinted = self.book('abc-5')  # answered by the sold-out hint
+        self.assertEqual(hinted.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Retry-After', hinted)
+        self.assertFalse(IdempotencyKeyModel.objects.exists())
+
+        self.fitness.available_slots = 5
+        self.fitness.save()  # clears the sold-out hint
+        retry = self.book('abc-5')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', retry)
+
+    def test_expired_key_runs_again(self):
+        self.book('abc-4')
+        IdempotencyKeyModel.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.book('abc-4')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)  # already booked
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_rejects_oversized_key(self):
+        response = self.book('x' * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(BookingModel.objects.count(), 0)
+
+    def test_cancel_retry_gets_original_answer(self):
+        booking = BookingModel.objects.create(fitness=self.fitness, client_name='Alice', client_email='alice@example.com')
+        FitnessModel.objects.filter(pk=self.fitness.pk).update(available_slots=4)
+        payload = {'booking_id': booking.id, 'client_email': 'alice@example.com'}
+        for _ in range(2):
+            response = self.client.post(reverse('booking-cancel'), payload, format='json', HTTP_IDEMPOTENCY_KEY='cancel-1')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), {"message": "Booking cancelled successfully"})
+        self.fitness.refresh_from_db()
+        self.assertEqual(self.fitness.available_slots, 5)
+
+    def test_keys_are_scoped_per_endpoint(self):
+        self.book('shared')
+        booking = BookingModel.objects.get()
+        response = self.client.post(
+            reverse('booking-cancel'), {'booking_id': booking.id, 'client_email': 'alice@example.com'},
+            format='json', HTTP_IDEMPOTENCY_KEY='shared',
+        )
+        self.assertEqual(response.json(), {"message": "Booking cancelled successfully"})
+
+    def test_purge_removes_only_expired_keys(self):
+        self.book('drop')
+        IdempotencyKeyModel.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.book('keep', {**self.booking_data, 'client_email': 'bob@example.com'})
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn('Removed 1', out.getvalue())
+        self.assertEqual(IdempotencyKeyModel.objects.count(), 1)
+
+    def test_replay_keeps_response_headers(self):
+        view = LocatedView.as_view()
+        responses = [
+            view(APIRequestFactory().post('/located/', {'a': 1}, format='json', HTTP_IDEMPOTENCY_KEY='hdr-1'))
+            for _ in range(2)
+        ]
+        self.assertNotIn('Idempotent-Replayed', responses[0])
+        self.assertEqual(responses[1]['Idempotent-Replayed'], 'true')
+        self.assertEqual(responses[1]['Location'], '/api/bookings/7/')
+        self.assertEqual(responses[1]['Content-Type'], 'application/json')
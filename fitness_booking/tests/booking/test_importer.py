@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.importer import import_timetable, iter_records
+from src.booking.models import ClassOccurrenceModel, InstructorModel, FitnessModel
+
+
+def class_row(n, email='jane@example.com', **extra):
+    row = {
+        'name': 'YOGA',
+        'datetime_ist': (timezone.now() + timezone.timedelta(days=1, hours=n)).isoformat(),
+        'total_slots': 10,
+        'days_of_week': ['MON', 'WED'],
+        'instructor_email': email,
+    }
+    row.update(extra)
+    return row
+
+
+class TimetableImportTests(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+
+    def test_management_command_imports_csv(self):
+        lines = [
+            "type,name,email,bio,datetime_ist,total_slots,days_of_week,instructor_email",
+            "instructor,Sam Lee,sam@example.com,Spin coach,,,,",
+            f"class,HIIT,,,{(timezone.now() + timezone.timedelta(days=2)).isoformat()},12,\"TUE,THU\",sam@example.com",
+            f"class,ZUMBA,,,{(timezone.now() + timezone.timedelta(days=3)).isoformat()},8,SAT,jane@example.com",
+            "class,BOXING,,,2025-01-01T10:00:00,8,SAT,jane@example.com",
+        ]
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as handle:
+            handle.write("\n".join(lines) + "\n")
+        out, err = io.StringIO(), io.StringIO()
+        try:
+            call_command('import_timetable', path, '--chunk-size', '2', stdout=out, stderr=err)
+        finally:
+            os.remove(path)
+
+        hiit = FitnessModel.objects.get(name='HIIT')
+        self.assertEqual(hiit.instructor.email, 'sam@example.com')
+        self.assertEqual(hiit.days_of_week, ['TUE', 'THU'])
+        self.assertEqual(hiit.available_slots, 12)
+        self.assertEqual(FitnessModel.objects.count(), 2)
+        self.assertIn('row 4', err.getvalue())
+        self.assertIn('Imported 2 classes and 1 instructors', out.getvalue())
+
+    def test_upload_endpoint_imports_ndjson(self):
+        rows = [class_row(n) for n in range(5)]
+        rows.append(class_row(6, email='new@example.com', instructor_name='New Coach'))
+        rows.append(class_row(7, email='ghost@example.com'))
+        payload = "\n".join(json.dumps(row) for row in rows).encode() + b"\n{broken\n"
+        upload = SimpleUploadedFile('timetable.ndjson', payload)
+
+        response = self.client.post(reverse('class-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['classes_created'], 6)
+        self.assertEqual(response.data['instructors_created'], 1)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertCountEqual([e['row'] for e in response.data['errors']], [7, 8])
+
+    def test_invalid_instructors_are_reported_per_row(self):
+        rows = [
+            {'type': 'instructor', 'name': 'Bad Email', 'email': 'not-an-email'},
+            {'type': 'instructor', 'name': 'x' * 101, 'email': 'long@example.com'},
+            class_row(0, email='new@example.com', instructor_name='y' * 101),
+            {'type': 'instructor', 'name': 'Sam Lee', 'email': 'sam@example.com'},
+        ]
+        report = import_timetable(iter_records(io.StringIO("\n".join(json.dumps(row) for row in rows)), 'ndjson'))
+
+        self.assertEqual((report['instructors_created'], report['classes_created'], report['failed']), (1, 0, 3))
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        self.assertIn('email', errors[1])
+        self.assertIn('name', errors[2])
+        self.assertIn('instructor_name', errors[3])
+        self.assertEqual(
+            sorted(InstructorModel.objects.values_list('email', flat=True)), ['jane@example.com', 'sam@example.com'],
+        )
+
+    def test_non_object_lines_are_row_errors(self):
+        lines = ['123', '"x"', '[1, 2]', 'null', json.dumps(class_row(0))]
+        report = import_timetable(iter_records(io.StringIO("\n".join(lines)), 'ndjson'))
+        self.assertEqual((report['classes_created'], report['failed']), (1, 4))
+        self.assertEqual(report['errors'][0], {'row': 1, 'errors': ["Expected a JSON object."]})
+
+    def test_imported_classes_get_their_occurrences(self):
+        import_timetable(iter_records(io.StringIO(json.dumps(class_row(0))), 'ndjson'))
+        imported = FitnessModel.objects.get()
+        created = FitnessModel.objects.create(
+            name='YOGA', instructor=self.instructor, datetime_ist=imported.datetime_ist,
+            total_slots=10, days_of_week=['MON', 'WED'],
+        )
+        self.assertGreater(imported.occurrences.count(), 1)
+        self.assertEqual(
+            [(o.starts_at.weekday(), o.total_slots, o.available_slots) for o in imported.occurrences.order_by('starts_at')],
+            [(o.starts_at.weekday(), o.total_slots, o.available_slots) for o in created.occurrences.order_by('starts_at')],
+        )
+
+    def test_queries_per_chunk_do_not_grow_with_rows(self):
+        def queries_for(count):
+            # One-off classes, so the occurrence insert stays within one statement.
+            rows = (class_row(n, days_of_week=[]) for n in range(count))
+            records = iter_records(io.StringIO("\n".join(json.dumps(row) for row in rows)), 'ndjson')
+            # Savepoint, one instructor lookup, the class, change-log and occurrence inserts, release.
+            with self.assertNumQueries(6):
+                import_timetable(records, chunk_size=count)
+
+        queries_for(5)
+        queries_for(50)
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from io import StringIO
+
+from smtplib import SMTPRecipientsRefused
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from src.booking import jobs
+from src.booking.models import BookingModel, FitnessModel, InstructorModel, JobModel
+
+
+def make_class(total_slots=10):
+    instructor, _ = InstructorModel.objects.get_or_create(name="Jane Doe", email="jane@example.com")
+    return FitnessModel.objects.create(
+        name='YOGA',
+        instructor=instructor,
+        datetime_ist=timezone.now() + timezone.timedelta(days=1),
+        total_slots=total_slots,
+        available_slots=total_slots,
+        days_of_week=['MON'],
+    )
+
+
+class FlakyBackend(EmailBackend):
+    # Refuses any recipient with "bad" in its address, like an SMTP server would.
+    def send_messages(self, messages):
+        for message in messages:
+            if any('bad' in address for address in message.to):
+                raise SMTPRecipientsRefused({message.to[0]: (550, b'No such user')})
+        return super().send_messages(messages)
+
+
+class BookingJobTests(TestCase):
+    def setUp(self):
+        self.fitness = make_class()
+        self.client = APIClient()
+
+    def book(self, email='alice@example.com'):
+        return self.client.post(reverse('booking-create'), {
+            'fitness_id': self.fitness.id, 'client_name': 'Alice', 'client_email': email,
+        }, format='json')
+
+    def test_booking_queues_confirmation_without_sending(self):
+        booking = self.book().json()
+        self.assertEqual(mail.outbox, [])
+        job = JobModel.objects.get()
+        self.assertEqual((job.task, job.payload), ('booking_confirmation', {'booking_id': booking['id']}))
+
+    def test_rejected_booking_queues_nothing(self):
+        self.book()
+        self.book()  # duplicate: rolled back together with its job
+        self.assertEqual(JobModel.objects.count(), 1)
+
+    def test_worker_sends_confirmation_with_invite(self):
+        self.book()
+        self.assertEqual(jobs.work(drain=True), (1, 0))
+
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['alice@example.com'])
+        self.assertIn('Booking confirmed', message.subject)
+        name, invite, mimetype = message.attachments[0]
+        self.assertEqual(name, 'invite.ics')
+        self.assertIn('METHOD:REQUEST', invite)
+        self.assertFalse(JobModel.objects.exists())
+
+    def test_cancellation_sends_cancel_invite_and_skips_stale_confirmation(self):
+        booking = self.book().json()
+        self.client.post(reverse('booking-cancel'), {'booking_id': booking['id'], 'client_email': 'alice@example.com'}, format='json')
+        jobs.work(drain=True)
+
+        self.assertEqual([message.subject for message in mail.outbox], ['Booking cancelled: Yoga'])
+        self.assertIn('METHOD:CANCEL', mail.outbox[0].attachments[0][1])
+
+    def test_batch_cost_does_not_grow_with_jobs(self):
+        def queries_for(count):
+            bookings = BookingModel.objects.bulk_create(
+                BookingModel(fitness=self.fitness, client_name='A', client_email=f'{count}-{n}@example.com')
+                for n in range(count)
+            )
+            jobs.enqueue_many('booking_confirmation', [{'booking_id': booking.pk} for booking in bookings])
+            with CaptureQueriesContext(connection) as captured:
+                jobs.run_batch(jobs.claim(batch_size=100))
+            return len(captured)
+
+        self.assertEqual(queries_for(2), queries_for(20))
+        self.assertEqual(len(mail.outbox), 22)
+
+    def test_refused_address_retries_only_its_own_job(self):
+        with override_settings(EMAIL_BACKEND=f'{__name__}.FlakyBackend'):
+            for email in ('alice@example.com', 'bad@example.com', 'carol@example.com'):
+                self.book(email)
+            with self.assertLogs('src.booking.jobs', 'ERROR'):
+                self.assertEqual(jobs.work(drain=True), (2, 1))
+            self.assertEqual(len(mail.outbox), 2)
+            job = JobModel.objects.get()
+            self.assertEqual((job.status, job.attempts), (JobModel.QUEUED, 1))
+            self.assertIn('SMTPRecipientsRefused', job.last_error)
+
+            JobModel.objects.update(run_after=timezone.now())
+            with self.assertLogs('src.booking.jobs', 'ERROR'):
+                jobs.work(drain=True)
+            self.assertEqual(len(mail.outbox), 2)  # the delivered two are not sent again
+
+    def test_claimed_jobs_are_leased(self):
+        self.book()
+        self.assertEqual(len(jobs.claim(10)), 1)
+        self.assertEqual(jobs.claim(10), [])
+        JobModel.objects.update(run_after=timezone.now() - timedelta(seconds=1))  # lease ran out
+        self.assertEqual(jobs.claim(10)[0].attempts, 2)
+
+    def test_unknown_task_is_rejected_at_enqueue(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('no_such_task', {})
+
+
+class RetryTests(TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def flaky(payload):
+            self.calls.append(payload)
+            raise RuntimeError("mail server down")
+
+        jobs.TASKS['flaky'] = (flaky, False)
+        self.addCleanup(jobs.TASKS.pop, 'flaky')
+
+    @override_settings(BOOKING_JOB_MAX_ATTEMPTS=2, BOOKING_JOB_BACKOFF_SECONDS=60)
+    def test_failures_back_off_then_give_up(self):
+        jobs.enqueue('flaky', {'n': 1})
+        with self.assertLogs('src.booking.jobs', 'ERROR'):
+            self.assertEqual(jobs.work(drain=True), (0, 1))
+        job = JobModel.objects.get()
+        self.assertEqual((job.status, job.attempts), (JobModel.QUEUED, 1))
+        self.assertIn('mail server down', job.last_error)
+        self.assertGreaterEqual(job.run_after, timezone.now() + timedelta(seconds=55))
+        self.assertEqual(jobs.work(drain=True), (0, 0))  # not due yet
+
+        JobModel.objects.update(run_after=timezone.now())
+        with self.assertLogs('src.booking.jobs', 'ERROR'):
+            jobs.work(drain=True)
+        self.assertEqual(JobModel.objects.get().status, JobModel.FAILED)
+        self.assertEqual(len(self.calls), 2)
+
+    @override_settings(BOOKING_JOB_BACKOFF_SECONDS=10, BOOKING_JOB_BACKOFF_MAX_SECONDS=60)
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertTrue(10 <= jobs.backoff(1) <= 12.5)
+        self.assertTrue(40 <= jobs.backoff(3) <= 50)
+        self.assertTrue(60 <= jobs.backoff(10) <= 75)
+
+
+class RunJobsCommandTests(TransactionTestCase):
+    def test_worker_pool_drains_queue(self):
+        fitness = make_class()
+        bookings = BookingModel.objects.bulk_create(
+            BookingModel(fitness=fitness, client_name='A', client_email=f'{n}@example.com') for n in range(30)
+        )
+        jobs.enqueue_many('booking_confirmation', [{'booking_id': booking.pk} for booking in bookings])
+
+        # One worker: the in-memory test database cannot take concurrent writers.
+        call_command('run_jobs', workers=1, batch_size=4, drain=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 30)
+        self.assertFalse(JobModel.objects.exists())
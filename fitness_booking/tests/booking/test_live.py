@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from src.booking.live import SeatHub, get_hub, seat_events
+from src.booking.models import FitnessModel, InstructorModel
+
+
+class RecordingBackend:
+    published = []
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def wants_updates(self):
+        return True
+
+    def publish(self, updates):
+        self.published.append(updates)
+
+
+class SeatHubTests(SimpleTestCase):
+    def test_keeps_latest_count_per_class(self):
+        hub = SeatHub()
+        hub.deliver([(1, 5), (2, 7)])
+        hub.deliver([(1, 4)])
+        self.assertEqual(hub.since(0), ([(2, 7), (1, 4)], 3))
+        self.assertEqual(hub.since(2, classes={1, 3}), ([(1, 4)], 3))
+        self.assertEqual(hub.since(3), ([], 3))
+
+    async def test_burst_reaches_subscriber_as_one_event(self):
+        hub = SeatHub(coalesce=0.05)
+        stream = seat_events(hub, cursor=0, heartbeat=5)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)  # let it subscribe
+
+        # Published from another thread, as committing sync views do.
+        def burst():
+            for available in (9, 8, 7):
+                hub.deliver([(1, available)])
+        thread = threading.Thread(target=burst)
+        thread.start()
+        thread.join()
+
+        event = await asyncio.wait_for(pending, 1)
+        self.assertEqual(event, b'id: 3\nevent: seats\ndata: [[1,7]]\n\n')
+        self.assertEqual(hub.listeners, 1)
+        await stream.aclose()
+        self.assertEqual(hub.listeners, 0)
+
+    async def test_idle_stream_sends_keepalives(self):
+        stream = seat_events(SeatHub(), cursor=0, heartbeat=0.01)
+        await anext(stream)
+        self.assertEqual(await anext(stream), b': keepalive\n\n')
+        await stream.aclose()
+
+
+class SeatPublishingTests(TestCase):
+    def setUp(self):
+        RecordingBackend.published = []
+        instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=1,
+            available_slots=1,
+            days_of_week=['MON'],
+        )
+        self.client = APIClient()
+
+    def book(self, email):
+        return self.client.post(reverse('booking-create'), {
+            'fitness_id': self.fitness.id, 'client_name': 'Alice', 'client_email': email,
+        }, format='json')
+
+    @override_settings(BOOKING_LIVE_BACKEND=f'{__name__}.RecordingBackend')
+    def test_booking_and_cancellation_publish_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = self.book('alice@example.com').json()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.book('bob@example.com').status_code, 400)  # full: nothing changed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('booking-cancel'), {'booking_id': booking['id'], 'client_email': 'alice@example.com'}, format='json')
+        self.assertEqual(RecordingBackend.published, [[(self.fitness.id, 0)], [(self.fitness.id, 1)]])
+
+    def test_nothing_is_queued_without_subscribers(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book('alice@example.com')
+        self.assertFalse([callback for callback in callbacks if callback.__module__ == 'src.booking.live'])
+
+    async def test_stream_starts_with_snapshot_then_pushes(self):
+        response = await AsyncClient().get(reverse('seat-stream'), {'classes': str(self.fitness.id)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        hub = get_hub()
+        snapshot = await anext(stream)
+        self.assertIn(f'data: [[{self.fitness.id},1]]'.encode(), snapshot)
+
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        hub.deliver([(self.fitness.id + 1, 3), (self.fitness.id, 0)])  # other classes are filtered out
+        self.assertIn(f'data: [[{self.fitness.id},0]]'.encode(), await asyncio.wait_for(pending, 1))
+        await stream.aclose()
+
+    async def test_rejects_bad_class_list(self):
+        response = await AsyncClient().get(reverse('seat-stream'), {'classes': 'yoga'})
+        self.assertEqual(response.status_code, 400)
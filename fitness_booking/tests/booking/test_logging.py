@@ -0,0 +1,71 @@
+import io
+import logging
+import sys
+
+from django.test import SimpleTestCase
+from src.config.logging import BackgroundStreamHandler, SamplingFilter
+
+
+def make_record(name, level=logging.INFO, msg='hello %s', args=('world',)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class SamplingFilterTest(SimpleTestCase):
+    def test_longest_prefix_wins(self):
+        sampler = SamplingFilter({'src': 1.0, 'src.booking.views': 0.0})
+        self.assertFalse(sampler.filter(make_record('src.booking.views')))
+        self.assertTrue(sampler.filter(make_record('src.booking.models')))
+        self.assertTrue(sampler.filter(make_record('src.booking.viewsets')))
+
+    def test_warnings_are_never_sampled(self):
+        sampler = SamplingFilter({'src': 0.0})
+        self.assertFalse(sampler.filter(make_record('src', logging.INFO)))
+        self.assertTrue(sampler.filter(make_record('src', logging.WARNING)))
+        self.assertTrue(sampler.filter(make_record('src', logging.ERROR)))
+
+    def test_unlisted_loggers_keep_everything(self):
+        self.assertTrue(SamplingFilter({'src': 0.0}).filter(make_record('django.request')))
+
+
+class BackgroundStreamHandlerTest(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = BackgroundStreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter('%(name)s %(message)s'))
+        self.addCleanup(self.handler.close)
+
+    def test_writes_on_listener_after_flush(self):
+        for n in range(100):
+            self.handler.handle(make_record('src.booking', args=(n,)))
+        self.handler.flush()
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines, [f'src.booking hello {n}' for n in range(100)])
+
+    def test_arguments_are_rendered_when_logged(self):
+        # Later changes to an argument must not leak into a record still queued.
+        cart = ['yoga']
+        self.handler.listener.stop()
+        self.handler.handle(make_record('src', args=(cart,)))
+        cart.append('spin')
+        self.handler.listener.start()
+        self.handler.flush()
+        self.assertEqual(self.stream.getvalue(), "src hello ['yoga']\n")
+
+    def test_traceback_is_rendered_when_logged(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = logging.LogRecord('src', logging.ERROR, __file__, 1, 'failed', None, sys.exc_info())
+        self.handler.handle(record)
+        self.handler.flush()
+        self.assertIsNotNone(record.exc_info)  # other handlers still see the original
+        self.assertIn('ValueError: boom', self.stream.getvalue())
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = BackgroundStreamHandler(io.StringIO(), maxsize=1)
+        handler.listener.stop()
+        handler.listener = None
+        for _ in range(3):
+            handler.handle(make_record('src'))
+        self.assertEqual(handler.dropped, 2)
+        handler.close()
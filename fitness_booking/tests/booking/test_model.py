@@ -1,7 +1,8 @@
 from django.test import TestCase
 from django.utils import timezone
-from src.booking.models import InstructorModel, FitnessModel, BookingModel
+from src.booking.models import InstructorModel, FitnessModel, BookingModel, days_to_mask
 from src.booking.serializer import BookingSerializer
+from rest_framework.exceptions import ValidationError
 
 class FitnessClassModelTest(TestCase):
     def setUp(self):
@@ -95,3 +96,59 @@ class BookingModelTest(TestCase):
         self.create_booking("John Smith", "john@example.com")
         with self.assertRaises(Exception):
             self.create_booking("John Smith", "john@example.com")
+
+    def test_duplicate_booking_does_not_consume_seat(self):
+        self.create_booking("John Smith", "john@example.com")
+        with self.assertRaises(Exception):
+            self.create_booking("John Smith", "john@example.com")
+        self.fitness_class.refresh_from_db()
+        self.assertEqual(self.fitness_class.available_slots, 19)
+
+    def test_booking_rejected_when_class_full(self):
+        FitnessModel.objects.filter(pk=self.fitness_class.pk).update(available_slots=0)
+        serializer = BookingSerializer(data={
+            "fitness_id": self.fitness_class.id,
+            "client_name": "John Smith",
+            "client_email": "john@example.com"
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(BookingModel.objects.count(), 0)
+
+
+class DaysMaskTest(TestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+
+    def create_class(self, days):
+        return FitnessModel.objects.create(
+            name="YOGA",
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            days_of_week=days,
+        )
+
+    def test_mask_tracks_days_of_week(self):
+        fitness = self.create_class(['MON', 'WED', 'SUN'])
+        self.assertEqual(fitness.days_mask, 0b1000101)
+
+        fitness.days_of_week = ['TUE']
+        fitness.save(update_fields=['days_of_week'])
+        fitness.refresh_from_db()
+        self.assertEqual(fitness.days_mask, 0b10)
+
+    def test_legacy_string_days(self):
+        self.assertEqual(days_to_mask('TUE,THU'), 0b1010)
+        self.assertIn('Tuesday, Thursday', str(self.create_class('TUE,THU')))
+
+    def test_on_days_filter(self):
+        mon_wed = self.create_class(['MON', 'WED'])
+        fri = self.create_class(['FRI'])
+        self.create_class([])
+        self.assertEqual(list(FitnessModel.objects.on_days(days_to_mask(['WED', 'FRI']))), [mon_wed, fri])
+        self.assertEqual(list(FitnessModel.objects.on_days(days_to_mask(['SAT']))), [])
+
+    def test_str_uses_canonical_day_order(self):
+        fitness = self.create_class(['WED', 'MON'])
+        self.assertIn('Monday, Wednesday', str(fitness))
@@ -0,0 +1,57 @@
+import pstats
+import tempfile
+from pathlib import Path
+
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from src.booking.models import InstructorModel, FitnessModel
+
+
+@override_settings(BOOKING_CLASS_LIST_CACHE_TIMEOUT=0)
+class RequestTimingTests(TestCase):
+    def setUp(self):
+        instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        FitnessModel.objects.create(
+            name='YOGA',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            days_of_week=['MON'],
+        )
+
+    def test_server_timing_header_reports_phases_and_queries(self):
+        with self.assertLogs('src.booking.timing', 'INFO') as logs:
+            response = Client().get(reverse('class-list'))
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'tz;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        self.assertIn('desc="1 queries"', header)
+
+        timing = logs.records[0].timing
+        self.assertEqual(timing['path'], '/api/classes/')
+        self.assertEqual(timing['status'], 200)
+        self.assertEqual(timing['queries'], 1)
+        self.assertIn('serialize', timing['phases_ms'])
+
+    def test_drf_rendering_is_timed(self):
+        response = Client().get(reverse('booking-list'), {'client_email': 'bob@example.com'})
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    async def test_async_views_count_queries(self):
+        response = await AsyncClient().get(reverse('async-instructors'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    def test_profile_header_dumps_stats_when_allowed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(BOOKING_PROFILE_ALLOW_HEADER=True, BOOKING_PROFILE_DIR=directory):
+                response = Client().get(reverse('class-list'), HTTP_X_PROFILE='1')
+            dump = Path(directory) / response['X-Profile-File']
+            stats = pstats.Stats(str(dump))
+            self.assertTrue(stats.total_calls)
+
+    def test_profile_header_is_ignored_unless_allowed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(BOOKING_PROFILE_ALLOW_HEADER=False, BOOKING_PROFILE_DIR=directory):
+                response = Client().get(reverse('class-list'), HTTP_X_PROFILE='1')
+            self.assertNotIn('X-Profile-File', response)
+            self.assertEqual(list(Path(directory).iterdir()), [])
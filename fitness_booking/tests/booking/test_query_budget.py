@@ -0,0 +1,70 @@
+from itertools import count
+
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.utils import timezone
+from src.booking.models import InstructorModel, FitnessModel, BookingModel
+from .query_budget import QueryBudgetMixin
+
+
+class EndpointQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.sequence = count()
+        self.instructor = self.make_instructor()
+        self.fitness = self.make_class(self.instructor)
+
+    def make_instructor(self):
+        n = next(self.sequence)
+        return InstructorModel.objects.create(name=f"Instructor {n}", email=f"instructor{n}@example.com")
+
+    def make_class(self, instructor):
+        return FitnessModel.objects.create(
+            name='YOGA',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1, minutes=next(self.sequence)),
+            days_of_week=['MON', 'WED'],
+        )
+
+    def seed_classes(self, n):
+        for _ in range(n):
+            self.make_class(self.make_instructor())
+
+    def seed_bookings(self, n):
+        for _ in range(n):
+            BookingModel.objects.create(
+                fitness=self.make_class(self.make_instructor()),
+                client_name='Alice',
+                client_email='alice@example.com',
+            )
+
+    def test_class_list(self):
+        self.assertConstantQueries(self.seed_classes, lambda: self.client.get(reverse('class-list')), max_queries=1)
+
+    def test_booking_list(self):
+        self.assertConstantQueries(
+            self.seed_bookings,
+            lambda: self.client.get(reverse('booking-list'), {'client_email': 'alice@example.com'}),
+            max_queries=1,
+        )
+
+    def test_instructor_list(self):
+        self.assertConstantQueries(self.seed_classes, lambda: self.client.get(reverse('instructors')), max_queries=1)
+
+    def test_booking_create(self):
+        emails = (f"client{n}@example.com" for n in count())
+        self.assertConstantQueries(
+            self.seed_bookings,
+            lambda: self.client.post(reverse('booking-create'), {
+                'fitness_id': self.fitness.id, 'client_name': 'Bob', 'client_email': next(emails),
+            }, format='json'),
+        )
+
+    def test_booking_cancel(self):
+        def cancel():
+            booking = BookingModel.objects.create(
+                fitness=self.fitness, client_name='Bob', client_email=f"bob{next(self.sequence)}@example.com"
+            )
+            return self.client.post(reverse('booking-cancel'), {
+                'booking_id': booking.id, 'client_email': booking.client_email,
+            }, format='json')
+        self.assertConstantQueries(self.seed_bookings, cancel)
@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from src.booking.models import InstructorModel, FitnessModel, SeatShardModel
+from src.booking.reservation import reserve_seat, release_seat, stripe_capacity
+
+
+class StripedCounterTest(TestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(
+            name="Jane Doe",
+            email="jane@example.com",
+        )
+        self.fitness_class = FitnessModel.objects.create(
+            name="HIIT",
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=10,
+            available_slots=7,
+            days_of_week=['TUE'],
+        )
+
+    def test_stripe_preserves_seat_count(self):
+        fitness = stripe_capacity(self.fitness_class.pk, 4)
+        self.assertEqual(fitness.shard_count, 4)
+        self.assertEqual(fitness.available_slots, 0)
+        self.assertEqual(SeatShardModel.objects.filter(fitness=fitness).count(), 4)
+        self.assertEqual(FitnessModel.objects.get(pk=fitness.pk).get_available_slots(), 7)
+
+        fitness = stripe_capacity(fitness.pk, 0)
+        self.assertEqual(fitness.shard_count, 0)
+        self.assertEqual(fitness.available_slots, 7)
+        self.assertFalse(SeatShardModel.objects.filter(fitness=fitness).exists())
+
+    def test_striped_reserve_stops_at_capacity(self):
+        fitness = stripe_capacity(self.fitness_class.pk, 3)
+        taken = sum(reserve_seat(fitness) for _ in range(10))
+        self.assertEqual(taken, 7)
+        self.assertEqual(fitness.get_available_slots(), 0)
+
+        self.assertTrue(release_seat(fitness))
+        self.assertEqual(fitness.get_available_slots(), 1)
+
+    def test_class_list_sums_shards(self):
+        stripe_capacity(self.fitness_class.pk, 4)
+        response = self.client.get(reverse('class-list'))
+        self.assertEqual(response.json()['results'][0]['available_slots'], 7)
+
+    def test_admin_locks_seat_fields_while_striped(self):
+        self.client.force_login(User.objects.create_superuser('staff', 'staff@example.com', 'secret'))
+        url = reverse('admin:booking_fitnessmodel_change', args=[self.fitness_class.pk])
+        self.assertIn('name="total_slots"', self.client.get(url).content.decode())
+
+        stripe_capacity(self.fitness_class.pk, 4)
+        page = self.client.get(url).content.decode()
+        self.assertNotIn('name="total_slots"', page)
+        self.assertNotIn('name="available_slots"', page)
@@ -0,0 +1,71 @@
+import copy
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import AsyncClient, TransactionTestCase
+from django.urls import reverse
+from src.booking.models import InstructorModel
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Runs against a second SQLite file registered as the ``replica`` alias.
+
+    Nothing copies rows between the two, so which database a query went to
+    shows in what the response contains.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.replica_path = tempfile.mkstemp(prefix='booking-replica-', suffix='.sqlite3')
+        os.close(fd)
+        replica = copy.deepcopy(connections.settings['default'])
+        replica.update(NAME=cls.replica_path, TEST={**replica['TEST'], 'NAME': cls.replica_path})
+        connections.settings['replica'] = replica
+        call_command('migrate', database='replica', verbosity=0)
+        # Declared here rather than on the class: the runner checks the
+        # databases of every test before this alias exists.
+        cls.databases = {'default', 'replica'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        os.remove(cls.replica_path)
+
+    def setUp(self):
+        InstructorModel.objects.create(name='Primary Only', email='primary@example.com')
+        InstructorModel.objects.using('replica').create(name='Replica Only', email='replica@example.com')
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return {row['name'] for row in response.json()}
+
+    def test_listing_reads_from_replica(self):
+        self.assertEqual(self.names(self.client.get(reverse('instructors'))), {'Replica Only'})
+
+    def test_write_goes_to_primary_and_pins_reads(self):
+        response = self.client.post(reverse('instructors'), {'name': 'New', 'email': 'new@example.com'}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(InstructorModel.objects.using('default').filter(email='new@example.com').exists())
+        self.assertFalse(InstructorModel.objects.using('replica').filter(email='new@example.com').exists())
+        self.assertIn('booking_primary', response.cookies)
+
+        # The client now carries the pin cookie and reads its own write.
+        self.assertEqual(self.names(self.client.get(reverse('instructors'))), {'Primary Only', 'New'})
+
+        self.client.cookies.pop('booking_primary')
+        self.assertEqual(self.names(self.client.get(reverse('instructors'))), {'Replica Only'})
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.post(reverse('instructors'), {'name': ''}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('booking_primary', response.cookies)
+
+    async def test_async_listing_reads_from_replica(self):
+        response = await AsyncClient().get(reverse('async-instructors'))
+        self.assertEqual(self.names(response), {'Replica Only'})
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytz
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.models import InstructorModel, FitnessModel, ClassOccurrenceModel, BookingModel
+from src.booking.schedule import materialize, occurrence_times, refresh_horizon
+
+IST = pytz.timezone('Asia/Kolkata')
+
+
+class ScheduleTests(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        tomorrow = (timezone.now() + timedelta(days=1)).astimezone(IST).date()
+        self.fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=IST.localize(datetime.combine(tomorrow, datetime.min.time()).replace(hour=19)),
+            duration_minutes=60,
+            total_slots=10,
+            available_slots=10,
+            days_of_week=['TUE', 'THU'],
+        )
+
+    def occurrences(self):
+        return list(ClassOccurrenceModel.objects.filter(fitness=self.fitness).order_by('starts_at'))
+
+    def test_save_materializes_listed_weekdays(self):
+        occurrences = self.occurrences()
+        self.assertEqual(len(occurrences), 8)
+        for occurrence in occurrences:
+            local = occurrence.starts_at.astimezone(IST)
+            self.assertIn(local.strftime('%a').upper(), ['TUE', 'THU'])
+            self.assertEqual((local.hour, local.minute), (19, 0))
+            self.assertEqual(occurrence.ends_at - occurrence.starts_at, timedelta(hours=1))
+            self.assertEqual(occurrence.available_slots, 10)
+
+    def test_schedule_change_is_applied_incrementally(self):
+        booked = next(o for o in self.occurrences() if o.starts_at.astimezone(IST).weekday() == 3)
+        BookingModel.objects.create(fitness=self.fitness, occurrence=booked, client_name='Bob', client_email='bob@example.com')
+        ClassOccurrenceModel.objects.filter(pk=booked.pk).update(available_slots=9)
+        untouched = [o.pk for o in self.occurrences() if o.starts_at.astimezone(IST).weekday() == 1]
+
+        self.fitness.days_of_week = ['TUE']
+        self.fitness.total_slots = 12
+        self.fitness.duration_minutes = 90
+        self.fitness.save()
+
+        remaining = self.occurrences()
+        self.assertEqual([o.pk for o in remaining if o.pk != booked.pk], untouched)
+        booked.refresh_from_db()
+        self.assertEqual((booked.total_slots, booked.available_slots), (12, 11))
+        self.assertTrue(all(o.ends_at - o.starts_at == timedelta(minutes=90) for o in remaining))
+
+    def test_materialize_is_idempotent(self):
+        before = [(o.pk, o.starts_at) for o in self.occurrences()]
+        with self.assertNumQueries(5):
+            materialize(self.fitness)
+        self.assertEqual([(o.pk, o.starts_at) for o in self.occurrences()], before)
+
+    def test_single_class_without_weekdays(self):
+        self.fitness.days_of_week = []
+        self.fitness.save()
+        self.assertEqual([o.starts_at for o in self.occurrences()], [self.fitness.datetime_ist])
+        self.assertEqual(occurrence_times(self.fitness, timezone.now(), self.fitness.datetime_ist), [])
+
+    def test_refresh_skips_past_one_off_classes(self):
+        FitnessModel.objects.create(
+            name='HIIT', instructor=self.instructor, datetime_ist=timezone.now() - timedelta(days=30),
+            total_slots=10, available_slots=10, days_of_week=[],
+        )
+        self.assertEqual(refresh_horizon(), 1)
+
+    def test_range_query(self):
+        first = self.occurrences()[0].starts_at.astimezone(IST)
+        start = first.replace(hour=18).replace(tzinfo=None)
+        response = self.client.get(reverse('occurrence-list'), {
+            'start': start.isoformat(),
+            'end': (start + timedelta(hours=3)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.occurrences()[0].id])
+
+        response = self.client.get(reverse('occurrence-list'), {'start': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_book_and_cancel_specific_sessions(self):
+        first, second = self.occurrences()[:2]
+        for occurrence in (first, second):
+            response = self.client.post(reverse('booking-create'), {
+                'fitness_id': self.fitness.id,
+                'occurrence_id': occurrence.id,
+                'client_name': 'Alice',
+                'client_email': 'alice@example.com',
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        first.refresh_from_db()
+        self.fitness.refresh_from_db()
+        self.assertEqual(first.available_slots, 9)
+        self.assertEqual(self.fitness.available_slots, 10)
+
+        booking = BookingModel.objects.get(occurrence=first)
+        self.client.post(reverse('booking-cancel'), {'booking_id': booking.id, 'client_email': 'alice@example.com'}, format='json')
+        first.refresh_from_db()
+        self.assertEqual(first.available_slots, 10)
+
+    def test_occurrence_must_belong_to_class(self):
+        other = FitnessModel.objects.create(
+            name='HIIT', instructor=self.instructor, datetime_ist=self.fitness.datetime_ist, days_of_week=['MON'],
+        )
+        response = self.client.post(reverse('booking-create'), {
+            'fitness_id': other.id,
+            'occurrence_id': self.occurrences()[0].id,
+            'client_name': 'Alice',
+            'client_email': 'alice@example.com',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
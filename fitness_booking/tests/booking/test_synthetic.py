@@ -0,0 +1,76 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.test import TestCase, TransactionTestCase
+from src.booking import synthetic
+from src.booking.models import BookingModel, ClassOccurrenceModel, FitnessModel, InstructorModel
+
+OPTIONS = dict(instructors=5, classes=120, bookings=1500, clients=300, start_date=date(2026, 3, 2), seed=7, batch_size=250)
+
+
+def snapshot():
+    return (
+        list(FitnessModel.objects.order_by('pk').values_list('name', 'datetime_ist', 'days_of_week', 'total_slots', 'available_slots')),
+        list(BookingModel.objects.order_by('pk').values_list('client_email', 'booked_at', 'status')),
+    )
+
+
+class GenerateDataTests(TestCase):
+    def test_command_creates_consistent_skewed_data(self):
+        out = StringIO()
+        call_command('generate_data', '--classes', '120', '--bookings', '1500', '--clients', '300',
+                     '--instructors', '5', '--seed', '7', stdout=out)
+        self.assertIn('120 classes', out.getvalue())
+        self.assertEqual(InstructorModel.objects.count(), 5)
+        self.assertEqual(FitnessModel.objects.count(), 120)
+        self.assertTrue(ClassOccurrenceModel.objects.exists())
+
+        confirmed = BookingModel.objects.filter(status='CONFIRMED').count()
+        self.assertEqual(confirmed, 1500)
+        self.assertTrue(BookingModel.objects.filter(status='CANCELLED').exists())
+
+        # Seat counters agree with the confirmed bookings and never oversell.
+        classes = FitnessModel.objects.annotate(taken=Count('bookings', filter=Q(bookings__status='CONFIRMED')))
+        self.assertFalse(classes.exclude(available_slots=F('total_slots') - F('taken')).exists())
+        self.assertFalse(classes.filter(taken__gt=F('total_slots')).exists())
+
+        # Heavy repeat clients: the busiest member books far more than the median one.
+        counts = sorted(BookingModel.objects.values('client_email').annotate(n=Count('id')).values_list('n', flat=True))
+        self.assertGreater(counts[-1], 10 * counts[len(counts) // 2])
+
+        # Evening peak classes fill up more than mid-afternoon ones.
+        def fill(hours):
+            rows = classes.filter(datetime_ist__hour__in=hours).values_list('taken', 'total_slots')
+            return sum(taken for taken, _ in rows) / sum(slots for _, slots in rows)
+        self.assertGreater(fill([18, 19]), fill([14, 15]))
+
+    def test_same_seed_and_start_date_reproduce_the_same_data(self):
+        synthetic.generate(**OPTIONS)
+        first = snapshot()
+        BookingModel.objects.all().delete()
+        FitnessModel.objects.all().delete()
+        synthetic.generate(**OPTIONS)
+        self.assertEqual(snapshot(), first)
+
+
+class DeferredIndexTests(TransactionTestCase):
+    def test_raw_rows_use_the_backend_datetime_adapter(self):
+        adapt = connection.ops.adapt_datetimefield_value
+        with mock.patch.object(connection.ops, 'adapt_datetimefield_value', side_effect=adapt) as adapter:
+            report = synthetic.generate(**OPTIONS)
+        values = [call.args[0] for call in adapter.call_args_list]
+        self.assertGreaterEqual(len(values), report['bookings'] + 2 * report['occurrences'])
+        self.assertTrue(all(value.tzinfo is not None for value in values))
+
+    def test_large_loads_rebuild_the_booking_indexes(self):
+        with mock.patch.object(synthetic, 'DEFER_INDEXES_ABOVE', 0):
+            report = synthetic.generate(**OPTIONS)
+        self.assertEqual(report['bookings'], BookingModel.objects.count())
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, BookingModel._meta.db_table)
+        for index in BookingModel._meta.indexes:
+            self.assertIn(index.name, indexes)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase
+from src.booking.utils import convert_many, convert_to_timezone, get_timezone, localizer
+
+
+class ConvertManyTest(SimpleTestCase):
+    def setUp(self):
+        start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        # Every 7h30m for two years crosses each DST switch in both hemispheres.
+        self.datetimes = [start + timedelta(minutes=450 * i) for i in range(2400)]
+
+    def test_matches_astimezone(self):
+        for tz_name in ('America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata', 'UTC', 'Etc/GMT+5'):
+            tz = get_timezone(tz_name)
+            expected = [dt.astimezone(tz) for dt in self.datetimes]
+            converted = convert_many(self.datetimes, tz_name)
+            self.assertEqual(
+                [(dt.isoformat(), dt.tzname()) for dt in converted],
+                [(dt.isoformat(), dt.tzname()) for dt in expected],
+                tz_name,
+            )
+
+    def test_accepts_non_utc_input(self):
+        ist = get_timezone('Asia/Kolkata')
+        values = [dt.astimezone(ist) for dt in self.datetimes[:50]]
+        converted = convert_many(values, 'Europe/London')
+        self.assertEqual(converted, [convert_to_timezone(dt, 'Europe/London') for dt in values])
+
+    def test_unknown_timezone_leaves_values_unchanged(self):
+        self.assertEqual(convert_many(self.datetimes[:3], 'Mars/Olympus'), self.datetimes[:3])
+        self.assertEqual(convert_to_timezone(self.datetimes[0], 'Mars/Olympus'), self.datetimes[0])
+
+    def test_timezone_lookup_is_cached(self):
+        self.assertIs(get_timezone('Europe/Paris'), get_timezone('Europe/Paris'))
+
+
+class LocalizerTest(SimpleTestCase):
+    def test_matches_pytz_localize_inside_and_across_dst_windows(self):
+        for tz_name in ('America/New_York', 'Asia/Kolkata', 'UTC'):
+            tz = get_timezone(tz_name)
+            for month in range(1, 13):
+                start = datetime(2025, month, 1, tzinfo=dt_timezone.utc)
+                end = start + timedelta(days=28)
+                localize = localizer(tz, start, end)
+                for hour in range(0, 28 * 24, 5):
+                    naive = (start + timedelta(hours=hour)).replace(tzinfo=None)
+                    expected = tz.localize(naive)
+                    self.assertEqual(
+                        (localize(naive).isoformat(), localize(naive).tzname()),
+                        (expected.isoformat(), expected.tzname()),
+                        f"{tz_name} {naive}",
+                    )
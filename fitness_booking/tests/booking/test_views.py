@@ -4,6 +4,9 @@ from django.urls import reverse
 from src.booking.models import FitnessModel, BookingModel, InstructorModel
 from django.utils import timezone
 from datetime import time
+from unittest import mock
+import pytz
+from src.booking import batch
 
 class FitnessClassTests(APITestCase):
     def setUp(self):
@@ -43,7 +46,111 @@ class FitnessClassTests(APITestCase):
         )
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.json()['results']), 1)
+
+    def test_class_list_etag_and_invalidation(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(self.url, self.fitness_data, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_class_list_cache_tracks_bookings(self):
+        fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=5,
+            available_slots=5,
+            days_of_week=['MON'],
+        )
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['available_slots'], 5)
+        self.client.post(reverse('booking-create'), {
+            'fitness_id': fitness.id, 'client_name': 'Alice', 'client_email': 'alice@example.com',
+        }, format='json')
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['available_slots'], 4)
+
+    def test_booking_only_retires_pages_showing_the_class(self):
+        start = timezone.now() + timezone.timedelta(days=1)
+        first, second = [
+            FitnessModel.objects.create(
+                name='YOGA', instructor=self.instructor, datetime_ist=start + timezone.timedelta(hours=i),
+                total_slots=5, available_slots=5, days_of_week=['MON'],
+            )
+            for i in range(2)
+        ]
+        page_one = self.client.get(self.url, {'page_size': 1}).json()
+        page_two_params = {'page_size': 1, 'cursor': page_one['next_cursor']}
+        self.client.get(self.url, page_two_params)
+
+        self.client.post(reverse('booking-create'), {
+            'fitness_id': second.id, 'client_name': 'Alice', 'client_email': 'alice@example.com',
+        }, format='json')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, {'page_size': 1}).json(), page_one)
+        self.assertEqual(self.client.get(self.url, page_two_params).json()['results'][0]['available_slots'], 4)
+
+    def test_class_list_cursor_pagination(self):
+        start = timezone.now() + timezone.timedelta(days=1)
+        created = [
+            FitnessModel.objects.create(
+                name='YOGA',
+                instructor=self.instructor,
+                # Pairs of classes share a start time to exercise the id tiebreaker.
+                datetime_ist=start + timezone.timedelta(hours=i // 2),
+                days_of_week=['MON'],
+            ).id
+            for i in range(5)
+        ]
+
+        seen, params = [], {'page_size': 2}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen.extend(row['id'] for row in page['results'])
+            if not page['next_cursor']:
+                break
+            params['cursor'] = page['next_cursor']
+        self.assertEqual(seen, created)
+
+    def test_class_list_converts_to_user_timezone(self):
+        fitness = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            days_of_week=['MON'],
+        )
+        response = self.client.get(self.url, {'user_timezone': 'America/New_York'})
+        local = fitness.datetime_ist.astimezone(pytz.timezone('America/New_York'))
+        row = response.json()['results'][0]
+        self.assertEqual(row['start_date'], local.date().isoformat())
+        self.assertEqual(row['start_time'], local.time().isoformat())
+
+    def test_class_list_filters_by_days(self):
+        for days in (['MON'], ['TUE', 'SAT'], ['SUN']):
+            FitnessModel.objects.create(
+                name='YOGA',
+                instructor=self.instructor,
+                datetime_ist=timezone.now() + timezone.timedelta(days=1),
+                days_of_week=days,
+            )
+        response = self.client.get(self.url, {'days': 'SAT,SUN'})
+        self.assertEqual([row['days_of_week'] for row in response.json()['results']], [['TUE', 'SAT'], ['SUN']])
+        response = self.client.get(self.url, {'days': 'funday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_class_list_rejects_bad_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class BookingTests(APITestCase):
     def setUp(self):
@@ -84,8 +191,130 @@ class BookingTests(APITestCase):
         )
         response = self.client.get(reverse('booking-list'), {'client_email': 'bob@example.com'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_get_bookings_is_case_insensitive_and_filtered(self):
+        other = FitnessModel.objects.create(
+            name='YOGA',
+            instructor=self.instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=2),
+            days_of_week=['MON'],
+        )
+        now = timezone.now()
+        old = BookingModel.objects.create(
+            fitness=self.fitness, client_name='Bob', client_email='Bob@Example.com',
+            booked_at=now - timezone.timedelta(days=30), status='CANCELLED',
+        )
+        recent = BookingModel.objects.create(fitness=other, client_name='Bob', client_email='bob@example.com')
+
+        response = self.client.get(reverse('booking-list'), {'client_email': 'BOB@example.com'})
+        self.assertEqual([row['id'] for row in response.data['results']], [recent.id, old.id])
+
+        response = self.client.get(reverse('booking-list'), {'client_email': 'bob@example.com', 'status': 'cancelled'})
+        self.assertEqual([row['id'] for row in response.data['results']], [old.id])
+
+        response = self.client.get(reverse('booking-list'), {
+            'client_email': 'bob@example.com', 'booked_after': (now - timezone.timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual([row['id'] for row in response.data['results']], [recent.id])
+
+        response = self.client.get(reverse('booking-list'), {'client_email': 'bob@example.com', 'page_size': 1})
+        self.assertEqual([row['id'] for row in response.data['results']], [recent.id])
+        response = self.client.get(reverse('booking-list'), {
+            'client_email': 'bob@example.com', 'page_size': 1, 'cursor': response.data['next_cursor'],
+        })
+        self.assertEqual([row['id'] for row in response.data['results']], [old.id])
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_get_bookings_rejects_bad_status(self):
+        response = self.client.get(reverse('booking-list'), {'client_email': 'bob@example.com', 'status': 'LOST'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_booking_missing_email(self):
         response = self.client.get(reverse('booking-list'))
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancel_booking_releases_seat_once(self):
+        response = self.client.post(self.url, self.booking_data, format='json')
+        booking_id = response.data['id']
+        cancel = {'booking_id': booking_id, 'client_email': 'alice@example.com'}
+
+        response = self.client.post(reverse('booking-cancel'), cancel, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('booking-cancel'), cancel, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.fitness.refresh_from_db()
+        self.assertEqual(self.fitness.available_slots, 20)
+        self.assertEqual(BookingModel.objects.get(pk=booking_id).status, 'CANCELLED')
+
+
+class BatchBookingTests(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.classes = [
+            FitnessModel.objects.create(
+                name='HIIT',
+                instructor=self.instructor,
+                datetime_ist=timezone.now() + timezone.timedelta(days=1 + i),
+                total_slots=2,
+                available_slots=2,
+                days_of_week=['TUE'],
+            )
+            for i in range(2)
+        ]
+        self.url = reverse('booking-batch-create')
+
+    def test_batch_books_all_entries(self):
+        entries = [
+            {'fitness_id': fitness.id, 'client_name': f'Member {n}', 'client_email': f'member{n}@example.com'}
+            for fitness in self.classes for n in range(2)
+        ]
+        response = self.client.post(self.url, {'bookings': entries}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 4)
+        self.assertEqual(BookingModel.objects.count(), 4)
+        self.assertEqual([r['booking']['client_email'] for r in response.data['results']], [e['client_email'] for e in entries])
+        for fitness in self.classes:
+            fitness.refresh_from_db()
+            self.assertEqual(fitness.available_slots, 0)
+
+    def test_batch_reports_per_item_failures(self):
+        BookingModel.objects.create(fitness=self.classes[0], client_name='Bob', client_email='bob@example.com')
+        entries = [
+            {'fitness_id': self.classes[0].id, 'client_name': 'Bob', 'client_email': 'bob@example.com'},
+            {'fitness_id': self.classes[0].id, 'client_name': 'Ann', 'client_email': 'ann@example.com'},
+            {'fitness_id': self.classes[0].id, 'client_name': 'Cat', 'client_email': 'cat@example.com'},
+            {'fitness_id': self.classes[0].id, 'client_name': 'Dan', 'client_email': 'dan@example.com'},
+            {'fitness_id': 999999, 'client_name': 'Eve', 'client_email': 'eve@example.com'},
+            {'fitness_id': self.classes[1].id, 'client_name': 'Fay'},
+        ]
+        response = self.client.post(self.url, {'bookings': entries}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        outcome = ['booking' in r for r in response.data['results']]
+        self.assertEqual(outcome, [False, True, True, False, False, False])
+        self.assertIn('fitness_id', response.data['results'][4]['errors'])
+        self.assertIn('client_email', response.data['results'][5]['errors'])
+
+    def test_batch_reports_concurrent_booking_per_item(self):
+        def reserve_then_race(fitness, count):
+            # Another request books Bob after the batch checked for duplicates.
+            BookingModel.objects.create(fitness=self.classes[0], client_name='Bob', client_email='bob@example.com')
+            return reserve_seats(fitness, count)
+
+        reserve_seats = batch.reserve_seats
+        entries = [
+            {'fitness_id': self.classes[0].id, 'client_name': 'Ann', 'client_email': 'ann@example.com'},
+            {'fitness_id': self.classes[0].id, 'client_name': 'Bob', 'client_email': 'bob@example.com'},
+        ]
+        with mock.patch.object(batch, 'reserve_seats', reserve_then_race):
+            response = self.client.post(self.url, {'bookings': entries}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(['booking' in r for r in response.data['results']], [True, False])
+        self.assertEqual(response.data['results'][1]['errors'], ["You have already booked this class."])
+        self.classes[0].refresh_from_db()
+        self.assertEqual(self.classes[0].available_slots, 1)  # Bob's seat went back
+
+    def test_batch_requires_list(self):
+        response = self.client.post(self.url, {'bookings': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
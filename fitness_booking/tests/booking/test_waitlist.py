@@ -0,0 +1,127 @@
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from src.booking.models import BookingModel, ClassOccurrenceModel, FitnessModel, InstructorModel, WaitlistEntryModel
+from src.booking.waitlist import position
+
+
+class WaitlistTests(APITestCase):
+    def setUp(self):
+        instructor = InstructorModel.objects.create(name="Jane Doe", email="jane@example.com")
+        self.fitness = FitnessModel.objects.create(
+            name='HIIT',
+            instructor=instructor,
+            datetime_ist=timezone.now() + timezone.timedelta(days=1),
+            total_slots=1,
+            available_slots=1,
+            days_of_week=['TUE'],
+        )
+        self.holder = self.book('alice').json()
+
+    def book(self, name, join=True):
+        return self.client.post(reverse('booking-create'), {
+            'fitness_id': self.fitness.id, 'client_name': name.title(),
+            'client_email': f'{name}@example.com', 'join_waitlist': join,
+        }, format='json')
+
+    def cancel(self, booking_id, name):
+        return self.client.post(reverse('booking-cancel'), {
+            'booking_id': booking_id, 'client_email': f'{name}@example.com',
+        }, format='json')
+
+    def test_joins_in_order_when_full(self):
+        first = self.book('bob')
+        second = self.book('carol')
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(first.json()['position'], 1)
+        self.assertEqual(second.json()['position'], 2)
+        self.assertEqual(BookingModel.objects.count(), 1)
+
+    def test_without_flag_full_class_is_still_an_error(self):
+        response = self.book('bob', join=False)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WaitlistEntryModel.objects.exists())
+
+    def test_cannot_join_twice_or_while_booked(self):
+        self.book('bob')
+        self.assertEqual(self.book('bob').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.book('alice').json(), {"errors": ["You have already booked this class."]})
+
+    def test_cancellation_promotes_first_waiter(self):
+        self.book('bob')
+        self.book('carol')
+        self.assertEqual(self.cancel(self.holder['id'], 'alice').status_code, status.HTTP_200_OK)
+
+        promoted = BookingModel.objects.get(client_email='bob@example.com')
+        self.assertEqual(promoted.status, 'CONFIRMED')
+        self.assertEqual(list(WaitlistEntryModel.objects.values_list('client_email', flat=True)), ['carol@example.com'])
+        self.fitness.refresh_from_db()
+        self.assertEqual(self.fitness.available_slots, 0)  # handed over, never back on sale
+
+        self.cancel(promoted.id, 'bob')
+        self.assertTrue(BookingModel.objects.filter(client_email='carol@example.com', status='CONFIRMED').exists())
+
+        # Queue empty: the next cancellation returns the seat.
+        self.cancel(BookingModel.objects.get(client_email='carol@example.com').id, 'carol')
+        self.fitness.refresh_from_db()
+        self.assertEqual(self.fitness.available_slots, 1)
+
+    def test_promotion_cost_does_not_grow_with_queue(self):
+        def cancel_queries(waiting):
+            WaitlistEntryModel.objects.bulk_create(
+                WaitlistEntryModel(fitness=self.fitness, client_name='W', client_email=f'w{waiting}-{n}@example.com',
+                                   client_email_normalized=f'w{waiting}-{n}@example.com')
+                for n in range(waiting)
+            )
+            holder = BookingModel.objects.filter(fitness=self.fitness, status='CONFIRMED').get()
+            with CaptureQueriesContext(connection) as captured:
+                self.cancel(holder.id, holder.client_email.split('@')[0])
+            return len(captured)
+
+        self.assertEqual(cancel_queries(1), cancel_queries(200))
+
+    def test_waiter_who_booked_meanwhile_is_skipped(self):
+        WaitlistEntryModel.objects.create(fitness=self.fitness, client_name='Alice', client_email='alice@example.com')
+        self.book('bob')
+        self.cancel(self.holder['id'], 'alice')
+        self.assertTrue(BookingModel.objects.filter(client_email='bob@example.com', status='CONFIRMED').exists())
+        self.assertFalse(WaitlistEntryModel.objects.exists())
+
+    def test_list_and_leave(self):
+        entry = self.book('bob').json()
+        listed = self.client.get(reverse('waitlist'), {'client_email': 'BOB@example.com'})
+        self.assertEqual([row['id'] for row in listed.json()], [entry['id']])
+
+        wrong = self.client.post(reverse('waitlist-leave'), {'entry_id': entry['id'], 'client_email': 'carol@example.com'}, format='json')
+        self.assertEqual(wrong.status_code, status.HTTP_404_NOT_FOUND)
+        left = self.client.post(reverse('waitlist-leave'), {'entry_id': entry['id'], 'client_email': 'bob@example.com'}, format='json')
+        self.assertEqual(left.status_code, status.HTTP_200_OK)
+        self.assertFalse(WaitlistEntryModel.objects.exists())
+
+    def test_list_positions_take_one_query(self):
+        other = FitnessModel.objects.create(
+            name='YOGA', instructor=self.fitness.instructor, datetime_ist=self.fitness.datetime_ist,
+            total_slots=1, available_slots=0, days_of_week=['WED'],
+        )
+        occurrence = ClassOccurrenceModel.objects.filter(fitness=self.fitness).first()
+        joined = timezone.now()
+        for n, (fitness, occurrence_id, name) in enumerate([
+            (self.fitness, None, 'ann'), (self.fitness, None, 'carol'), (self.fitness, occurrence.pk, 'carol'),
+            (other, None, 'dan'), (other, None, 'erin'), (other, None, 'carol'),
+        ]):
+            WaitlistEntryModel.objects.create(
+                fitness=fitness, occurrence_id=occurrence_id, client_name=name.title(),
+                client_email=f'{name}@example.com', joined_at=joined + timezone.timedelta(seconds=n),
+            )
+
+        with CaptureQueriesContext(connection) as captured:
+            listed = self.client.get(reverse('waitlist'), {'client_email': 'carol@example.com'}).json()
+        self.assertEqual(sum('waitlistentry' in query['sql'] for query in captured), 1)
+        self.assertEqual(
+            {row['id']: row['position'] for row in listed},
+            {entry.pk: position(entry) for entry in WaitlistEntryModel.objects.filter(client_email='carol@example.com')},
+        )
+        self.assertEqual(sorted(row['position'] for row in listed), [1, 2, 3])